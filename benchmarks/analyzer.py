@@ -0,0 +1,58 @@
+"""
+Measures the time of the analyzer (mcscript/analyzer/Analyzer.py) on deeply nested, variable-heavy programs.
+
+Every level of a generated program is an if block which declares `--variables` variables and updates a variable
+of every outer level, so the number of statements grows quadratically with the depth. The time per statement
+should stay about constant.
+
+Usage: python benchmarks/analyzer.py [--runs N] [--depths 25,50,100,150] [--variables 4]
+"""
+import argparse
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_grammar
+from mcscript.analyzer.Analyzer import Analyzer
+
+
+def program(depth: int, variables: int) -> str:
+    lines = []
+    for level in range(depth):
+        indent = "    " * level
+        lines += [f"{indent}let v{level}_{i} = {i}" for i in range(variables)]
+        lines += [f"{indent}v{outer}_0 = v{outer}_0 + v{level}_1" for outer in range(level)]
+        lines.append(f"{indent}if v{level}_0 > 0 {{")
+    lines += ["    " * level + "}" for level in reversed(range(depth))]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per depth")
+    parser.add_argument("--depths", default="25,50,100,150", help="the nesting depths")
+    parser.add_argument("--variables", type=int, default=4, help="the number of variables declared per level")
+    args = parser.parse_args()
+    # the analyzer recurses into every block
+    sys.setrecursionlimit(10000)
+
+    print(f"{'depth':<8}{'statements':>12}{'analyze (ms)':>14}{'µs / statement':>16}")
+    for depth in (int(i) for i in args.depths.split(",")):
+        code = program(depth, args.variables)
+        statements = code.count("\n") + 1
+        tree = get_grammar().parse(code)
+        times = []
+        for _ in range(args.runs):
+            start_time = perf_counter()
+            Analyzer().analyze(tree)
+            times.append(perf_counter() - start_time)
+        time = median(times)
+        print(f"{depth:<8}{statements:>12}{time * 1000:>14.2f}{time / statements * 1e6:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Measures the variable lookup of the compiler (see `Context.find_var` in mcscript/compiler/Context.py).
+
+For every nesting depth a stack of contexts is built, where every context declares `--variables` variables.
+The benchmark looks up a variable of every context from the innermost context, once with the shared declarations
+and once by walking the previous contexts like a context that is not on the stack. A lookup should cost about
+the same at every depth. It also prints the time to push and pop a context.
+
+Usage: python benchmarks/context_lookup.py [--runs N] [--depths 10,100,1000] [--variables 4]
+"""
+import argparse
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Callable, List
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript.analyzer.VariableContext import NamespaceContext
+from mcscript.compiler.Context import Context
+from mcscript.compiler.ContextStack import ContextStack
+from mcscript.compiler.ContextType import ContextType
+from mcscript.lang.resource.IntegerResource import IntegerResource
+from mcscript.utils.Scoreboard import Scoreboard
+from mcscript.utils.resources import DataPath
+
+SCOREBOARD = Scoreboard("main", True, 0)
+DATA_PATH = DataPath("mcscript:main", ["state"])
+
+
+def new_context(stack: ContextStack) -> Context:
+    predecessor = stack.tail() if stack.stack else None
+    context = Context(stack.index(), (stack.index(), 0), ContextType.BLOCK, NamespaceContext({}, (0, 0)),
+                      SCOREBOARD, DATA_PATH, predecessor)
+    stack.append(context)
+    return context
+
+
+def build(depth: int, variables: int) -> ContextStack:
+    stack = ContextStack()
+    for level in range(depth):
+        context = new_context(stack)
+        for i in range(variables):
+            context.add_var(f"v{level}_{i}", IntegerResource(i, None))
+    return stack
+
+
+def walk(context: Context, name: str):
+    """ the lookup through the previous contexts """
+    while context is not None:
+        if name in context.namespace:
+            return context.namespace[name]
+        context = context.predecessor
+    return None
+
+
+def lookup_time(find: Callable, context: Context, names: List[str], runs: int) -> float:
+    """ the median time of a single lookup in seconds """
+    times = []
+    for _ in range(runs):
+        start_time = perf_counter()
+        for name in names:
+            find(context, name)
+        times.append(perf_counter() - start_time)
+    return median(times) / len(names)
+
+
+def push_pop_time(stack: ContextStack, runs: int) -> float:
+    """ the median time to push and pop an empty context in seconds """
+    times = []
+    for _ in range(runs):
+        start_time = perf_counter()
+        for _ in range(100):
+            new_context(stack)
+            stack.pop()
+        times.append(perf_counter() - start_time)
+    return median(times) / 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per depth")
+    parser.add_argument("--depths", default="10,100,1000", help="the nesting depths")
+    parser.add_argument("--variables", type=int, default=4, help="the number of variables declared per context")
+    args = parser.parse_args()
+
+    print(f"{'depth':<8}{'walk (µs)':>12}{'find_var (µs)':>16}{'speedup':>10}{'push + pop (µs)':>18}")
+    for depth in (int(i) for i in args.depths.split(",")):
+        stack = build(depth, args.variables)
+        names = [f"v{level}_{i}" for level in range(depth) for i in range(args.variables)]
+        walked = lookup_time(walk, stack.tail(), names, args.runs)
+        found = lookup_time(Context.find_var, stack.tail(), names, args.runs)
+        push_pop = push_pop_time(stack, args.runs)
+        print(f"{depth:<8}{walked * 1e6:>12.3f}{found * 1e6:>16.3f}{walked / found:>9.1f}x{push_pop * 1e6:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
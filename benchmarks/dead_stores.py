@@ -0,0 +1,54 @@
+"""
+Measures the time of the ir optimization, which is dominated by dead store elimination on large programs.
+
+Every store asks whether its value is read anywhere (see mcscript/ir/DefUseIndex.py). The programs are
+generated by benchmarks/workload.py with a growing number of statements per block, so the number of stores
+and the number of nodes that could read them grow together. The time per store should stay about the same.
+
+Usage: python benchmarks/dead_stores.py [--runs N] [--statements 10,20,40,80]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+from typing import Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.Config import Config
+from workload import generate
+
+
+def optimize(code: str) -> Tuple[float, int]:
+    """ Returns the time of the optimization in seconds and the number of stores before it """
+    # every run should compile everything
+    get_compiler().function_cache = FunctionCache()
+    config = Config()
+    config.input_string = code
+    _, report = compileMcScript(config)
+    stores = sum(report.nodes_before_optimize.get(i, 0) for i in ("StoreFastVarNode", "StoreFastVarFromResultNode"))
+    return report.stage_times["Optimizing"], stores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--statements", default="10,20,40,80", help="the numbers of statements per block")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'statements':<12}{'stores':>8}{'optimize (ms)':>15}{'per store (µs)':>16}")
+    for statements in (int(i) for i in args.statements.split(",")):
+        code = generate(functions=4, statements=statements, depth=1, chain=2)
+        results = [optimize(code) for _ in range(args.runs)]
+        time, stores = median(i[0] for i in results), results[0][1]
+        print(f"{statements:<12}{stores:>8}{time * 1000:>15.1f}{time / stores * 1e6:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Runs every script in examples/ through the compiler and measures the time of each stage and the peak memory.
+
+The results are compared with the baselines in benchmarks/baselines/examples.json.
+The benchmark fails if a stage is slower than its baseline by more than the threshold, or if the peak memory grows
+by more than the threshold. Differences of less than --min-delta milliseconds are ignored, since they are noise.
+Baselines depend on the machine, so update them (--update) on the machine that runs the check.
+
+Scripts that do not compile are still measured up to the stage that fails.
+
+Usage: python benchmarks/examples.py [--runs N] [--threshold 0.25] [--min-delta 2] [--update] [--only NAME]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from statistics import median
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from stages import peak_memory, run, STAGES
+
+EXAMPLES = ROOT / "examples"
+BASELINES = Path(__file__).parent / "baselines" / "examples.json"
+
+
+def measure(path: Path, runs: int) -> dict:
+    code = path.read_text(encoding="utf-8")
+    # the first run builds the grammars
+    _, error = run(code)
+
+    samples = [run(code)[0] for _ in range(runs)]
+    return {
+        "error": error,
+        "stages": {stage: median(i[stage] for i in samples) for stage in samples[0]},
+        "peak_memory": peak_memory(code)
+    }
+
+
+def compare(name: str, result: dict, baseline: dict, threshold: float, min_delta: float) -> list:
+    """ Returns a message for every regression of `result` """
+    regressions = []
+    if result["error"] != baseline["error"]:
+        regressions.append(f"{name}: error changed from {baseline['error']} to {result['error']}")
+
+    for stage, time in result["stages"].items():
+        old_time = baseline["stages"].get(stage, None)
+        if old_time is None:
+            continue
+        if time > old_time * (1 + threshold) and time - old_time > min_delta:
+            regressions.append(f"{name}: {stage} took {time * 1000:.2f}ms, baseline is {old_time * 1000:.2f}ms")
+
+    if result["peak_memory"] > baseline["peak_memory"] * (1 + threshold):
+        regressions.append(f"{name}: peak memory is {result['peak_memory'] / 1024:.0f}KiB, "
+                           f"baseline is {baseline['peak_memory'] / 1024:.0f}KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per example")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--min-delta", type=float, default=2, help="ignore regressions below this many milliseconds")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baselines")
+    parser.add_argument("--only", help="only run the example with this name")
+    args = parser.parse_args()
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    results = {}
+
+    print(f"{'example':<20}" + "".join(f"{i + ' (ms)':>15}" for i in STAGES.values()) + f"{'peak (KiB)':>12}  error")
+    for path in sorted(EXAMPLES.glob("*.mcscript")):
+        if args.only is not None and path.stem != args.only:
+            continue
+        result = results[path.stem] = measure(path, args.runs)
+        stages = result["stages"]
+        print(f"{path.stem:<20}" +
+              "".join(f"{stages[i] * 1000:>15.2f}" if i in stages else f"{'-':>15}" for i in STAGES.values()) +
+              f"{result['peak_memory'] / 1024:>12.0f}  {result['error'] or ''}")
+
+    if args.update:
+        baselines.update(results)
+        BASELINES.parent.mkdir(exist_ok=True)
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Updated {BASELINES}")
+        return
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baselines:
+            print(f"No baseline for {name}")
+            continue
+        regressions += compare(name, result, baselines[name], args.threshold, args.min_delta / 1000)
+
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == '__main__':
+    main()
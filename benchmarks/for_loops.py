@@ -0,0 +1,84 @@
+"""
+Measures the compile time and the size of the datapack of a for loop over an integer range.
+
+The loop body is a few dynamic operations on the loop variable. Every range is compiled once unrolled and once as
+a runtime loop (see `counter_loop` in mcscript/compiler/common.py), which compiles the body only once.
+
+Usage: python benchmarks/for_loops.py [--runs N] [--sizes 10,50,200]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Iterator, Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.Config import Config
+
+
+def program(size: int) -> str:
+    return f"""
+let g = dyn(3)
+let sum = 0
+for i in range(1, {size + 1}) {{
+    let v = g * i + 1
+    if v > 10 {{
+        v = v % 7
+    }}
+    sum += v
+}}
+print("{{}}", sum)
+"""
+
+
+def functions(directory) -> Iterator[str]:
+    """ the content of every mcfunction file of the datapack """
+    for name, file in directory.files.files.items():
+        if name.endswith(".mcfunction"):
+            yield file.getvalue()
+    for sub_directory in directory.subDirectories.values():
+        yield from functions(sub_directory)
+
+
+def compile_program(code: str, unroll_limit: int) -> Tuple[float, int, int]:
+    """ Returns the compile time in seconds, the number of mcfunction files and the number of commands """
+    # every run should compile everything
+    get_compiler().function_cache = FunctionCache()
+    config = Config()
+    config.input_string = code
+    config.unroll_limit = unroll_limit
+
+    start_time = perf_counter()
+    datapack, _ = compileMcScript(config)
+    time = perf_counter() - start_time
+
+    files = list(functions(datapack))
+    return time, len(files), sum(len(i.splitlines()) for i in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--sizes", default="10,50,200", help="the sizes of the ranges")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'size':<8}{'mode':<12}{'compile (ms)':>14}{'files':>8}{'commands':>10}")
+    for size in (int(i) for i in args.sizes.split(",")):
+        code = program(size)
+        for mode, unroll_limit in (("unrolled", size), ("runtime", 0)):
+            results = [compile_program(code, unroll_limit) for _ in range(args.runs)]
+            time = median(i[0] for i in results)
+            _, files, commands = results[0]
+            print(f"{size:<8}{mode:<12}{time * 1000:>14.1f}{files:>8}{commands:>10}")
+
+
+if __name__ == '__main__':
+    main()
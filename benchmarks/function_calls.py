@@ -0,0 +1,96 @@
+"""
+Measures how the compile time and the size of the datapack grow with the number of call sites of a function.
+
+A small function is called `size` times with runtime arguments.
+The program is compiled once with every call specialized at its call site and once with runtime functions
+(see mcscript/compiler/RuntimeFunctions.py), which compile the function once and call it.
+A second program calls the function with one of four static arguments, so every call after the first four
+reuses a specialization (see `FunctionResource.specializations`).
+
+Usage: python benchmarks/function_calls.py [--runs N] [--sizes 10,40,160]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Iterator, Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.Config import Config
+
+# VALUE is made dynamic for static arguments, so that the function is not evaluated at compile time
+FUNCTION = """
+fun f(x: Int) -> Int {
+    let v = VALUE
+    if v > 10 {
+        v = v % 7 + 2
+    }
+    if v < 5 {
+        v = v * 2
+    }
+    let w = v * v - x
+    w = w % 97 + v
+    w
+}
+"""
+
+
+def program(calls: int, static: bool) -> str:
+    lines = ["let g = dyn(1)", FUNCTION.replace("VALUE", "dyn(x * 3 + 1)" if static else "x * 3 + 1")]
+    lines += [f"let r{i} = f({i % 4 + 1 if static else f'g + {i + 1}'})" for i in range(calls)]
+    lines.append(f'print("{{}}", {" + ".join(f"r{i}" for i in range(calls))})')
+    return "\n".join(lines) + "\n"
+
+
+def functions(directory) -> Iterator[str]:
+    """ the content of every mcfunction file of the datapack """
+    for name, file in directory.files.files.items():
+        if name.endswith(".mcfunction"):
+            yield file.getvalue()
+    for sub_directory in directory.subDirectories.values():
+        yield from functions(sub_directory)
+
+
+def compile_program(code: str, runtime_functions: bool) -> Tuple[float, int, int]:
+    """ Returns the compile time in seconds, the number of mcfunction files and the number of commands """
+    # every run should compile everything
+    get_compiler().function_cache = FunctionCache()
+    config = Config()
+    config.input_string = code
+    config.runtime_functions = runtime_functions
+
+    start_time = perf_counter()
+    datapack, _ = compileMcScript(config)
+    time = perf_counter() - start_time
+
+    files = list(functions(datapack))
+    return time, len(files), sum(len(i.splitlines()) for i in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--sizes", default="10,40,160", help="the numbers of call sites")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'calls':<8}{'arguments':<12}{'mode':<14}{'compile (ms)':>14}{'files':>8}{'commands':>10}")
+    for size in (int(i) for i in args.sizes.split(",")):
+        for arguments, static in (("runtime", False), ("static", True)):
+            code = program(size, static)
+            for mode, runtime_functions in (("specialized", False), ("runtime", True)):
+                results = [compile_program(code, runtime_functions) for _ in range(args.runs)]
+                time = median(i[0] for i in results)
+                _, files, commands = results[0]
+                print(f"{size:<8}{arguments:<12}{mode:<14}{time * 1000:>14.1f}{files:>8}{commands:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures how long a fresh process needs to create the parsers of all grammars, with and without the grammar cache.
+
+Every sample runs in a new interpreter, just like every compilation on ci does.
+
+Usage: python benchmarks/grammar_cache.py [runs]
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+
+ROOT = Path(__file__).parent.parent
+
+# the options must be the same as in mcscript/__init__.py
+SAMPLE = """
+import json, sys, time
+from mcscript.utils.astBuilder import AstBuilder, AstNode
+from mcscript.utils.grammarCache import load_grammar
+
+cache_dir = sys.argv[1]
+times = {}
+start = time.perf_counter()
+load_grammar("McScript.lark", cache_dir, parser="lalr", propagate_positions=True, maybe_placeholders=True,
+             tree_class=AstNode, transformer=AstBuilder())
+times["McScript.lark"] = time.perf_counter() - start
+start = time.perf_counter()
+load_grammar("textMarkup.lark", cache_dir, parser="lalr", maybe_placeholders=True)
+times["textMarkup.lark"] = time.perf_counter() - start
+print(json.dumps(times))
+"""
+
+
+def sample(cache_dir: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SAMPLE, cache_dir], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(runs: int):
+    cold = []
+    for _ in range(runs):
+        with TemporaryDirectory() as cache_dir:
+            cold.append(sample(cache_dir))
+
+    with TemporaryDirectory() as cache_dir:
+        sample(cache_dir)
+        warm = [sample(cache_dir) for _ in range(runs)]
+
+    print(f"{'grammar':<20}{'cold (ms)':>12}{'warm (ms)':>12}{'speedup':>10}")
+    for name in cold[0]:
+        cold_time = median(i[name] for i in cold) * 1000
+        warm_time = median(i[name] for i in warm) * 1000
+        print(f"{name:<20}{cold_time:>12.2f}{warm_time:>12.2f}{cold_time / warm_time:>9.1f}x")
+    cold_total = median(sum(i.values()) for i in cold) * 1000
+    warm_total = median(sum(i.values()) for i in warm) * 1000
+    print(f"{'total':<20}{cold_total:>12.2f}{warm_total:>12.2f}{cold_total / warm_total:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
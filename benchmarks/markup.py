@@ -0,0 +1,75 @@
+"""
+Measures the time that the text functions (print, actionbar, title and subtitle) spend on their markup strings.
+
+A generated program calls print in an unrolled for loop, so the same markup strings are formatted many times.
+The markup time is measured with the profiler, once with the template cache (see
+mcscript/utils/JsonTextFormat/MarkupTemplate.py) and once with every markup string parsed again.
+
+Usage: python benchmarks/markup.py [--runs N] [--sizes 50,200,800]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.Config import Config
+from mcscript.utils.JsonTextFormat import MarkupParser
+from mcscript.utils.profiler import Profiler, profiling
+
+FORMATS = [
+    '"[color=gold]Round {}[/] of {}"',
+    '"[b]{}[/] points, [i]best: {}[/]"',
+    '"[color=red][hover=score]{}[/][/] and {}"',
+]
+
+
+def program(iterations: int) -> str:
+    values = ", ".join(str(i) for i in range(iterations))
+    lines = ["let best = dyn(0)", f"for i in ({values}) {{"]
+    lines += [f"    print({markup}, i, best)" for markup in FORMATS]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def markup_time(code: str, cached: bool) -> float:
+    """ the time spent in the markup parser during one compilation, in seconds """
+    compile_template = MarkupParser.compile_template
+    compile_template.cache_clear()
+    if not cached:
+        MarkupParser.compile_template = compile_template.__wrapped__
+
+    get_compiler().function_cache = FunctionCache()
+    config = Config()
+    config.input_string = code
+    try:
+        with profiling(Profiler({"markup"})) as profiler:
+            compileMcScript(config)
+    finally:
+        MarkupParser.compile_template = compile_template
+    return sum(entry.total_time for entry in profiler.entries.values()) / 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per size")
+    parser.add_argument("--sizes", default="50,200,800", help="the numbers of loop iterations")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'messages':<12}{'parsed (ms)':>14}{'templates (ms)':>16}{'speedup':>10}")
+    for size in (int(i) for i in args.sizes.split(",")):
+        code = program(size)
+        uncached = median(markup_time(code, False) for _ in range(args.runs))
+        cached = median(markup_time(code, True) for _ in range(args.runs))
+        print(f"{size * len(FORMATS):<12}{uncached * 1000:>14.2f}{cached * 1000:>16.2f}{uncached / cached:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
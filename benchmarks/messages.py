@@ -0,0 +1,65 @@
+"""
+Measures the compile time of programs that print many messages.
+
+Messages are kept as json text components in the ir (see mcscript/utils/JsonTextFormat/textComponents.py),
+so the optimizer knows exactly which scores a message reads. The backend serializes every distinct message
+once, even if it is printed at many places. The program prints `size` values, each message is repeated
+`repeat` times.
+
+Usage: python benchmarks/messages.py [--runs N] [--sizes 10,40,160] [--repeat 4]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+from typing import Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.Config import Config
+
+
+def program(size: int, repeat: int) -> str:
+    lines = ["let g = dyn(1)"]
+    for i in range(size):
+        lines.append(f"let v{i} = g * {i + 2} + 1")
+        lines += [f'print("[b]value {i}:[/] {{}} and {{}}", v{i}, v{i} * 3)'] * repeat
+    return "\n".join(lines) + "\n"
+
+
+def compile_program(code: str) -> Tuple[float, float, int, int]:
+    """ Returns the compile time and the time of the backend in seconds, the number of messages
+    and the number of distinct messages """
+    # every run should compile everything
+    get_compiler().function_cache = FunctionCache()
+    config = Config()
+    config.input_string = code
+    _, report = compileMcScript(config)
+    return sum(report.stage_times.values()) - report.stage_times["Optimizing"], \
+        report.stage_times["Running ir backend"], report.nodes_after_optimize.get("MessageNode", 0), report.messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--sizes", default="10,40,160", help="the numbers of printed values")
+    parser.add_argument("--repeat", type=int, default=4, help="how often every message is printed")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'values':<8}{'compile (ms)':>14}{'backend (ms)':>14}{'messages':>10}{'distinct':>10}")
+    for size in (int(i) for i in args.sizes.split(",")):
+        code = program(size, args.repeat)
+        results = [compile_program(code) for _ in range(args.runs)]
+        time, backend_time = median(i[0] for i in results), median(i[1] for i in results)
+        _, _, messages, distinct = results[0]
+        print(f"{size:<8}{time * 1000:>14.1f}{backend_time * 1000:>14.1f}{messages:>10}{distinct:>10}")
+
+
+if __name__ == '__main__':
+    main()
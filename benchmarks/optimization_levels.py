@@ -0,0 +1,70 @@
+"""
+Compares the optimization levels (see mcscript/ir/optimize/PassManager.py) on the examples and on a generated program.
+
+For every level the time of the optimization, the number of iterations of the passes, the number of ir nodes
+and the size of the datapack are printed. With --passes, the runs, rewrites and time of every pass are printed, too.
+Examples that do not compile are skipped.
+
+Usage: python benchmarks/optimization_levels.py [--runs N] [--passes]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+from typing import Iterator, Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.CompileReport import CompileReport
+from mcscript.data.Config import Config
+from mcscript.ir.optimize.PassManager import MAX_LEVEL, MIN_LEVEL
+from workload import generate
+
+
+def programs() -> Iterator[Tuple[str, str]]:
+    for path in sorted((ROOT / "examples").glob("*.mcscript")):
+        yield path.stem, path.read_text(encoding="utf-8")
+    yield "workload", generate(functions=4, statements=40, depth=1, chain=2)
+
+
+def compile_program(code: str, level: int) -> CompileReport:
+    # every run should compile everything
+    get_compiler().function_cache = FunctionCache()
+    config = Config()
+    config.input_string = code
+    config.optimization_level = level
+    return compileMcScript(config)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per program and level")
+    parser.add_argument("--passes", action="store_true", help="print the statistics of every pass")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'program':<20}{'level':>6}{'optimize (ms)':>15}{'iterations':>12}{'nodes':>8}{'bytes':>9}")
+    for name, code in programs():
+        for level in range(MIN_LEVEL, MAX_LEVEL + 1):
+            try:
+                reports = [compile_program(code, level) for _ in range(args.runs)]
+            except Exception:
+                print(f"{name:<20}{level:>6}  does not compile")
+                break
+            time = median(i.stage_times["Optimizing"] for i in reports)
+            report = reports[0]
+            print(f"{name:<20}{level:>6}{time * 1000:>15.1f}{report.optimization_iterations:>12}"
+                  f"{sum(report.nodes_after_optimize.values()):>8}{report.output_bytes:>9}")
+            if args.passes:
+                for pass_name, statistics in report.passes.items():
+                    print(f"{'':<26}{pass_name:<24}{statistics['runs']:>4} runs{statistics['rewrites']:>6} rewrites"
+                          f"{statistics['time'] * 1000:>9.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
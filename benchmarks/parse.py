@@ -0,0 +1,80 @@
+"""
+Compares the syntax tree that the parser builds (see mcscript/utils/astBuilder.py) with the lark tree it replaced.
+
+Both parsers use the same grammar and the same lalr tables:
+    lark: lark trees with a separate meta object for the positions
+    ast:  slotted nodes with the positions inline, where rules that only wrap another node are collapsed
+
+For generated programs of increasing size the benchmark prints the median parse time, the number of nodes and
+the memory that the tree occupies (measured with tracemalloc).
+
+Usage: python benchmarks/parse.py [--runs N] [--sizes 8,32,128]
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Callable
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import get_grammar
+from mcscript.utils.grammarCache import load_grammar
+from workload import generate
+
+
+def parse_time(parse: Callable, code: str, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        gc.collect()
+        start_time = perf_counter()
+        parse(code)
+        times.append(perf_counter() - start_time)
+    return median(times)
+
+
+def tree_memory(parse: Callable, code: str) -> int:
+    """ The number of bytes that are still allocated for the tree after parsing """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tree = parse(code)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del tree
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per size and parser")
+    parser.add_argument("--sizes", default="8,32,128", help="the numbers of generated functions")
+    args = parser.parse_args()
+
+    # the options must be the same as in mcscript/__init__.py, except for the tree builder
+    parsers = {
+        "lark": load_grammar("McScript.lark", parser="lalr", propagate_positions=True, maybe_placeholders=True).parse,
+        "ast": get_grammar().parse
+    }
+
+    print(f"{'functions':<12}{'bytes':>10}" +
+          "".join(f"{name + ' ' + column:>16}" for name in parsers for column in ("(ms)", "nodes", "(KiB)")))
+    for size in (int(i) for i in args.sizes.split(",")):
+        code = generate(functions=size, statements=5, depth=1, chain=2)
+        row = f"{size:<12}{len(code.encode()):>10}"
+        for parse in parsers.values():
+            nodes = sum(1 for _ in parse(code).iter_subtrees())
+            row += f"{parse_time(parse, code, args.runs) * 1000:>16.2f}{nodes:>16}"
+            row += f"{tree_memory(parse, code) / 1024:>16.1f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
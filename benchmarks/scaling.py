@@ -0,0 +1,156 @@
+"""
+Measures how the time of each compile stage and the peak memory grow with the size of the program.
+
+The programs are generated by benchmarks/workload.py. Every sweep grows one dimension of the workload
+(the number of functions, the statements per block, the nesting depth or the length of boolean chains),
+while the other dimensions keep their small default value.
+
+For every stage, the exponent k of time ~ bytes^k is estimated from the two largest sizes of a sweep.
+Linear stages have an exponent of about 1. The benchmark fails if an exponent is larger than --max-exponent.
+Stages that take less than --min-time milliseconds are ignored, since their times are mostly noise.
+
+Usage: python benchmarks/scaling.py [--runs N] [--max-exponent 1.5] [--min-time 20] [--only DIMENSION] [--plot FILE]
+"""
+import argparse
+import logging
+import math
+import sys
+from pathlib import Path
+from statistics import median
+from typing import Dict, List
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from stages import peak_memory, run, STAGES
+from workload import generate
+
+# the parameters of the workload if they are not swept
+DEFAULTS = {"functions": 2, "statements": 5, "depth": 1, "chain": 2}
+
+SWEEPS = {
+    "functions": [2, 4, 8, 16],
+    "statements": [5, 10, 20, 40],
+    # the program size grows exponentially with the depth
+    "depth": [0, 1, 2, 3],
+    "chain": [2, 4, 8, 16]
+}
+
+
+def measure(dimension: str, size: int, runs: int) -> dict:
+    code = generate(**{**DEFAULTS, dimension: size})
+    samples = [run(code) for _ in range(runs)]
+    for _, error in samples:
+        if error is not None:
+            raise RuntimeError(f"The workload {dimension}={size} does not compile: {error}")
+
+    return {
+        "size": size,
+        "bytes": len(code.encode()),
+        "stages": {stage: median(i[0][stage] for i in samples) for stage in samples[0][0]},
+        "peak_memory": peak_memory(code)
+    }
+
+
+def exponent(small_x: float, large_x: float, small_y: float, large_y: float) -> float:
+    """ The slope between two points on a log-log plot """
+    if small_x == large_x or small_y <= 0 or large_y <= 0:
+        return 0
+    return math.log(large_y / small_y) / math.log(large_x / small_x)
+
+
+def check(dimension: str, results: List[dict], max_exponent: float, min_time: float) -> List[str]:
+    """ Returns a message for every stage of the sweep which grows faster than `max_exponent` """
+    small, large = results[-2], results[-1]
+    problems = []
+    for stage in STAGES.values():
+        if stage not in large["stages"] or large["stages"][stage] < min_time:
+            continue
+        k = exponent(small["bytes"], large["bytes"], small["stages"][stage], large["stages"][stage])
+        if k > max_exponent:
+            problems.append(f"{dimension}: {stage} grows with bytes^{k:.2f} "
+                            f"({large['stages'][stage] * 1000:.1f}ms at {large['bytes']} bytes)")
+
+    k = exponent(small["bytes"], large["bytes"], small["peak_memory"], large["peak_memory"])
+    if k > max_exponent:
+        problems.append(f"{dimension}: peak memory grows with bytes^{k:.2f} "
+                        f"({large['peak_memory'] / 1024:.0f}KiB at {large['bytes']} bytes)")
+    return problems
+
+
+def plot(sweeps: Dict[str, List[dict]], path: str):
+    """ Plots the time of each stage and the peak memory against the size of the program, one column per sweep """
+    # matplotlib is only needed for this option
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, axes = plt.subplots(2, len(sweeps), figsize=(5 * len(sweeps), 8), squeeze=False)
+    for column, (dimension, results) in enumerate(sweeps.items()):
+        sizes = [i["bytes"] for i in results]
+        time_axis, memory_axis = axes[0][column], axes[1][column]
+        for stage in STAGES.values():
+            if all(stage in i["stages"] for i in results):
+                time_axis.plot(sizes, [i["stages"][stage] * 1000 for i in results], marker="o", label=stage)
+        time_axis.set_title(f"growing {dimension}")
+        time_axis.set_ylabel("time (ms)")
+        time_axis.legend()
+
+        memory_axis.plot(sizes, [i["peak_memory"] / 1024 for i in results], marker="o")
+        memory_axis.set_ylabel("peak memory (KiB)")
+        memory_axis.set_xlabel("program size (bytes)")
+
+        for axis in (time_axis, memory_axis):
+            axis.set_xscale("log")
+            axis.set_yscale("log")
+
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--max-exponent", type=float, default=1.5, help="the largest allowed growth exponent")
+    parser.add_argument("--min-time", type=float, default=20, help="ignore stages faster than this many milliseconds")
+    parser.add_argument("--only", choices=SWEEPS, help="only sweep this dimension")
+    parser.add_argument("--plot", help="save a log-log plot of the results to this file (requires matplotlib)")
+    args = parser.parse_args()
+
+    # the compiler logs every stage and warns about every new config
+    logging.disable(logging.WARNING)
+
+    # builds the grammars
+    run(generate(**DEFAULTS))
+
+    sweeps = {}
+    problems = []
+    for dimension, sizes in SWEEPS.items():
+        if args.only is not None and dimension != args.only:
+            continue
+        print(f"{dimension:<12}{'bytes':>8}" + "".join(f"{i + ' (ms)':>15}" for i in STAGES.values()) +
+              f"{'peak (KiB)':>12}")
+        results = sweeps[dimension] = []
+        for size in sizes:
+            result = measure(dimension, size, args.runs)
+            results.append(result)
+            stages = result["stages"]
+            print(f"{size:<12}{result['bytes']:>8}" +
+                  "".join(f"{stages[i] * 1000:>15.2f}" if i in stages else f"{'-':>15}" for i in STAGES.values()) +
+                  f"{result['peak_memory'] / 1024:>12.0f}")
+        problems += check(dimension, results, args.max_exponent, args.min_time / 1000)
+        print()
+
+    if args.plot is not None:
+        plot(sweeps, args.plot)
+        print(f"Saved the plot to {args.plot}")
+
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print("No super-linear growth")
+
+
+if __name__ == '__main__':
+    main()
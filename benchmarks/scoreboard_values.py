@@ -0,0 +1,41 @@
+"""
+Counts the scoreboard values that a datapack writes to, before and after the ScoreboardAllocator reused the scores
+of temporaries (see mcscript/ir/optimize/ScoreboardAllocator.py).
+
+The programs are generated by benchmarks/workload.py with a growing number of statements per block.
+
+Usage: python benchmarks/scoreboard_values.py [--statements 5,10,20,40] [--functions 4]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript.compile import compileMcScript
+from mcscript.data.Config import Config
+from workload import generate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", default="5,10,20,40", help="the numbers of statements per block")
+    parser.add_argument("--functions", type=int, default=4, help="the number of functions")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'statements':<12}{'before':>8}{'after':>8}{'saved':>8}{'optimize (ms)':>15}")
+    for statements in (int(i) for i in args.statements.split(",")):
+        config = Config()
+        config.input_string = generate(functions=args.functions, statements=statements, depth=1, chain=2)
+        _, report = compileMcScript(config)
+
+        before, after = report.temporaries_before_allocation, report.temporaries
+        print(f"{statements:<12}{before:>8}{after:>8}{1 - after / before:>8.0%}"
+              f"{report.stage_times['Optimizing'] * 1000:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Measures how fast selectors are parsed (see mcscript/data/selector/selectorParser.py).
+
+    parse:    every distinct selector is parsed with an empty cache and again with a warm cache
+    nbt:      the parse time of selectors with growing nbt values, which has to grow linearly
+    compile:  programs that use many distinct selectors in run blocks, compiled with the selector cache cleared
+
+Usage: python benchmarks/selector_parser.py [--runs N] [--count 2000]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import List
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+# noinspection PyProtectedMember
+from mcscript.data.selector.Selector import _parse_cached, Selector
+from stages import run
+
+
+def selectors(count: int) -> List[str]:
+    """ distinct selectors which use every kind of value """
+    return [
+        f"@e[type=armor_stand,tag=!t{i},level={i}..{i + 5},scores={{s{i}={i}..}},"
+        f"nbt={{Tags:[\"a{i}\"],Data:{{v:{i}}}}},name=\"marker {i}\"]"
+        for i in range(count)
+    ]
+
+
+def parse_time(texts: List[str], runs: int, warm: bool) -> float:
+    """ the median time to parse all texts, in seconds """
+    times = []
+    for _ in range(runs):
+        _parse_cached.cache_clear()
+        if warm:
+            for text in texts:
+                Selector.from_string(text)
+        start_time = perf_counter()
+        for text in texts:
+            Selector.from_string(text)
+        times.append(perf_counter() - start_time)
+    return median(times)
+
+
+def program(count: int) -> str:
+    return "\n".join(f"run for @e[tag=t{i},type=armor_stand] {{\n    run at @s {{\n        let a{i} = {i}\n    }}\n}}"
+                     for i in range(count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="timed runs of every measurement")
+    parser.add_argument("--count", type=int, default=2000, help="the number of distinct selectors")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    texts = selectors(args.count)
+    cold = parse_time(texts, args.runs, False)
+    warm = parse_time(texts, args.runs, True)
+    print(f"parse {len(texts)} selectors: {cold * 1000:.2f}ms ({cold / len(texts) * 1e6:.2f}µs each), "
+          f"cached: {warm * 1000:.2f}ms ({warm / len(texts) * 1e6:.2f}µs each)")
+
+    print(f"\n{'nbt (chars)':<14}{'parse (µs)':>12}{'µs / 1000 chars':>18}")
+    for size in (1000, 10000, 100000):
+        text = "@e[nbt={" + ",".join(f"k{i}:{{v:{i}}}" for i in range(size // 10))[:size] + "}]"
+        text = text[:text.rindex(",")] + "}]"
+        time = parse_time([text], args.runs, False)
+        print(f"{len(text):<14}{time * 1e6:>12.1f}{time * 1e9 / len(text):>18.2f}")
+
+    print(f"\n{'selectors':<12}{'compile (ms)':>14}")
+    for count in (50, 200):
+        code = program(count)
+        times = []
+        for _ in range(args.runs):
+            _parse_cached.cache_clear()
+            stage_times, error = run(code)
+            if error is not None:
+                raise RuntimeError(f"The program does not compile: {error}")
+            times.append(sum(stage_times.values()))
+        print(f"{count:<12}{median(times) * 1000:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
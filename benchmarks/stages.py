@@ -0,0 +1,58 @@
+"""
+Helpers for the benchmarks, which measure a single compilation of a script.
+
+The benchmarks put the repository root on the path before they import this module.
+"""
+import tracemalloc
+from typing import Dict, Optional, Tuple
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.Config import Config
+from mcscript.utils.profiler import Profiler, profiling
+
+# the name of each compile stage in the profiler and in the baselines
+STAGES = {
+    "Parsing": "parse",
+    "Analyzing context": "analyze",
+    "Compiling": "compile",
+    "Optimizing": "optimize",
+    "Running ir backend": "backend"
+}
+
+
+def run(code: str) -> Tuple[Dict[str, float], Optional[str]]:
+    """ Compiles `code` once and returns the time of each stage in seconds and the error, if any """
+    # every run should compile everything
+    get_compiler().function_cache = FunctionCache()
+
+    config = Config()
+    config.input_string = code
+    error = None
+    with profiling(Profiler({"stage"})) as profiler:
+        try:
+            compileMcScript(config)
+        except Exception as e:
+            error = type(e).__name__
+
+    times = {STAGES[name]: entry.total_time / 1e9 for (_, name), entry in profiler.entries.items()}
+    # optimizing is part of compiling
+    if "optimize" in times:
+        times["compile"] -= times["optimize"]
+    return times, error
+
+
+def peak_memory(code: str) -> int:
+    """ Returns the peak memory of a compilation in bytes """
+    get_compiler().function_cache = FunctionCache()
+    config = Config()
+    config.input_string = code
+    tracemalloc.start()
+    try:
+        compileMcScript(config)
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
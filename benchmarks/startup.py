@@ -0,0 +1,69 @@
+"""
+Measures how long it takes to start the command line interface, using the import times of python (-X importtime).
+
+Every run starts a new python process which imports mcscript.cli. The benchmark prints the median cumulative import
+time of mcscript.cli, the slowest imported modules and the wall time of `mcscript --help`.
+It fails if the import takes longer than --budget milliseconds.
+tests/test_startup.py enforces the same budget.
+
+Usage: python benchmarks/startup.py [--runs N] [--budget 100] [--top 15]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Dict, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+HELP_CODE = "from mcscript.cli import main\nmain(['--help'])"
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """ Imports `module` in a new process and returns the self and cumulative import time of every module in µs """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        if not self_time.strip().isdigit():
+            # the header
+            continue
+        times[name.strip()] = int(self_time), int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="number of started processes")
+    parser.add_argument("--budget", type=float, default=100, help="the allowed import time in milliseconds")
+    parser.add_argument("--top", type=int, default=15, help="the number of modules to list")
+    args = parser.parse_args()
+
+    runs = [import_times("mcscript.cli") for _ in range(args.runs)]
+    total = median(i["mcscript.cli"][1] for i in runs) / 1000
+
+    modules = {name: median(run[name][0] for run in runs if name in run) for name in runs[-1]}
+    print(f"{'module':<60}{'self (ms)':>12}")
+    for name, self_time in sorted(modules.items(), key=lambda i: i[1], reverse=True)[:args.top]:
+        print(f"{name:<60}{self_time / 1000:>12.2f}")
+
+    help_times = []
+    for _ in range(args.runs):
+        start_time = perf_counter()
+        subprocess.run([sys.executable, "-c", HELP_CODE], cwd=ROOT, capture_output=True, check=True)
+        help_times.append(perf_counter() - start_time)
+
+    print(f"\nimport mcscript.cli: {total:.2f}ms (budget {args.budget:.0f}ms)")
+    print(f"mcscript --help: {median(help_times) * 1000:.2f}ms, including the start of python")
+    if total > args.budget:
+        print("Over budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
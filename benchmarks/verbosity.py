@@ -0,0 +1,81 @@
+"""
+Measures what the debug output costs on large generated programs.
+
+Every program is compiled in three modes:
+    quiet:   the default, no debug messages and no dumps
+    verbose: debug messages are written to the log file (mcscript -v)
+    dump:    the parse tree and the ir are written to dump files (mcscript compile --dump),
+             which is what every compilation did before the verbosity mode existed
+
+The time of the optimizer is left out. It does not depend on the mode, but it grows much faster than the other
+stages and would hide the differences.
+
+Usage: python benchmarks/verbosity.py [--runs N] [--sizes 8,16,32]
+"""
+import argparse
+import gc
+import logging
+import sys
+import tempfile
+from pathlib import Path
+from statistics import median
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcscript import set_verbose
+from mcscript.utils.dumps import Dumper, dumping
+from stages import run
+from workload import generate
+
+MODES = ("quiet", "verbose", "dump")
+
+
+def compile_time(code: str, mode: str, dump_directory: Path) -> float:
+    # garbage of the previous run should not be collected during this run
+    gc.collect()
+    set_verbose(mode == "verbose")
+    try:
+        if mode == "dump":
+            with dumping(Dumper(dump_directory)):
+                times, error = run(code)
+        else:
+            times, error = run(code)
+    finally:
+        set_verbose(False)
+
+    if error is not None:
+        raise RuntimeError(f"The workload does not compile: {error}")
+    # run reports optimizing apart from compiling
+    return sum(time for stage, time in times.items() if stage != "optimize")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per size and mode")
+    parser.add_argument("--sizes", default="8,16,32", help="the numbers of generated functions")
+    args = parser.parse_args()
+
+    # only the log file should receive messages
+    for handler in logging.getLogger("McScript").handlers:
+        if not isinstance(handler, logging.FileHandler):
+            handler.setLevel(logging.CRITICAL)
+
+    # builds the grammars
+    run(generate(functions=1))
+
+    print(f"{'functions':<12}{'bytes':>10}" + "".join(f"{i + ' (ms)':>16}" for i in MODES) + f"{'saved (ms)':>12}{'saved':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(i) for i in args.sizes.split(",")):
+            code = generate(functions=size, statements=5, depth=1, chain=2)
+            times = {
+                mode: median(compile_time(code, mode, Path(directory, f"{mode}_{i}")) for i in range(args.runs))
+                for mode in MODES
+            }
+            saved = times["dump"] - times["quiet"]
+            print(f"{size:<12}{len(code.encode()):>10}" + "".join(f"{times[i] * 1000:>16.2f}" for i in MODES) +
+                  f"{saved * 1000:>12.2f}{saved / times['dump']:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Generates valid McScript programs of a configurable size, to find out how the compiler scales.
+
+Usage: python benchmarks/workload.py [--functions N] [--statements M] [--depth D] [--chain C] [--seed S]
+"""
+import argparse
+import random
+from typing import List
+
+
+class WorkloadGenerator:
+    """
+    Creates a program with `functions` functions, which are called once each from the global scope.
+    Every block has `statements` statements and `depth` levels of nested if and while blocks.
+    Conditions are boolean chains of `chain` comparisons.
+    """
+
+    def __init__(self, functions: int = 10, statements: int = 10, depth: int = 2, chain: int = 4, seed: int = 0):
+        self.functions = functions
+        self.statements = statements
+        self.depth = depth
+        self.chain = chain
+        self.random = random.Random(seed)
+
+        self._variable_counter = 0
+
+    def generate(self) -> str:
+        lines = ["let g = dyn(1)"]
+        for i in range(self.functions):
+            lines += self.function(i)
+        for i in range(self.functions):
+            lines.append(f"let r{i} = f{i}(g)")
+        lines.append(f'print("{{}}", {" + ".join(f"r{i}" for i in range(self.functions)) or "0"})')
+        return "\n".join(lines) + "\n"
+
+    def function(self, index: int) -> List[str]:
+        self._variable_counter = 0
+        return [
+            f"fun f{index}(x: Int) -> Int {{",
+            f"    let v = x + {index + 1}",
+            *self.block(1, ["v"]),
+            "    v",
+            "}",
+            ""
+        ]
+
+    def block(self, level: int, variables: List[str]) -> List[str]:
+        """ Returns the statements of a block with the indentation `level` """
+        indent = "    " * level
+        variables = list(variables)
+        lines = []
+        for i in range(self.statements):
+            kind = self.random.randrange(4)
+            target = self.random.choice(variables)
+            if kind == 0:
+                variable = f"w{self._variable_counter}"
+                self._variable_counter += 1
+                lines.append(f"{indent}let {variable} = {target} * {self.random.randint(2, 9)} + "
+                             f"{self.random.choice(variables)}")
+                variables.append(variable)
+            elif kind == 1:
+                lines.append(f"{indent}{target} += {self.random.randint(1, 9)}")
+            elif kind == 2:
+                lines.append(f"{indent}{target} = {target} % {self.random.randint(50, 100)} + 1")
+            else:
+                lines.append(f"{indent}{target} = {self.random.choice(variables)} - {self.random.randint(1, 9)}")
+
+        if level <= self.depth:
+            lines.append(f"{indent}if {self.condition(variables)} {{")
+            lines += self.block(level + 1, variables)
+            lines.append(f"{indent}}}")
+
+            counter = f"c{self._variable_counter}"
+            self._variable_counter += 1
+            lines.append(f"{indent}let {counter} = 0")
+            lines.append(f"{indent}while {counter} < {self.random.randint(2, 5)} and ({self.condition(variables)}) {{")
+            lines.append(f"{indent}    {counter} += 1")
+            lines += self.block(level + 1, variables)
+            lines.append(f"{indent}}}")
+        return lines
+
+    def condition(self, variables: List[str]) -> str:
+        """ A boolean chain of comparisons """
+        comparisons = [
+            f"{self.random.choice(variables)} {self.random.choice(('<', '>', '==', '!=', '<=', '>='))} "
+            f"{self.random.randint(0, 100)}"
+            for _ in range(max(self.chain, 1))
+        ]
+        condition = comparisons[0]
+        for comparison in comparisons[1:]:
+            condition += f" {self.random.choice(('and', 'or'))} {comparison}"
+        return condition
+
+
+def generate(functions: int = 10, statements: int = 10, depth: int = 2, chain: int = 4, seed: int = 0) -> str:
+    """ Generates a program, see `WorkloadGenerator` """
+    return WorkloadGenerator(functions, statements, depth, chain, seed).generate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--functions", type=int, default=10)
+    parser.add_argument("--statements", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--chain", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(generate(args.functions, args.statements, args.depth, args.chain, args.seed), end="")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,39 @@
 from __future__ import annotations
 
 import logging
-from importlib import resources
 from os.path import join
 from typing import TYPE_CHECKING
 
-from lark import Lark
-
-from mcscript.utils.dirPaths import LOG_DIRECTORY
+from mcscript.utils.dirPaths import getLogDir
 
 if TYPE_CHECKING:
+    from lark import Lark
+
     from mcscript.compiler.Compiler import Compiler
 
 __version__ = "0.0.1"
 
+
+class _LogFileHandler(logging.FileHandler):
+    """
+    Writes to latest.log in the log directory.
+    The file is only created, or the log of the previous run cleared, when the first message is written.
+    """
+
+    def __init__(self):
+        super().__init__("latest.log", mode="w", encoding="utf-8", delay=True)
+
+    def _open(self):
+        self.baseFilename = join(getLogDir(), "latest.log")
+        return super()._open()
+
+
 # setting up the logger as early as possible
+# debug messages are only logged in verbose mode, see `set_verbose`
 Logger = logging.getLogger("McScript")
-Logger.setLevel(logging.DEBUG)
+Logger.setLevel(logging.INFO)
 
-# clear logging file
-fPath = join(LOG_DIRECTORY, "latest.log")
-open(fPath, "w+").close()
-_fh = logging.FileHandler(fPath, encoding="utf-8")
+_fh = _LogFileHandler()
 _fh.setLevel(logging.DEBUG)
 
 _ch = logging.StreamHandler()
@@ -34,23 +46,24 @@ _ch.setFormatter(_formatter)
 Logger.addHandler(_ch)
 Logger.addHandler(_fh)
 
-Logger.info("Logger initialized")
-Logger.info(f"Logfile at {fPath}")
-
 GLOBAL_GRAMMAR = None
 JSON_MARKUP_GRAMMAR = None
-SELECTOR_GRAMMAR = None
 GLOBAL_COMPILER = None
 
 
 def get_grammar() -> Lark:
     global GLOBAL_GRAMMAR
     if GLOBAL_GRAMMAR is None:
-        GLOBAL_GRAMMAR = Lark(
-            resources.read_text("mcscript", "McScript.lark"),
+        from mcscript.utils.astBuilder import AstBuilder, AstNode
+        from mcscript.utils.grammarCache import load_grammar
+        # the syntax tree is built while parsing, see `mcscript.utils.astBuilder`
+        GLOBAL_GRAMMAR = load_grammar(
+            "McScript.lark",
             parser="lalr",
             propagate_positions=True,
-            maybe_placeholders=True
+            maybe_placeholders=True,
+            tree_class=AstNode,
+            transformer=AstBuilder()
         )
         Logger.debug("Grammar loaded")
     return GLOBAL_GRAMMAR
@@ -59,28 +72,19 @@ def get_grammar() -> Lark:
 def get_json_markup_grammar() -> Lark:
     global JSON_MARKUP_GRAMMAR
     if JSON_MARKUP_GRAMMAR is None:
-        JSON_MARKUP_GRAMMAR = Lark(
-            resources.read_text("mcscript", "textMarkup.lark"),
+        from mcscript.utils.grammarCache import load_grammar
+        JSON_MARKUP_GRAMMAR = load_grammar(
+            "textMarkup.lark",
             parser="lalr",
-            maybe_placeholders=True,
-            # cache=True
+            maybe_placeholders=True
         )
         Logger.debug("[JsonTextFormat] Loaded grammar textMarkup")
     return JSON_MARKUP_GRAMMAR
 
 
-def get_selector_grammar() -> Lark:
-    global SELECTOR_GRAMMAR
-    if SELECTOR_GRAMMAR is None:
-        SELECTOR_GRAMMAR = Lark(
-            resources.read_text("mcscript", "selector.lark"),
-            # The nbt matcher does not work with lalr
-            parser="earley",
-            maybe_placeholders=False,
-            propagate_positions=True,
-        )
-        Logger.debug("[Selector] Grammar loaded!")
-    return SELECTOR_GRAMMAR
+def set_verbose(verbose: bool):
+    """ Enables or disables debug messages in the log file """
+    Logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
 
 def get_compiler() -> Compiler:
@@ -91,4 +95,4 @@ def get_compiler() -> Compiler:
     return GLOBAL_COMPILER
 
 
-__all__ = ("get_grammar", "get_json_markup_grammar", "get_selector_grammar", "get_compiler", "Logger")
+__all__ = ("get_grammar", "get_json_markup_grammar", "get_compiler", "set_verbose", "Logger")
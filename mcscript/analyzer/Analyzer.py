@@ -6,14 +6,6 @@ from mcscript import Logger
 from mcscript.analyzer.VariableContext import VariableAccess, VariableContext, NamespaceContext
 
 
-def getVar(contexts: List[NamespaceContext], name: str) -> Optional[VariableContext]:
-    for context in reversed(contexts):
-        for var in context.variables:
-            if var.identifier == name:
-                return var
-    return None
-
-
 class Analyzer:
     """
     Analyzes variables in a mcscript syntax tree.
@@ -31,16 +23,36 @@ class Analyzer:
         # A context is identified by its line and column
         self.contexts: List[NamespaceContext] = []
         self.stack: List[NamespaceContext] = []
+        # the variables that are visible in the current context by name. The last variable of a list is the innermost
+        self.symbols: Dict[str, List[VariableContext]] = {}
 
     def push_context(self, line: int, column: int):
-        c = NamespaceContext([], [], (line, column))
-        for context in self.stack:
-            context.inner_contexts.append(c)
+        parent = self.stack[-1] if self.stack else None
+        c = NamespaceContext({}, (line, column), parent, len(self.contexts))
         self.contexts.append(c)
-        self.stack.append(self.contexts[-1])
+        self.stack.append(c)
 
     def pop_context(self):
-        self.stack.pop()
+        context = self.stack.pop()
+        context.last_inner_index = len(self.contexts) - 1
+        for name in context.variables:
+            shadowed = self.symbols[name]
+            shadowed.pop()
+            if not shadowed:
+                del self.symbols[name]
+
+    def get_var(self, name: str) -> Optional[VariableContext]:
+        """ Returns the innermost variable `name` that is visible in the current context """
+        variables = self.symbols.get(str(name), None)
+        return variables[-1] if variables else None
+
+    def declare_var(self, variable: VariableContext):
+        """ Declares a variable in the current context. If it already exists in the context, it is ignored. """
+        name = str(variable.identifier)
+        variables = self.stack[-1].variables
+        if name not in variables:
+            variables[name] = variable
+            self.symbols.setdefault(name, []).append(variable)
 
     def visit(self, tree: Tree):
         return getattr(self, tree.data, self._default)(tree)
@@ -59,10 +71,13 @@ class Analyzer:
             the original tree and a list of context which contain a list of `VariableContext`
         """
         self.contexts: List[NamespaceContext] = []
+        self.stack = []
+        self.symbols = {}
         # the global context
         self.push_context(0, 0)
 
         self.visit(tree)
+        self.pop_context()
 
         return tree, {i.definition: i for i in self.contexts}
 
@@ -82,7 +97,7 @@ class Analyzer:
         self_type, *parameters = parameter_list.children
 
         if self_type:
-            self.stack[-1].variables.append(VariableContext(
+            self.declare_var(VariableContext(
                 str(self_type),
                 VariableAccess(self_type, self.stack[-1].definition),
                 False,
@@ -95,7 +110,7 @@ class Analyzer:
 
     def function_parameter(self, tree: Tree):
         name, _type = tree.children
-        self.stack[-1].variables.append(VariableContext(
+        self.declare_var(VariableContext(
             name,
             VariableAccess(tree, self.stack[-1].definition),
             False,
@@ -105,7 +120,7 @@ class Analyzer:
     def control_for(self, tree: Tree):
         _, var, _, expression, block = tree.children
         self.push_context(block.line, block.column)
-        self.stack[-1].variables.append(VariableContext(
+        self.declare_var(VariableContext(
             var,
             VariableAccess(var, self.stack[-1].definition),
             False,
@@ -154,7 +169,7 @@ class Analyzer:
 
         identifier, *_ = accessor.children
 
-        if var := getVar(self.stack, identifier):
+        if var := self.get_var(identifier):
             var.writes.append(VariableAccess(tree, self.stack[-1].definition))
         else:
             # otherwise the user tries to access an undefined variable
@@ -168,7 +183,7 @@ class Analyzer:
         if not_implemented:
             return
 
-        if var := getVar(self.stack, identifier):
+        if var := self.get_var(identifier):
             var.writes.append(VariableAccess(tree, self.stack[-1].definition))
         else:
             Logger.error(f"[Analyzer] invalid variable array setter: '{identifier}' is not defined")
@@ -183,7 +198,7 @@ class Analyzer:
         if isinstance(value, Tree) and value.data == "accessor":
             identifier, *not_implemented = value.children
             if not not_implemented:
-                var = getVar(self.stack, identifier)
+                var = self.get_var(identifier)
                 if var:
                     var.reads.append(VariableAccess(tree, self.stack[-1].definition))
         elif isinstance(value, Tree) and value.data == "function_call":
@@ -193,18 +208,17 @@ class Analyzer:
             if children:
                 self._handle_variable(str(base_obj), value)
         elif isinstance(value, Tree):
-            for child in value.children:
-                if isinstance(child, Tree):
-                    self.visit(child)
+            # the value may be a collapsed expression, see `AstBuilder`
+            self.visit(value)
 
     #########################
     # Utility functions #####
     #########################
     def _handle_variable(self, variable_name: str, declaration: Tree):
-        if var := getVar(self.stack, variable_name):
+        if var := self.get_var(variable_name):
             var.writes.append(VariableAccess(declaration, self.stack[-1].definition))
         else:
-            self.stack[-1].variables.append(VariableContext(
+            self.declare_var(VariableContext(
                 variable_name,
                 VariableAccess(declaration, self.stack[-1].definition),
                 False,
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from lark import Tree
 
@@ -33,6 +33,18 @@ class VariableContext:
 
 @dataclass()
 class NamespaceContext:
-    variables: List[VariableContext]
-    inner_contexts: List[NamespaceContext]
+    """
+    The variables that are declared in a block.
+    The contexts form a tree in which every context points to the context that contains it.
+    """
+    variables: Dict[str, VariableContext]
     definition: Tuple[int, int]
+    parent: Optional[NamespaceContext] = field(default=None, repr=False, compare=False)
+    # the index of this context in a pre-order walk of the tree and the index of its last inner context,
+    # so every inner context has an index in this range
+    index: int = 0
+    last_inner_index: int = 0
+
+    def contains(self, other: NamespaceContext) -> bool:
+        """ Returns whether `other` is this context or any context inside of it """
+        return self.index <= other.index <= self.last_inner_index
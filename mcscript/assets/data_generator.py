@@ -5,7 +5,6 @@ from subprocess import run
 from typing import Dict
 
 from mcscript import Logger, assets
-from mcscript.assets.download import download_minecraft_server, get_latest_version
 from mcscript.utils.dirPaths import getVersionDir
 
 
@@ -14,6 +13,8 @@ def makeData(version: str) -> str:
     writes all important minecraft data to a file and returns the path
     Note that this wil crash if the version is below 1.14.
     """
+    # urllib and certifi are slow to import
+    from mcscript.assets.download import download_minecraft_server, get_latest_version
 
     version = version or get_latest_version()
 
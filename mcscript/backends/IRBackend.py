@@ -2,12 +2,11 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from functools import cached_property
-from logging import DEBUG
 from typing import TypeVar, Generic
 
-from mcscript import Logger
 from mcscript.data.Config import Config
 from mcscript.ir.components import *
+from mcscript.utils.dumps import dump
 
 if TYPE_CHECKING:
     from mcscript.ir.IrMaster import IrMaster
@@ -29,9 +28,7 @@ class IRBackend(Generic[T], ABC):
         self.ir_master = ir_master
 
     def generate(self) -> T:
-        if Logger.isEnabledFor(DEBUG):
-            for function in self.ir_master.function_nodes:
-                Logger.debug(f"{str(function)}")
+        dump("optimized ir", self.ir_master.write_functions)
         for function_node in self.ir_master.function_nodes:
             self.handle_function_node(function_node)
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import io
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 
 from mcscript.backends.mc_datapack_backend import get_resource
 from mcscript.data.Config import Config
@@ -63,18 +63,51 @@ class Directory:
         except KeyError:
             raise AttributeError(f"Non-existing file {file}")
 
-    def write(self, path: Path):
+    def write(self, path: Path, only_changed: bool = False) -> List[Path]:
+        """
+        Writes all files of this directory and its sub-directories to `path`.
+
+        Args:
+            path: the target directory
+            only_changed: whether to skip files whose content on disk is already up to date
+
+        Returns:
+            The paths of all files that were written
+        """
         # this causes just trouble
         # if base.exists():
         #     shutil.rmtree(base)
         path.mkdir(exist_ok=True)
+        written = []
         for file_name in self.files:
             # noinspection PyTypeChecker
-            with open(path.joinpath(self.getFileName(path, file_name)), "w", encoding="utf-8") as f:
-                f.write(self.files[file_name].getvalue())
+            file_path = path.joinpath(self.getFileName(path, file_name))
+            content = self.files[file_name].getvalue()
+            if only_changed and _has_content(file_path, content):
+                continue
+            # functions of modules are in sub directories
+            if file_path.parent != path:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            written.append(file_path)
 
         for directory in self.subDirectories:
-            self.subDirectories[directory].write(path.joinpath(directory))
+            written += self.subDirectories[directory].write(path.joinpath(directory), only_changed)
+        return written
+
+    def paths(self, path: Path) -> Iterator[Path]:
+        """ Returns the paths of all files of this directory, if it gets written to `path`"""
+        for file_name in self.files:
+            yield path.joinpath(self.getFileName(path, file_name))
+
+        for directory in self.subDirectories:
+            yield from self.subDirectories[directory].paths(path.joinpath(directory))
+
+    def byte_size(self) -> int:
+        """ Returns the total size of all files of this directory and its sub-directories, encoded as utf-8 """
+        size = sum(len(self.files[i].getvalue().encode("utf-8")) for i in self.files)
+        return size + sum(i.byte_size() for i in self.subDirectories.values())
 
     def getFileName(self, dirName, rawName: str) -> str:
         return rawName
@@ -116,6 +149,14 @@ class Directory:
                     listeners.pop(filename)(file)
 
 
+def _has_content(path: Path, content: str) -> bool:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read() == content
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
 class FunctionDirectory(Directory):
     def getFileName(self, _, rawName: str) -> str:
         if rawName.split(".")[-1].lower() == "mcfunction":
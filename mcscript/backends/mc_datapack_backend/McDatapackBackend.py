@@ -10,6 +10,7 @@ from mcscript.backends.mc_datapack_backend.runtime import make_on_load_function
 from mcscript.backends.mc_datapack_backend.utils import position_to_str, relation_to_str
 from mcscript.data.Config import Config
 from mcscript.ir.components import *
+from mcscript.utils.JsonTextFormat.textComponents import JsonText, freeze, serialize
 from mcscript.utils.resources import Identifier
 
 
@@ -26,6 +27,9 @@ class McDatapackBackend(IRBackend[Datapack]):
         # A list of all constants used by this backend
         self.constant_scores: Dict[int, ScoreboardValue] = {}
 
+        # the serialized json text of every message, keyed by its frozen components
+        self.messages: Dict[Tuple, str] = {}
+
         self.on_tick_function: Optional[FunctionNode] = None
         self.on_load_function: Optional[FunctionNode] = None
 
@@ -269,9 +273,16 @@ class McDatapackBackend(IRBackend[Datapack]):
             ConditionalNode([ConditionalNode.IfScoreMatches(value, ScoreRange(0), False)])
         ))
 
+    def _get_message(self, text: JsonText) -> str:
+        # identical messages are only serialized once
+        key = freeze(text)
+        if key not in self.messages:
+            self.messages[key] = serialize(text)
+        return self.messages[key]
+
     def handle_message_node(self, node: MessageNode):
         message_type = node["type"]
-        message = node["msg"]
+        message = self._get_message(node["msg"])
         selector = node["selector"]
 
         if message_type == MessageNode.MessageType.CHAT:
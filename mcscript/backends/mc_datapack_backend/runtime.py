@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import Optional, TYPE_CHECKING
 
 from mcscript.data.selector import Selector
@@ -45,7 +44,7 @@ def make_on_load_function(main: FunctionNode, backend: McDatapackBackend, init_c
         commands.append(CommandNode(f"scoreboard objectives setdisplay sidebar {backend.ir_master.scoreboards[0]}"))
 
     message = format_text("["), format_color(format_text(backend.config.project_name), "gold"), format_text("] loaded!")
-    commands.append(MessageNode(MessageNode.MessageType.CHAT, json.dumps(message), selector=Selector("a", [])))
+    commands.append(MessageNode(MessageNode.MessageType.CHAT, list(message), selector=Selector("a", ())))
 
     commands.append(FunctionCallNode(main))
 
@@ -0,0 +1,169 @@
+"""
+Compiles many independent scripts with a pool of worker processes.
+
+Every worker imports mcscript, builds the grammars and creates the compiler once, when it is started.
+Jobs that run on the same worker also share the block registry and the function cache of the compiler.
+"""
+from __future__ import annotations
+
+import json
+import os
+import traceback
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Iterator, List, Optional
+
+from mcscript import get_compiler, get_grammar, get_json_markup_grammar
+from mcscript.compile import compileMcScript
+from mcscript.data.CompileReport import CompileReport
+from mcscript.data.Config import Config
+from mcscript.exceptions.McScriptException import McScriptException
+from mcscript.utils.cmdHelper import generate_datapack
+
+
+@dataclass(frozen=True)
+class CompileJob:
+    """ A script that should be compiled and the directory to which the datapack is written """
+    input: Path
+    output: Path
+    config: Optional[Path] = None
+    name: Optional[str] = None
+    release: bool = False
+    mc_version: Optional[str] = None
+
+
+@dataclass()
+class CompileResult:
+    job: CompileJob
+    # the error message, if the compilation failed
+    error: Optional[str] = None
+    compile_time: float = 0
+    write_time: float = 0
+    files_written: int = 0
+    # statistics about the compilation, if it succeeded
+    report: Optional[CompileReport] = None
+    # the process id of the worker that ran this job
+    worker: int = field(default_factory=os.getpid)
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    def to_json(self) -> dict:
+        return {
+            "input": str(self.job.input),
+            "output": str(self.job.output),
+            "success": self.success,
+            "error": self.error,
+            "compile_time": self.compile_time,
+            "write_time": self.write_time,
+            "files_written": self.files_written,
+            "report": self.report.to_json() if self.report is not None else None,
+            "worker": self.worker
+        }
+
+
+def load_manifest(path: Path) -> List[CompileJob]:
+    """
+    Reads the jobs of a manifest file.
+
+    The manifest is a json list of objects with the keys of `CompileJob`. `input` and `output` are required.
+    Relative paths are relative to the directory of the manifest.
+
+    Args:
+        path: the path to the manifest
+
+    Returns:
+        The jobs
+
+    Raises:
+        ValueError: if the manifest is invalid
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"The manifest {path} must contain a list of jobs")
+
+    base = path.parent
+    jobs = []
+    for index, entry in enumerate(data):
+        try:
+            jobs.append(CompileJob(
+                input=base.joinpath(entry["input"]),
+                output=base.joinpath(entry["output"]),
+                config=base.joinpath(entry["config"]) if entry.get("config") else None,
+                name=entry.get("name"),
+                release=bool(entry.get("release", False)),
+                mc_version=entry.get("mc_version")
+            ))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid job #{index} in manifest {path}: {e!r}") from None
+    return jobs
+
+
+def compile_many(jobs: Iterable[CompileJob], max_workers: Optional[int] = None) -> Iterator[CompileResult]:
+    """
+    Compiles every job and writes its datapack.
+
+    The results are yielded as soon as a job is finished, so they are not in the same order as `jobs`.
+    A failing job does not stop the other jobs.
+
+    Args:
+        jobs: the jobs
+        max_workers: the maximum number of worker processes. If 1, all jobs run in this process.
+
+    Returns:
+        An iterator over the results
+    """
+    if max_workers == 1:
+        _init_worker()
+        yield from map(run_job, jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_job(job: CompileJob) -> CompileResult:
+    """ Compiles a single job and writes its datapack """
+    result = CompileResult(job)
+    start_time = perf_counter()
+    try:
+        config = Config(str(job.config) if job.config is not None else None)
+        if job.name is not None:
+            config.project_name = job.name
+        if job.release:
+            config.is_release = True
+        if job.mc_version is not None:
+            config.minecraft_version = job.mc_version
+
+        with open(job.input, encoding="utf-8") as f:
+            config.input_string = f.read()
+        config.output_dir = str(job.output)
+
+        datapack, result.report = compileMcScript(config)
+        result.compile_time = perf_counter() - start_time
+
+        start_time = perf_counter()
+        job.output.mkdir(parents=True, exist_ok=True)
+        result.files_written = len(generate_datapack(config, datapack))
+        result.write_time = perf_counter() - start_time
+    except McScriptException as e:
+        result.error = str(e)
+    except Exception:
+        result.error = traceback.format_exc()
+
+    if not result.compile_time:
+        result.compile_time = perf_counter() - start_time
+    return result
+
+
+def _init_worker():
+    """ Does all the work that every compilation needs, before the first job """
+    get_grammar()
+    get_json_markup_grammar()
+    get_compiler()
@@ -1,30 +1,59 @@
+"""
+The command line interface.
+
+The compiler is only imported by the commands that need it, so that commands like --help start quickly.
+"""
+from __future__ import annotations
+
+import json
+import re
 import sys
+import traceback
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Optional
+from time import perf_counter, sleep
+from typing import Dict, Optional, Set, TYPE_CHECKING
 
 import click
 
-from mcscript.compile import compileMcScript
-from mcscript.data.Config import Config
-from mcscript.utils.cmdHelper import generate_datapack, MCWorld
+from mcscript import set_verbose
+
+if TYPE_CHECKING:
+    from mcscript.backends.mc_datapack_backend.Datapack import Datapack
+    from mcscript.data.Config import Config
+
+# written by --profile, can be opened in chrome://tracing
+PROFILE_FILE = "mcscript_profile.json"
+PROFILE_REPORT_ROWS = 40
+
+# module names are used in function names, scores and storage paths
+MODULE_NAME = re.compile(r"[a-z0-9_]+(/[a-z0-9_]+)*")
 
 
 @click.group()
-def main():
+@click.option("--verbose", "-v", is_flag=True, help="Write debug messages to the log file")
+def main(verbose: bool):
     """
     The McScript compiler.
 
     To quickly build a project run BUILD in "wold/datapacks/src".
     McScript will compile the src directory and write the output in the datapacks directory.
+    WATCH does the same, but rebuilds the project whenever a file changes.
 
     Compile a single .mcscript file with COMPILE <file.mcscript> <OutDir> <Options>
+    Compile many .mcscript files with COMPILE-MANY <manifest.json>
     """
-    pass
+    set_verbose(verbose)
 
 
 @main.command()
 @click.option("--release", "-r", is_flag=True, help="Whether to compile in release mode")
-def build(release: bool):
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="The number of processes that compile the files of the project. Defaults to the number of cpus")
+@click.option("--profile", is_flag=True, help=f"Print where the compiler spends its time and write {PROFILE_FILE}")
+@click.option("--dump", type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help="Write the intermediate results of every compile stage to this directory")
+def build(release: bool, jobs: Optional[int], profile: bool, dump: Optional[str]):
     """
     Builds the mcscript files of this project and writes the datapack
 
@@ -33,8 +62,63 @@ def build(release: bool):
 
     The output directory will be:
         world/datapacks/your_datapack
+
+    The project is compiled from main.mcscript. If the src directory contains more .mcscript files,
+    each file is compiled as a module in parallel. The main function of every module runs when the datapack loads,
+    starting with main.mcscript.
     """
+    from mcscript.utils.cmdHelper import generate_datapack
+
     cwd = Path.cwd().absolute()
+    config = _load_project(cwd, release)
+
+    with _profiled(profile), _dumped(dump):
+        # worker processes can not be profiled and do not write dumps
+        datapack = _compile_project(config, _find_modules(cwd), 1 if profile or dump else jobs)
+
+    generate_datapack(config, datapack)
+
+    click.echo(f"Successfully built project {config.project_name}")
+
+
+@main.command()
+@click.option("--release", "-r", is_flag=True, help="Whether to compile in release mode")
+@click.option("--interval", "-i", type=float, default=0.5, show_default=True,
+              help="Seconds between two checks for changed files")
+def watch(release: bool, interval: float):
+    """
+    Builds the project like BUILD and rebuilds it whenever a source file changes
+
+    The compiler stays loaded between two builds and only files whose content changed are written again.
+    Stop watching with Ctrl+C.
+    """
+    from mcscript.utils.cmdHelper import SourceWatcher
+
+    cwd = Path.cwd().absolute()
+    watcher = SourceWatcher(cwd, ("*.mcscript", "config.config"))
+
+    config = _load_project(cwd, release)
+    output_files = _watch_build(config, cwd, set())
+
+    click.echo(f"Watching {click.format_filename(str(cwd))} for changes...")
+    try:
+        while True:
+            sleep(interval)
+            changed = watcher.changed()
+            if not changed:
+                continue
+
+            if any(path.name == "config.config" for path in changed):
+                config = _load_project(cwd, release)
+            output_files = _watch_build(config, cwd, output_files)
+    except KeyboardInterrupt:
+        pass
+
+
+def _load_project(cwd: Path, release: bool) -> Config:
+    """ Creates the config for the project in `cwd` """
+    from mcscript.data.Config import Config
+    from mcscript.utils.cmdHelper import MCWorld
 
     config_path = cwd.joinpath("config.config")
     if config_path.exists():
@@ -62,15 +146,72 @@ def build(release: bool):
     if release:
         config.is_release = True
 
-    with open(src_path) as f:
-        input_file = f.read()
+    return config
 
-    config.input_string = input_file
-    datapack = compileMcScript(config)
 
-    generate_datapack(config, datapack)
+def _find_modules(cwd: Path) -> Dict[str, Path]:
+    """ Returns the module name and the path of every src file of the project in `cwd`, starting with main """
+    modules = {"main": cwd.joinpath("main.mcscript")}
+    for path in sorted(cwd.rglob("*.mcscript")):
+        module = path.relative_to(cwd).with_suffix("").as_posix()
+        if module == "main":
+            continue
+        if not MODULE_NAME.fullmatch(module):
+            click.echo(f"Invalid file name {click.format_filename(str(path))}. "
+                       f"Only lowercase letters, digits and underscores are allowed", err=True)
+            sys.exit(1)
+        modules[module] = path
+    return modules
 
-    click.echo(f"Successfully built project {config.project_name}")
+
+def _compile_project(config: Config, modules: Dict[str, Path], jobs: Optional[int]) -> Datapack:
+    """ Compiles a project that consists of one or more modules """
+    from mcscript.compile import compileMcScript, compileMcScriptProject
+
+    if len(modules) == 1:
+        with open(modules["main"], encoding="utf-8") as f:
+            config.input_string = f.read()
+        return compileMcScript(config)[0]
+
+    code = {}
+    for module, path in modules.items():
+        with open(path, encoding="utf-8") as f:
+            code[module] = f.read()
+    return compileMcScriptProject(config, code, jobs)
+
+
+def _watch_build(config: Config, cwd: Path, output_files: Set[Path]) -> Set[Path]:
+    """
+    Builds the project once and writes only the files that changed.
+    Files that were written by the previous build but are not part of this build anymore get deleted.
+
+    Returns:
+        The paths of all files of the new datapack or `output_files` if the build failed
+    """
+    from mcscript.exceptions.McScriptException import McScriptException
+    from mcscript.utils.cmdHelper import generate_datapack
+
+    start_time = perf_counter()
+    try:
+        # compile in this process, so the compiler keeps its caches
+        datapack = _compile_project(config, _find_modules(cwd), 1)
+    except McScriptException as e:
+        click.echo(str(e), err=True)
+        return output_files
+    except Exception:
+        click.echo(traceback.format_exc(), err=True)
+        return output_files
+
+    written = generate_datapack(config, datapack, only_changed=True)
+
+    new_output_files = set(datapack.paths(Path(config.output_dir)))
+    for path in output_files - new_output_files:
+        with suppress(FileNotFoundError):
+            path.unlink()
+
+    click.echo(f"Built project {config.project_name} in {perf_counter() - start_time:.2f} seconds "
+               f"({len(written)} files written)")
+    return new_output_files
 
 
 # noinspection PyShadowingBuiltins
@@ -83,11 +224,23 @@ def build(release: bool):
               help="The target minecraft version. If not specified latest full-release")
 @click.option("--config", help="The config file",
               type=click.Path(exists=True, dir_okay=False, writable=True, resolve_path=True))
+@click.option("--profile", is_flag=True, help=f"Print where the compiler spends its time and write {PROFILE_FILE}")
+@click.option("--report", type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+              help="Write statistics about the compilation as json to this file")
+@click.option("--dump", type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help="Write the intermediate results of every compile stage to this directory")
+@click.option("-O", "optimization_level", type=click.IntRange(0, 3), default=None,
+              help="The optimization level from -O0 (fast debug builds) to -O3 (optimize until nothing changes). "
+                   "Defaults to the config, which defaults to -O2")
 def compile(input: str, output: str, name: str, release: bool, mc_version: Optional[str],
-            config: Optional[str]):
+            config: Optional[str], profile: bool, report: Optional[str], dump: Optional[str],
+            optimization_level: Optional[int]):
     """
     Compiles the INPUT and writes the result to OUTPUT directory
     """
+    from mcscript.compile import compileMcScript
+    from mcscript.data.Config import Config
+    from mcscript.utils.cmdHelper import generate_datapack
 
     # def on_compile_progress(step: str, progress: float, _prev_input: Any):
     #     pass
@@ -103,19 +256,100 @@ def compile(input: str, output: str, name: str, release: bool, mc_version: Optio
     if mc_version is not None:
         config.minecraft_version = mc_version
 
+    if optimization_level is not None:
+        config.optimization_level = optimization_level
+
     with open(input, encoding="utf-8") as f:
         input_file = f.read()
 
     config.input_string = input_file
     config.output_dir = output
 
-    datapack = compileMcScript(config)
+    with _profiled(profile), _dumped(dump):
+        datapack, compile_report = compileMcScript(config)
 
     generate_datapack(config, datapack)
+    if report is not None:
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump(compile_report.to_json(), f, indent=2)
 
     click.echo(f"Compiled successfully to {click.format_filename(config.output_dir)}")
 
 
+@main.command("compile-many")
+@click.argument("manifest", type=click.Path(exists=True, file_okay=True, dir_okay=False, resolve_path=True))
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="The number of worker processes. Defaults to the number of cpus")
+@click.option("--json", "as_json", is_flag=True, help="Print every result as a line of json")
+def compile_many(manifest: str, jobs: Optional[int], as_json: bool):
+    """
+    Compiles every job of the MANIFEST
+
+    The manifest is a json list of jobs like {"input": "a.mcscript", "output": "out/a", "config": "a.config"}.
+    Optional keys are "config", "name", "release" and "mc_version".
+    A result is printed as soon as its job is finished.
+    """
+    from mcscript.batch import compile_many as compile_jobs, load_manifest
+
+    try:
+        manifest_jobs = load_manifest(Path(manifest))
+    except ValueError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+    start_time = perf_counter()
+    failed = 0
+    for result in compile_jobs(manifest_jobs, jobs):
+        failed += not result.success
+        if as_json:
+            click.echo(json.dumps(result.to_json()))
+        elif result.success:
+            click.echo(f"Compiled {click.format_filename(str(result.job.input))} in {result.compile_time:.2f} seconds "
+                       f"({result.files_written} files written in {result.write_time:.2f} seconds)")
+        else:
+            click.echo(f"Failed to compile {click.format_filename(str(result.job.input))}:\n{result.error}", err=True)
+
+    if not as_json:
+        click.echo(f"Compiled {len(manifest_jobs) - failed} of {len(manifest_jobs)} jobs "
+                   f"in {perf_counter() - start_time:.2f} seconds")
+    if failed:
+        sys.exit(1)
+
+
+@contextmanager
+def _profiled(enabled: bool):
+    """ Profiles the compiler in this context if `enabled`. Prints the report and writes the chrome trace. """
+    if not enabled:
+        yield
+        return
+
+    from mcscript.utils.profiler import Profiler, profiling
+
+    profiler = Profiler()
+    with profiling(profiler):
+        yield
+
+    click.echo(profiler.report(PROFILE_REPORT_ROWS))
+    profiler.write_chrome_trace(PROFILE_FILE)
+    click.echo(f"Wrote chrome trace to {click.format_filename(PROFILE_FILE)}")
+
+
+@contextmanager
+def _dumped(directory: Optional[str]):
+    """ Writes the dumps of all compile stages in this context to `directory`, if it is not None """
+    if directory is None:
+        yield
+        return
+
+    from mcscript.utils.dumps import Dumper, dumping
+
+    dumper = Dumper(Path(directory))
+    with dumping(dumper):
+        yield
+
+    click.echo(f"Wrote {len(dumper.paths)} dumps to {click.format_filename(directory)}")
+
+
 @main.command()
 def doc():
     click.echo("Doc")
@@ -1,6 +1,7 @@
-from logging import DEBUG
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from time import perf_counter
-from typing import Callable
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import lark
 from lark import Tree
@@ -9,15 +10,20 @@ from mcscript import get_compiler, get_grammar, Logger
 from mcscript.analyzer.Analyzer import Analyzer
 from mcscript.backends import get_default_backend
 from mcscript.backends.mc_datapack_backend.Datapack import Datapack
+from mcscript.data.CompileReport import CompileReport
 from mcscript.data.Config import Config
-from mcscript.exceptions.exceptions import McScriptError
+from mcscript.exceptions.McScriptException import McScriptException
+from mcscript.exceptions.exceptions import McScriptError, McScriptModuleError
+from mcscript.ir.IrMaster import IrMaster
+from mcscript.ir.linker import link
 from mcscript.exceptions.parseExceptions import McScriptParseException
-from mcscript.utils.utils import debug_log_text
+from mcscript.utils.dumps import dump, write_numbered_lines
+from mcscript.utils.profiler import active_profiler
 
 NUM_COMPILE_STEPS = 4
 
 
-def compileMcScript(config: Config, callback: Callable = None) -> Datapack:
+def compileMcScript(config: Config, callback: Callable = None) -> Tuple[Datapack, CompileReport]:
     """
     compiles a mcscript string and returns the generated datapack.
 
@@ -25,20 +31,85 @@ def compileMcScript(config: Config, callback: Callable = None) -> Datapack:
         callback: a callback function that accepts the current state, the progress and the temporary object
         config: the config. Should contain the input file and the target path
 
+    Returns:
+        A datapack and a report with statistics about the compilation
+    """
+    report = CompileReport()
+    steps = _compile_steps(config, report) + (
+        (lambda ir_master: _generate(config, ir_master, report), "Running ir backend"),
+    )
+
+    # noinspection PyTypeChecker
+    return _run_steps(steps, config.input_string, callback, report), report
+
+
+def compileMcScriptProject(config: Config, modules: Dict[str, str], max_workers: Optional[int] = None) -> Datapack:
+    """
+    compiles the files of a project and returns the generated datapack.
+
+    Each file is a module which is parsed, analyzed and compiled on its own in a pool of worker processes.
+    The ir of all modules is then linked and a single datapack is generated.
+
+    Args:
+        config: the config of the project
+        modules: the name of each module and its code, the main module should come first
+        max_workers: the maximum number of worker processes. If 1, all modules are compiled in this process.
+
     Returns:
         A datapack
     """
-    steps = (
+    start_time = perf_counter()
+
+    if max_workers == 1:
+        ir_masters = [_compile_module_ir(config.for_module(module), code) for module, code in modules.items()]
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            ir_masters = list(executor.map(_compile_module, repeat(config.to_string()), modules, modules.values()))
+    Logger.info(f"Compiling {len(modules)} modules finished in {perf_counter() - start_time:.4f} seconds")
+
+    ir_master = link(config, list(zip(modules, ir_masters)))
+    datapack = get_default_backend()(config, ir_master).generate()
+
+    Logger.info(f"Run all steps in {perf_counter() - start_time:.4f} seconds")
+    return datapack
+
+
+def _compile_module(config_text: str, module: str, code: str) -> IrMaster:
+    """ Compiles a single module of a project. Runs in a worker process. """
+    try:
+        return _compile_module_ir(Config.from_string(config_text).for_module(module), code)
+    except McScriptException as e:
+        # the exception has to be sent back to the main process and compiler exceptions can not be pickled
+        raise McScriptModuleError(module, str(e)) from None
+
+
+def _compile_module_ir(config: Config, code: str) -> IrMaster:
+    config.input_string = code
+    # noinspection PyTypeChecker
+    return _run_steps(_compile_steps(config), code, None)
+
+
+def _compile_steps(config: Config, report: Optional[CompileReport] = None) -> Tuple[Tuple[Callable, str], ...]:
+    """ Returns the steps that create the optimized ir for the code of `config` """
+    return (
         (_parseCode, "Parsing"),
         (lambda tree: Analyzer().analyze(tree), "Analyzing context"),
-        (lambda tree: get_compiler().compile(tree[0], tree[1], text, config), "Compiling"),
-        (lambda ir_master: get_default_backend()(config, ir_master).generate(), "Running ir backend")
+        (lambda tree: get_compiler().compile(tree[0], tree[1], config.input_string, config, report), "Compiling"),
     )
 
-    text = config.input_string
 
-    if Logger.isEnabledFor(DEBUG):
-        debug_log_text(text, "[Compile] parsing the following code: ")
+def _generate(config: Config, ir_master: IrMaster, report: CompileReport) -> Datapack:
+    backend = get_default_backend()(config, ir_master)
+    datapack = backend.generate()
+    report.constants = sorted(backend.constant_scores)
+    report.messages = len(backend.messages)
+    report.output_bytes = datapack.byte_size()
+    return datapack
+
+
+def _run_steps(steps: Tuple[Tuple[Callable, str], ...], text: str, callback: Optional[Callable],
+               report: Optional[CompileReport] = None) -> Any:
+    dump("source", lambda f: write_numbered_lines(text, f))
 
     global_start_time = perf_counter()
 
@@ -47,22 +118,31 @@ def compileMcScript(config: Config, callback: Callable = None) -> Datapack:
         if callback is not None:
             callback(step[1], index / len(steps), arg)
         start_time = perf_counter()
+        profiler = active_profiler("stage")
+        if profiler is not None:
+            profiler.start("stage", step[1])
         try:
             arg = step[0](arg)
         except Exception as e:
             if not isinstance(e, McScriptError):
                 Logger.critical(f"Internal compiler error occurred: {repr(e)}")
             raise e
-        Logger.info(f"{step[1]} finished in {perf_counter() - start_time:.4f} seconds")
+        finally:
+            if profiler is not None:
+                profiler.stop()
+        step_time = perf_counter() - start_time
+        if report is not None:
+            report.stage_times[step[1]] = step_time
+        Logger.info(f"{step[1]} finished in {step_time:.4f} seconds")
         if isinstance(arg, Tree):
-            _debug_log_tree(arg)
+            tree = arg
+            dump("parse tree", lambda f: f.write(tree.pretty()))
 
     if callback is not None:
         callback("Done", 1, arg)
 
     Logger.info(f"Run all steps in {perf_counter() - global_start_time:.4f} seconds")
 
-    # noinspection PyTypeChecker
     return arg
 
 
@@ -74,7 +154,3 @@ def _parseCode(code: str) -> Tree:
         # noinspection PyUnresolvedReferences
         raise McScriptParseException(e.line, e.column, code, e.expected, e.token) from None
 
-
-def _debug_log_tree(tree: Tree):
-    if Logger.isEnabledFor(DEBUG):
-        debug_log_text(tree.pretty(), "[Compile] Intermediate Tree:")
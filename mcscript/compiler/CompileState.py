@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Callable, Dict, Optional, Tuple, Union, ContextManager, Set, List
+from functools import cached_property
+from typing import Callable, Dict, Optional, Tuple, Union, ContextManager, Set, List, TYPE_CHECKING
 
 from lark import Tree
 
@@ -24,6 +25,10 @@ from mcscript.utils.Scoreboard import Scoreboard
 from mcscript.utils.addressCounter import ScoreboardAddressCounter, AddressCounter, StorageAddressCounter
 from mcscript.utils.resources import DataPath, ScoreboardValue, Identifier, ResourceSpecifier
 
+if TYPE_CHECKING:
+    from mcscript.compiler.FunctionCache import Fingerprinter, FunctionCache
+    from mcscript.compiler.RuntimeFunctions import RuntimeFunctions
+
 
 class CompileState:
     """
@@ -31,7 +36,8 @@ class CompileState:
     """
 
     def __init__(self, code: str, contexts: Dict[Tuple[int, int], NamespaceContext], compile_function: Callable,
-                 config: Config):
+                 config: Config, function_cache: Optional[FunctionCache] = None,
+                 runtime_functions: Optional[RuntimeFunctions] = None):
         self._compile_function = compile_function
 
         self.code = code.split("\n")
@@ -47,6 +53,8 @@ class CompileState:
 
         self.data_path_main = DataPath(self.config.storage_id, self.config.get_storage("stack").split("."))
         self.data_path_temp = DataPath(self.config.storage_id, self.config.get_storage("temp").split("."))
+        # formats the names of scoreboard variables
+        self.score_format = self.config.get_score("format_string")
 
         # ToDo: maybe move to ir gen code?
         self.node_block_counter = AddressCounter("block_{}_")
@@ -56,14 +64,22 @@ class CompileState:
         self.contexts = contexts
         self.stack: ContextStack = ContextStack()
         # self.stack.append(Namespace(0, namespaceType=NamespaceType.GLOBAL))
-        self.stack.append(Context(0, None, ContextType.GLOBAL, NamespaceContext([], [], (0, 0)), self.scoreboard_main,
-                                  self.data_path_main))
+        self.stack.append(Context(0, None, ContextType.GLOBAL, NamespaceContext({}, (0, 0)), self.scoreboard_main,
+                                  self.data_path_main, score_format=self.score_format))
         # keeps track of all functions that are right now called
         self.function_call_stack: List[FunctionSignature] = []
 
         # the ir master class
         self.ir = IrMaster()
 
+        # caches generated functions. Optional, since it is owned by the compiler.
+        self.function_cache = function_cache
+
+        # functions that are compiled once and called at runtime. None if every call is specialized.
+        self.runtime_functions = runtime_functions
+        # the number of generated functions that can be called again, see `FunctionResource.specializations`
+        self.reusable_functions = 0
+
         self.ir.scoreboards = [
             self.scoreboard_main
         ]
@@ -71,6 +87,12 @@ class CompileState:
     def compile_ast(self, tree: Tree):
         self._compile_function(tree)
 
+    @cached_property
+    def fingerprinter(self) -> Fingerprinter:
+        """ Fingerprints the calls of functions in this compilation, see `Fingerprinter` """
+        from mcscript.compiler.FunctionCache import Fingerprinter
+        return Fingerprinter()
+
     @property
     def currentTree(self) -> Optional[Tree]:
         return self._currentTree
@@ -174,7 +196,7 @@ class CompileState:
         """
 
         context = Context(self.stack.index(), (line, column), contextType, self.contexts[line, column],
-                          self.scoreboard_main, self.data_path_main, self.stack.tail())
+                          self.scoreboard_main, self.data_path_main, self.stack.tail(), self.score_format)
         context.update_static_resources(self)
         self.stack.append(context)
         return context
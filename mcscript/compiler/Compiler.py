@@ -1,14 +1,18 @@
-from typing import Dict, Tuple
+from time import perf_counter
+from typing import Dict, Optional, Tuple
 
 from lark import Tree, Token
 from lark.visitors import Interpreter
 
 from mcscript.analyzer.Analyzer import NamespaceContext
 from mcscript.compiler.CompileState import CompileState
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.compiler.RuntimeFunctions import RuntimeFunctions
 from mcscript.compiler.ContextType import ContextType
-from mcscript.compiler.common import (conditional_loop, get_property, readContextManipulator, set_property,
-                                      declare_variable, update_variable)
+from mcscript.compiler.common import (conditional_loop, counter_loop, get_property, readContextManipulator,
+                                      set_property, declare_variable, update_variable)
 from mcscript.compiler.tokenConverter import convert_token_to_resource, convert_token_to_type
+from mcscript.data.CompileReport import CompileReport
 from mcscript.data.Config import Config
 from mcscript.exceptions.exceptions import (McScriptUnexpectedTypeError, McScriptEnumValueAlreadyDefinedError,
                                             McScriptUnsupportedOperationError, McScriptDeclarationError,
@@ -22,12 +26,16 @@ from mcscript.lang.atomic_types import Null
 from mcscript.lang.resource.BooleanResource import BooleanResource
 from mcscript.lang.resource.EnumResource import EnumResource
 from mcscript.lang.resource.FunctionResource import FunctionResource
+from mcscript.lang.resource.RangeResource import RangeResource
 from mcscript.lang.resource.StructResource import StructResource
 from mcscript.lang.resource.TupleResource import TupleResource
 from mcscript.lang.resource.TypeResource import TypeResource
 from mcscript.lang.resource.base.ResourceBase import Resource, ValueResource
 from mcscript.lang.resource.base.functionSignature import FunctionSignature, FunctionParameter
 from mcscript.lang.utility import is_static
+from mcscript.utils.astBuilder import STATEMENT_RULES
+from mcscript.utils.dumps import dump
+from mcscript.utils.profiler import active_profiler, profile
 
 
 class Compiler(Interpreter):
@@ -35,6 +43,9 @@ class Compiler(Interpreter):
         # noinspection PyTypeChecker
         self.compileState: CompileState = None
 
+        # lowered functions, reused across compilations
+        self.function_cache = FunctionCache()
+
     def visit(self, tree):
         previous = self.compileState.currentTree
         try:
@@ -43,13 +54,24 @@ class Compiler(Interpreter):
             raise ValueError(
                 "Cannot visit without a compile state. Use ´compile´ instead.")
 
-        result = super().visit(tree)
+        # the handlers are plain methods, so the lookup of visit wrappers in `Interpreter.visit` is skipped
+        profiler = active_profiler("rule")
+        if profiler is None:
+            result = getattr(self, tree.data)(tree)
+        else:
+            profiler.start("rule", tree.data)
+            try:
+                result = getattr(self, tree.data)(tree)
+            finally:
+                profiler.stop()
         self.compileState.currentTree = previous
         return result
 
     def compile(self, tree: Tree, contexts: Dict[Tuple[int, int], NamespaceContext], code: str,
-                config: Config) -> IrMaster:
-        self.compileState = CompileState(code, contexts, self.visit, config)
+                config: Config, report: Optional[CompileReport] = None) -> IrMaster:
+        self.function_cache.begin()
+        self.compileState = CompileState(code, contexts, self.visit, config, self.function_cache,
+                                         RuntimeFunctions() if config.runtime_functions else None)
 
         # load the stdlib - for now just builtins
         builtins = std.include()
@@ -60,7 +82,15 @@ class Compiler(Interpreter):
             self.compileState.push_context(ContextType.GLOBAL, 0, 0)
             self.visit(tree)
 
-        self.compileState.ir.optimize()
+        dump("ir", self.compileState.ir.write_functions)
+
+        start_time = perf_counter()
+        with profile("stage", "Optimizing"):
+            self.compileState.ir.optimize(self.compileState.resource_specifier_main("main"), report,
+                                          config.optimization_level, config.optimization_iterations,
+                                          config.inline_costs)
+        if report is not None:
+            report.stage_times["Optimizing"] = perf_counter() - start_time
 
         # for function in self.compileState.ir.function_nodes:
         #     print(function)
@@ -520,6 +550,12 @@ class Compiler(Interpreter):
         _, var_name, _, expression, block = tree.children
 
         resource = self.compileState.toResource(expression)
+        if isinstance(resource, RangeResource):
+            size = resource.size()
+            # small ranges are unrolled, so the body can use the static value of the loop variable
+            if size is None or size > self.compileState.config.unroll_limit:
+                return counter_loop(self.compileState, block, var_name, resource)
+
         try:
             iterator = resource.get_iterator(self.compileState)
         except TypeError:
@@ -621,14 +657,12 @@ class Compiler(Interpreter):
             [FunctionCallNode(block_function)]
         ))
 
-    def expression(self, tree):
-        return self.visit(tree.children[0])
-
     def statement(self, tree):
         # self.compileState.writeline(f"# {self.compileState.getDebugLines(tree.meta.line, tree.meta.end_line)}")
         res = self.visit_children(tree)
         # # now clear up the expression counter
         # self.compileState.expressionStack.reset()
-        if len(tree.children) == 1 and tree.children[0].data == "expression":
+        # the expression of an expression statement was inlined by the parser, see `AstBuilder`
+        if len(tree.children) == 1 and tree.children[0].data not in STATEMENT_RULES:
             self.compileState.currentContext().return_resource = res[0]
         return res
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 from dataclasses import dataclass, field
+from logging import DEBUG
 from typing import Dict, Optional, Tuple, TYPE_CHECKING, Any, List
 
 from mcscript import Logger
@@ -51,7 +52,7 @@ class Context:
     Manages a single context. A context is unique to each block that is entered, which includes ia. functions.
 
     A `Context` keeps track of:
-        * The previous `Context`
+        * The previous `Context` and the depth of this `Context` on the stack
         * The definition of this context as (line, column)
         * The numerical id of this `Context` (deprecated, unused)
         * The variables unique to this context
@@ -60,6 +61,10 @@ class Context:
         * A template string for context specific variable names
         * A template string for nbt variable names
         * An optional resource which is the resource that is returned from this stack.
+
+    While a `Context` is on the `ContextStack`, its variables are also registered in the declarations, a lookup
+    table name -> contexts that declare this name, which is shared by all contexts on the stack.
+    This makes a lookup independent of the number of contexts on the stack.
     """
 
     @dataclass()
@@ -79,15 +84,22 @@ class Context:
             main_scoreboard: Scoreboard,
             base_path: DataPath,
             predecessor: Context = None,
+            score_format: str = ".exp{block}_{index}"
     ):
         self.index = index
         self.definition = definition
         self.context_type = ctx_type
         self.predecessor = predecessor
+        self.depth = 0 if predecessor is None else predecessor.depth + 1
+
+        # name -> the contexts on the stack that declare this name, ordered by their depth
+        self.declarations: Dict[str, List[Context]] = {} if predecessor is None else predecessor.declarations
+        # whether this context is on the stack, see `ContextStack`
+        self.on_stack = False
 
-        # make a simple lookup table name -> ctx
-        self.variable_context: Dict[str, VariableContext] = {i.identifier: i for i in namespace_context.variables}
-        self.inner_contexts = namespace_context.inner_contexts
+        # a lookup table name -> ctx
+        self.variable_context: Dict[str, VariableContext] = namespace_context.variables
+        self.namespace_context = namespace_context
 
         # the namespace of variables unique to this context
         self.namespace: Dict[str, Context.Variable] = {}
@@ -95,7 +107,8 @@ class Context:
         self.user_data: UserData = UserData()
 
         # formats scoreboard variables to ".exp<x>_<varId>"
-        self.scoreboard_formatter = ScoreboardAddressCounter(main_scoreboard, f".exp{self.index}_{{}}")
+        self.scoreboard_formatter = ScoreboardAddressCounter(main_scoreboard,
+                                                             score_format.format(block=self.index, index="{}"))
         # for nbt names
         self.nbt_format = StorageAddressCounter(base_path, f"{self.index}_{{}}" if self.index != 0 else "{}")
 
@@ -117,12 +130,48 @@ class Context:
         Returns:
             None
         """
+        if self.on_stack:
+            self.unregister()
         self.namespace.clear()
         self.return_resource = None
 
+    def register(self):
+        """
+        Adds the variables of this context to the declarations. Called when this context is pushed on the stack.
+
+        Returns:
+            None
+        """
+        self.on_stack = True
+        for name in self.namespace:
+            self._declare(name)
+
+    def unregister(self):
+        """
+        Removes the variables of this context from the declarations. Called when this context is popped.
+        This context must be the last context on the stack.
+
+        Returns:
+            None
+        """
+        self.on_stack = False
+        for name in self.namespace:
+            contexts = self.declarations[name]
+            contexts.pop()
+            if not contexts:
+                del self.declarations[name]
+
+    def _declare(self, name: str):
+        contexts = self.declarations.setdefault(name, [])
+        # variables are usually added to the last context, but enums are added to the global context lazily
+        position = len(contexts)
+        while position > 0 and contexts[position - 1].depth > self.depth:
+            position -= 1
+        contexts.insert(position, self)
+
     def find_var(self, name: str) -> Optional[Context.Variable]:
         """
-        Recursively looks for a variable with key `name`.
+        Looks for a variable with key `name` in this or any previous context.
 
         Args:
             name: The name of the variable
@@ -130,6 +179,14 @@ class Context:
         Returns:
             The variable or None if not found
         """
+        if self.on_stack:
+            # every previous context is on the stack as well and has a lower depth
+            for context in reversed(self.declarations.get(name, ())):
+                if context.depth <= self.depth:
+                    return context.namespace[name]
+            return None
+
+        # a context that is not on the stack anymore, ie. the context of a struct
         if name in self.namespace:
             return self.namespace[name]
 
@@ -190,11 +247,13 @@ class Context:
 
         # should an error be thrown when no history is found?
         variable_context = self.variable_context.get(name, None)
-        if variable_context is None:
+        if variable_context is None and Logger.isEnabledFor(DEBUG):
             Logger.debug(f"[Context] No context data available for variable '{name}' ({value})")
 
         value.is_variable = True
         self.namespace[name] = self.Variable(value, variable_context)
+        if self.on_stack:
+            self._declare(name)
         return value
 
     def set_var(self, name: str, value: Resource) -> Resource:
@@ -213,15 +272,12 @@ class Context:
         Raises:
             KeyError: If the variable does not exist
         """
-
-        if name in self.namespace:
-            value.is_variable = True
-            self.namespace[name].resource = value
-        elif self.predecessor is not None:
-            self.predecessor.set_var(name, value)
-        else:
+        variable = self.find_var(name)
+        if variable is None:
             raise KeyError(f"Variable '{name}' does not exist and thus cannot be changed!")
 
+        value.is_variable = True
+        variable.resource = value
         return value
 
     def as_dict(self) -> Dict[str, Context.Variable]:
@@ -258,8 +314,6 @@ class Context:
         if self.context_type.hasStaticContext:
             return
 
-        definitions = [self.definition] + [i.definition for i in self.inner_contexts]
-
         for name, variable in self.predecessor.namespace.items():
             resource, var_context = variable.resource, variable.context
             if var_context is None:
@@ -267,7 +321,8 @@ class Context:
                     raise ValueError(f"[INTERNAL COMPILER ERROR] The context of {name} does not exist.")
                 continue
             for write in var_context.writes:
-                if write.master_context in definitions:
+                # whether the variable is written in this context or in any context inside of it
+                if self.namespace_context.contains(compile_state.contexts[write.master_context]):
                     # the resource should be stored
                     self.predecessor.set_var(name, resource.store(compile_state))
                     break
@@ -281,15 +336,9 @@ class Context:
 
     def __contains__(self, item) -> bool:
         """
-        Tests recursively if the item is in this contexts namespace or below
+        Tests if the item is in this contexts namespace or below
         """
-        if item in self.namespace:
-            return True
-
-        if self.predecessor:
-            return item in self.predecessor
-
-        return False
+        return self.find_var(item) is not None
 
     def __str__(self):
         return f"Context(index={self.index},type={self.context_type},namespace={self.namespace})"
@@ -9,9 +9,19 @@ class ContextStack:
         self.data: List[Context] = []
 
     def append(self, context: Context):
+        context.register()
         self.stack.append(context)
         self.data.append(context)
 
+    def reserve(self, amount: int):
+        """
+        Reserves the next `amount` indices for contexts that were not created by this stack.
+
+        Args:
+            amount: the amount of indices
+        """
+        self.data.extend([None] * amount)
+
     def index(self) -> int:
         return len(self.data)
 
@@ -36,7 +46,7 @@ class ContextStack:
         return self.stack[-1]
 
     def pop(self):
-        self.stack.pop()
+        self.stack.pop().unregister()
 
     def remove(self, context: Context) -> bool:
         while self.data.pop() != context:
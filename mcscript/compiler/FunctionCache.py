@@ -0,0 +1,504 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Set, TYPE_CHECKING, Tuple
+
+from lark import Token
+
+from mcscript import Logger
+from mcscript.ir import IRNode, IrNodeMetadata
+from mcscript.ir.components import FunctionCallNode, FunctionNode
+from mcscript.lang.resource.EnumResource import EnumResource
+from mcscript.lang.resource.FunctionResource import FunctionResource, MethodResource
+from mcscript.lang.resource.MacroResource import MacroResource
+from mcscript.lang.resource.SelectorResource import SelectorResource
+from mcscript.lang.resource.StringResource import StringResource
+from mcscript.lang.resource.StructObjectResource import StructObjectResource
+from mcscript.lang.resource.StructResource import StructResource
+from mcscript.lang.resource.TupleResource import TupleResource
+from mcscript.lang.resource.TypeResource import TypeResource
+from mcscript.lang.resource.base.ResourceBase import Resource, ValueResource
+from mcscript.utils.resources import DataPath, Identifier, ResourceSpecifier, ScoreboardValue
+
+if TYPE_CHECKING:
+    from mcscript.compiler.CompileState import CompileState
+
+NAME_PATTERN = re.compile(r"[A-Za-z_]\w*")
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+class _Counters(NamedTuple):
+    """ The counters of the compile state that are used to generate unique names """
+    contexts: int
+    blocks: int
+    temps: int
+
+    @classmethod
+    def of(cls, compile_state: CompileState) -> _Counters:
+        return cls(compile_state.stack.index(), compile_state.node_block_counter.value,
+                   compile_state.temp_data_counter.value)
+
+
+class SideEffects(NamedTuple):
+    """ Everything outside of a generated function, which must not be changed while generating it """
+    active_nodes: Tuple[int, ...]
+    expression_counter: int
+    nbt_counter: int
+    variables: Tuple[Tuple[str, int], ...]
+    scoreboards: int
+    custom_types: int
+    reusable_functions: int
+
+    @classmethod
+    def of(cls, compile_state: CompileState) -> SideEffects:
+        context = compile_state.currentContext()
+        return cls(
+            tuple(len(i) for i in compile_state.ir.active_nodes),
+            context.scoreboard_formatter.value,
+            context.nbt_format.value,
+            tuple((name, id(variable.resource))
+                  for context in compile_state.stack.stack for name, variable in context.namespace.items()),
+            len(compile_state.ir.scoreboards),
+            len(compile_state.custom_types),
+            compile_state.reusable_functions
+        )
+
+
+@dataclass
+class FunctionCacheRecording:
+    """ The state of the compiler before a function was generated """
+    key: str
+    counters: _Counters
+    side_effects: SideEffects
+    function_index: int
+
+
+@dataclass
+class _CacheEntry:
+    functions: List[FunctionNode]
+    return_resource: Resource
+    counters: _Counters
+    size: _Counters
+
+
+class _Renamer:
+    """
+    Copies ir nodes and resources.
+    Names that were generated for the cached function are moved to the names that would be generated now.
+    """
+
+    BLOCK_NAME = re.compile(r"(.*)block_(\d+)_")
+
+    def __init__(self, compile_state: CompileState, origin: _Counters, size: _Counters, target: _Counters):
+        self.origin = origin
+        self.size = size
+        self.target = target
+        self.memo: Dict[int, IRNode] = {}
+
+        self.score_format = compile_state.score_format
+        score_pattern = re.escape(self.score_format) \
+            .replace(re.escape("{block}"), r"(?P<block>\d+)") \
+            .replace(re.escape("{index}"), r"(?P<index>\d+)")
+        self.score_name = re.compile(score_pattern)
+
+        self.temp_path = compile_state.data_path_temp.path
+        self.stack_path = compile_state.data_path_main.path
+
+    def shift(self, value: int, counter: int) -> int:
+        if self.origin[counter] <= value < self.origin[counter] + self.size[counter]:
+            return value - self.origin[counter] + self.target[counter]
+        return value
+
+    def node(self, node: IRNode) -> IRNode:
+        if id(node) in self.memo:
+            return self.memo[id(node)]
+
+        new_node = copy.copy(node)
+        self.memo[id(node)] = new_node
+        new_node.metadata = IrNodeMetadata()
+        new_node.discarded_inner_nodes = []
+        new_node.data = {key: self.value(value) for key, value in node.data.items()}
+        new_node.inner_nodes = [self.node(i) for i in node.inner_nodes]
+        return new_node
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, IRNode):
+            return self.node(value)
+        if isinstance(value, list):
+            return [self.value(i) for i in value]
+        if isinstance(value, dict):
+            # the components of a message
+            return {key: self.value(i) for key, i in value.items()}
+        if isinstance(value, ScoreboardValue):
+            return self.scoreboard_value(value)
+        if isinstance(value, DataPath):
+            return self.data_path(value)
+        if isinstance(value, ResourceSpecifier):
+            match = self.BLOCK_NAME.fullmatch(value.path)
+            if match is not None:
+                return ResourceSpecifier(value.base, f"{match.group(1)}block_{self.shift(int(match.group(2)), 1)}_")
+            return value
+        return value
+
+    def scoreboard_value(self, value: ScoreboardValue) -> ScoreboardValue:
+        match = self.score_name.fullmatch(value.value)
+        if match is None:
+            return value
+        return ScoreboardValue(Identifier(self.score(match)), value.scoreboard)
+
+    def score(self, match: re.Match) -> str:
+        return self.score_format.format(block=self.shift(int(match["block"]), 0), index=match["index"])
+
+    def data_path(self, value: DataPath) -> DataPath:
+        path = value.path
+        if path[:len(self.temp_path)] == self.temp_path and len(path) > len(self.temp_path):
+            element = path[len(self.temp_path)]
+            if element.isdigit():
+                element = str(self.shift(int(element), 2))
+                return DataPath(value.storage, self.temp_path + [element] + path[len(self.temp_path) + 1:])
+        if path[:len(self.stack_path)] == self.stack_path and len(path) > len(self.stack_path):
+            index, separator, name = path[len(self.stack_path)].partition("_")
+            if separator and index.isdigit():
+                element = f"{self.shift(int(index), 0)}_{name}"
+                return DataPath(value.storage, self.stack_path + [element] + path[len(self.stack_path) + 1:])
+        return value
+
+    def resource(self, resource: Resource) -> Resource:
+        if isinstance(resource, ValueResource):
+            new_resource = copy.copy(resource)
+            if resource.scoreboard_value is not None:
+                new_resource.scoreboard_value = self.scoreboard_value(resource.scoreboard_value)
+            return new_resource
+        if isinstance(resource, TupleResource):
+            new_resource = TupleResource(*(self.resource(i) for i in resource.resources))
+            new_resource.is_variable = resource.is_variable
+            return new_resource
+        if isinstance(resource, (StringResource, SelectorResource)):
+            return resource
+        raise _Uncacheable()
+
+
+class Fingerprinter:
+    """
+    Fingerprints resources and the names that a function can access, see `FunctionCache` and `RuntimeFunctions`.
+    A fingerprint contains everything about a resource that can influence the code that is generated for it.
+    """
+
+    def __init__(self):
+        # source hashes of the functions of the current compilation, keyed by the id of their code tree
+        self._source_hashes: Dict[int, str] = {}
+        self._fingerprinting: Set[int] = set()
+
+    def clear(self):
+        """ Must be called before a new compilation starts """
+        self._source_hashes.clear()
+
+    def call_key(self, compile_state: CompileState, function: FunctionResource, parameters: List[Resource],
+                 specialized: bool) -> Optional[Tuple]:
+        """
+        Fingerprints a call of a function in the current context.
+
+        Args:
+            compile_state: the compile state
+            function: the function
+            parameters: the parameters of the call
+            specialized: whether the function is generated for the values of the parameters.
+                Otherwise only their types are used.
+
+        Returns:
+            The fingerprints of the parameters and of every name that the function can access, except for its
+            parameters, or None if a resource can not be fingerprinted
+        """
+        context = compile_state.currentContext()
+        parameter_names = {i.name for i in function.function_signature.parameters}
+        try:
+            names = self.referenced_names(compile_state, function, parameters if specialized else [])
+            return (
+                tuple(self.fingerprint(compile_state, i) if specialized else type(i).__name__ for i in parameters),
+                tuple(
+                    (name, None if (variable := context.find_var(name)) is None
+                     else self.fingerprint(compile_state, variable.resource))
+                    for name in names if name not in parameter_names
+                )
+            )
+        except _Uncacheable:
+            return None
+
+    @staticmethod
+    def side_effects(compile_state: CompileState) -> SideEffects:
+        """ Fingerprints everything outside of a generated function, see `SideEffects` """
+        return SideEffects.of(compile_state)
+
+    def referenced_names(self, compile_state: CompileState, function: FunctionResource,
+                          parameters: List[Resource]) -> List[str]:
+        """ Returns every name that could be accessed by this function or by any function that it can call. """
+        context = compile_state.currentContext()
+        names: Set[str] = set()
+        pending: List[str] = []
+        visited: Set[int] = set()
+
+        def visit(resource: Resource):
+            if id(resource) in visited:
+                return
+            visited.add(id(resource))
+
+            new_names = set()
+            if isinstance(resource, FunctionResource):
+                new_names = function_names(resource)
+            elif isinstance(resource, MethodResource):
+                visit(resource.function)
+                visit(resource.self_object)
+            elif isinstance(resource, StructResource):
+                for variable in resource.context.namespace.values():
+                    visit(variable.resource)
+            elif isinstance(resource, StructObjectResource):
+                visit(resource.struct)
+                for member in resource.public_namespace.values():
+                    visit(member)
+            elif isinstance(resource, TupleResource):
+                for element in resource.resources:
+                    visit(element)
+
+            for name in new_names - names:
+                names.add(name)
+                pending.append(name)
+
+        def function_names(resource: FunctionResource) -> Set[str]:
+            return {
+                name for token in resource.code.scan_values(lambda v: isinstance(v, Token))
+                for name in NAME_PATTERN.findall(token)
+            }
+
+        visit(function)
+        for parameter in parameters:
+            visit(parameter)
+        while pending:
+            variable = context.find_var(pending.pop())
+            if variable is not None:
+                visit(variable.resource)
+
+        return sorted(names)
+
+    def source_hash(self, compile_state: CompileState, function: FunctionResource) -> str:
+        code = function.code
+        if id(code) not in self._source_hashes:
+            lines = compile_state.code[code.line - 1:code.end_line]
+            lines[-1] = lines[-1][:code.end_column - 1]
+            lines[0] = lines[0][code.column - 1:]
+            self._source_hashes[id(code)] = hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+        return self._source_hashes[id(code)]
+
+    def fingerprint(self, compile_state: CompileState, resource: Resource) -> Tuple:
+        """ A representation of everything about a resource that can influence the generated code. """
+        # structs can contain themselves
+        if id(resource) in self._fingerprinting:
+            return "Recursive", type(resource).__name__
+        self._fingerprinting.add(id(resource))
+        try:
+            return self._fingerprint_resource(compile_state, resource)
+        finally:
+            self._fingerprinting.remove(id(resource))
+
+    def _fingerprint_resource(self, compile_state: CompileState, resource: Resource) -> Tuple:
+        # `is_variable` is not part of the fingerprint, since every parameter becomes a variable of the function
+        if isinstance(resource, ValueResource):
+            return (type(resource).__name__, resource.static_value,
+                    None if resource.scoreboard_value is None else str(resource.scoreboard_value))
+        if isinstance(resource, StringResource):
+            return "String", resource.static_value
+        if isinstance(resource, SelectorResource):
+            return "Selector", str(resource.value)
+        if isinstance(resource, TypeResource):
+            return "Type", resource.static_value.uid, resource.static_value.name
+        if isinstance(resource, FunctionResource):
+            return "Function", self.source_hash(compile_state, resource), \
+                   resource.function_signature.signature_string()
+        if isinstance(resource, MethodResource):
+            return ("Method", self.fingerprint(compile_state, resource.function),
+                    self.fingerprint(compile_state, resource.self_object))
+        if isinstance(resource, MacroResource):
+            return "Macro", resource.name
+        if isinstance(resource, StructResource):
+            return ("Struct", resource.name, resource.object_type.uid,
+                    tuple((name, self.fingerprint(compile_state, variable.resource))
+                          for name, variable in resource.context.namespace.items()))
+        if isinstance(resource, StructObjectResource):
+            return ("Object", resource.struct.name, resource.struct.object_type.uid,
+                    tuple((name, self.fingerprint(compile_state, member))
+                          for name, member in resource.public_namespace.items()))
+        if isinstance(resource, EnumResource):
+            return ("Enum", tuple((name, self.fingerprint(compile_state, member))
+                                  for name, member in resource.public_namespace.items()))
+        if isinstance(resource, TupleResource):
+            return "Tuple", tuple(self.fingerprint(compile_state, i) for i in resource.resources)
+        raise _Uncacheable()
+
+
+class FunctionCache:
+    """
+    A content addressed cache of generated functions.
+
+    Generating a function at a call site depends on the source code of the function, its signature,
+    the arguments, every resource that the function can access by name and the config.
+    All of this is hashed into a key. If a function gets generated again with the same key, the cached ir nodes
+    are copied instead. Generated names (block functions, scoreboard values and storage paths) are moved to the names
+    that would be generated at this position, so the output is exactly the same as without the cache.
+
+    The cache lives on the compiler, so functions are reused across compilations in the same process
+    (ie. in watch mode). Optimizations still run on the complete program.
+    Functions that change anything outside of their own function nodes are never cached.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.fingerprinter = Fingerprinter()
+
+    def begin(self):
+        """ Must be called before a new compilation starts """
+        self.fingerprinter.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, compile_state: CompileState, function: FunctionResource,
+               parameters: List[Resource]) -> Optional[FunctionCacheRecording]:
+        """
+        Computes the key of a function call and remembers the current state of the compiler.
+
+        Args:
+            compile_state: the compile state
+            function: the function that will be generated
+            parameters: the parameters of the function
+
+        Returns:
+            The recording or None if this function call can not be cached
+        """
+        key = self.make_key(compile_state, function, parameters)
+        if key is None:
+            return None
+
+        return FunctionCacheRecording(key, _Counters.of(compile_state), SideEffects.of(compile_state),
+                                      len(compile_state.ir.function_nodes))
+
+    def replay(self, compile_state: CompileState,
+               recording: FunctionCacheRecording) -> Optional[Tuple[FunctionNode, Resource]]:
+        """
+        Generates the function from the cache, if possible.
+
+        Returns:
+            The generated function node and the returned resource or None if the function is not cached
+        """
+        entry = self.entries.get(recording.key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(recording.key)
+        self.hits += 1
+
+        renamer = _Renamer(compile_state, entry.counters, entry.size, recording.counters)
+        functions = [renamer.node(i) for i in entry.functions]
+        for function in functions:
+            compile_state.ir.add_function(function)
+
+        compile_state.stack.reserve(entry.size.contexts)
+        compile_state.node_block_counter.value += entry.size.blocks
+        compile_state.temp_data_counter.value += entry.size.temps
+
+        Logger.debug(f"[FunctionCache] reused {functions[-1]['name']}")
+        return functions[-1], renamer.resource(entry.return_resource)
+
+    def store(self, compile_state: CompileState, recording: FunctionCacheRecording, function: FunctionResource,
+              parameters: List[Resource], return_resource: Resource):
+        """
+        Adds the functions that were generated since `recording` to the cache.
+        Does nothing if the function had any side effects.
+
+        Args:
+            compile_state: the compile state
+            recording: the recording that was created before the function was generated
+            function: the function
+            parameters: the parameters of the function
+            return_resource: the resource that was returned by the function
+        """
+        if SideEffects.of(compile_state) != recording.side_effects:
+            return
+        if self.make_key(compile_state, function, parameters) != recording.key:
+            return
+
+        functions = compile_state.ir.function_nodes[recording.function_index:]
+        function_ids = {id(i) for i in functions}
+        if not all(id(i) in function_ids for i in _called_functions(functions)):
+            return
+
+        counters = _Counters.of(compile_state)
+        size = _Counters(*(new - old for new, old in zip(counters, recording.counters)))
+
+        # copy the nodes, because they will be modified by the optimizer
+        renamer = _Renamer(compile_state, recording.counters, size, recording.counters)
+        try:
+            return_resource = renamer.resource(return_resource)
+        except _Uncacheable:
+            return
+
+        self.entries[recording.key] = _CacheEntry(
+            [renamer.node(i) for i in functions], return_resource, recording.counters, size
+        )
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def make_key(self, compile_state: CompileState, function: FunctionResource,
+                 parameters: List[Resource]) -> Optional[str]:
+        """ Returns the key for this function call or None if it can not be cached """
+        context = compile_state.currentContext()
+        fingerprinter = self.fingerprinter
+        try:
+            names = fingerprinter.referenced_names(compile_state, function, parameters)
+            key = (
+                fingerprinter.source_hash(compile_state, function),
+                function.function_signature.signature_string(),
+                tuple(fingerprinter.fingerprint(compile_state, i) for i in parameters),
+                tuple(
+                    (name, None if (variable := context.find_var(name)) is None
+                     else fingerprinter.fingerprint(compile_state, variable.resource))
+                    for name in names
+                ),
+                # variables of the previous context that are written by the function get stored
+                tuple(name for name in names if name in context.namespace),
+                tuple(i.signature_string() for i in compile_state.function_call_stack),
+                tuple((section, tuple(compile_state.config[section].items()))
+                      for section in compile_state.config.config.sections())
+            )
+        except _Uncacheable:
+            return None
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+def _called_functions(functions: List[FunctionNode]) -> List[FunctionNode]:
+    """ Returns all functions that are called by function call nodes inside of `functions`"""
+    called = []
+    pending: List[IRNode] = list(functions)
+    visited: Set[int] = set()
+    while pending:
+        node = pending.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        if isinstance(node, FunctionCallNode):
+            called.append(node["function"])
+        pending.extend(node.inner_nodes)
+        for value in node.data.values():
+            if isinstance(value, IRNode):
+                pending.append(value)
+            elif isinstance(value, list):
+                pending.extend(i for i in value if isinstance(i, IRNode))
+    return called
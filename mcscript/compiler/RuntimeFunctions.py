@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Optional, TYPE_CHECKING, Tuple
+
+from mcscript import Logger
+from mcscript.compiler.ContextType import ContextType
+from mcscript.ir.components import FunctionCallNode, FunctionNode
+from mcscript.lang.resource.FunctionResource import copy_return_resource
+from mcscript.lang.resource.NullResource import NullResource
+from mcscript.lang.resource.base.ResourceBase import Resource, ValueResource
+from mcscript.lang.resource.base.functionSignature import FunctionParameter
+from mcscript.utils.resources import ScoreboardValue
+
+if TYPE_CHECKING:
+    from mcscript.compiler.CompileState import CompileState
+    from mcscript.lang.resource.FunctionResource import FunctionResource
+
+
+class RuntimeFunction(NamedTuple):
+    """ A function that was compiled once and is called at runtime """
+    function: FunctionNode
+    # the scoreboard values that the caller sets to the arguments
+    parameters: List[ScoreboardValue]
+    # a static resource or a resource on the scoreboard value which holds the result after the call
+    return_resource: Resource
+
+
+class RuntimeFunctions:
+    """
+    Compiles functions once and calls them with a scoreboard calling convention.
+
+    A call to a function normally generates the whole function again, specialized for the arguments.
+    If an argument is only known at runtime, the specialization does not help, so the function gets compiled once:
+        * Every parameter gets a scoreboard value of the function, which the caller sets to the argument.
+        * The function is called with a `FunctionCallNode`.
+        * The result is copied from the scoreboard value of the returned resource by the caller, since the next
+          call can overwrite it.
+
+    A function can access variables of the calling context, so the compiled function is keyed by the fingerprints
+    of all accessible names (see `Fingerprinter.call_key`). A call site where such a variable has another value or
+    address gets its own compiled function. Functions whose compilation changes anything outside of them,
+    for example by storing a variable of the caller, are compiled again at the next call.
+    Calls where all arguments are static, or where an argument can not be stored on a scoreboard,
+    are still specialized at the call site.
+    """
+
+    def __init__(self):
+        self.functions: Dict[Tuple, RuntimeFunction] = {}
+
+    @staticmethod
+    def accepts(function: FunctionResource, parameters: List[Resource]) -> bool:
+        """ Whether the function is compiled once for a call with these parameters """
+        if not any(isinstance(i, ValueResource) and not i.is_static for i in parameters):
+            return False
+
+        for template, parameter in zip(function.function_signature.parameters, parameters):
+            if not isinstance(parameter, ValueResource):
+                return False
+            if template.count != FunctionParameter.ParameterCount.ONCE or \
+                    not template.accepts & FunctionParameter.ResourceMode.NON_STATIC:
+                return False
+        return True
+
+    def call(self, compile_state: CompileState, function: FunctionResource,
+             parameters: List[Resource]) -> Optional[Resource]:
+        """
+        Calls the function at runtime and compiles it, if this was not done yet.
+        The function must accept the parameters, see `accepts`.
+
+        Args:
+            compile_state: the compile state
+            function: the function
+            parameters: the parameters
+
+        Returns:
+            The result of the call or None if the accessible names can not be fingerprinted
+        """
+        key = self.make_key(compile_state, function, parameters)
+        if key is None:
+            return None
+
+        runtime_function = self.functions.get(key, None)
+        if runtime_function is None:
+            side_effects = compile_state.fingerprinter.side_effects(compile_state)
+            runtime_function = self._compile(compile_state, function, parameters)
+            # compiling the function must not change anything outside of it, ie. store variables of the caller
+            if isinstance(runtime_function.return_resource, (ValueResource, NullResource)) and \
+                    compile_state.fingerprinter.side_effects(compile_state) == side_effects and \
+                    self.make_key(compile_state, function, parameters) == key:
+                self.functions[key] = runtime_function
+                compile_state.reusable_functions += 1
+        else:
+            Logger.debug(f"[RuntimeFunctions] reused {runtime_function.function['name']}")
+
+        for scoreboard_value, parameter in zip(runtime_function.parameters, parameters):
+            parameter.copy(scoreboard_value, compile_state)
+        compile_state.ir.append(FunctionCallNode(runtime_function.function))
+        return copy_return_resource(compile_state, runtime_function.return_resource)
+
+    @staticmethod
+    def make_key(compile_state: CompileState, function: FunctionResource,
+                 parameters: List[Resource]) -> Optional[Tuple]:
+        """ Returns the key of the compiled function or None if it can not be reused """
+        key = compile_state.fingerprinter.call_key(compile_state, function, parameters, False)
+        return None if key is None else (id(function), key)
+
+    def _compile(self, compile_state: CompileState, function: FunctionResource,
+                 parameters: List[Resource]) -> RuntimeFunction:
+        code = function.code
+        with compile_state.node_block(ContextType.FUNCTION, code.line, code.column) as block_function:
+            context = compile_state.currentContext()
+            scoreboard_values = []
+            for template, parameter in zip(function.function_signature.parameters, parameters):
+                scoreboard_value = compile_state.expressionStack.next()
+                scoreboard_values.append(scoreboard_value)
+                context.add_var(template.name, type(parameter)(None, scoreboard_value))
+
+            compile_state.compile_ast(code)
+            return_resource = context.get_return_resource_or_null()
+
+        return RuntimeFunction(block_function, scoreboard_values, return_resource)
@@ -14,9 +14,11 @@ from mcscript.exceptions.exceptions import (McScriptUndefinedVariableError, McSc
                                             McScriptUnexpectedTypeError, McScriptValueError)
 from mcscript.exceptions.utils import requireType
 from mcscript.ir import IRNode
-from mcscript.ir.command_components import Position, ExecuteAnchor
-from mcscript.ir.components import ExecuteNode, FunctionCallNode, ConditionalNode, FunctionNode, IfNode
+from mcscript.ir.command_components import BinaryOperator, ExecuteAnchor, Position, ScoreRelation
+from mcscript.ir.components import (ExecuteNode, FastVarOperationNode, FunctionCallNode, ConditionalNode,
+                                    FunctionNode, IfNode)
 from mcscript.lang.atomic_types import Selector as SelectorType, String
+from mcscript.lang.resource.RangeResource import RangeResource
 from mcscript.lang.resource.SelectorResource import SelectorResource
 from mcscript.lang.resource.StringResource import StringResource
 from mcscript.lang.resource.base.ResourceBase import ObjectResource, Resource, ValueResource
@@ -43,15 +45,15 @@ def get_property(compileState: CompileState, accessor: Tree) -> List[Resource]:
 
     ret, *values = accessor.children
 
-    if ret not in compileState.currentContext():
+    parent_var = compileState.currentContext().find_var(ret)
+    if parent_var is None:
         # enums are loaded here lazily
         if result := defaultEnums.get(ret, compileState.config):
-            compileState.stack.stack[0].add_var(ret, result)
+            parent_resource = compileState.stack.stack[0].add_var(ret, result)
         else:
             raise McScriptUndefinedVariableError(ret, compileState)
-
-    parent_var = compileState.currentContext().find_var(ret)
-    parent_resource = parent_var.resource
+    else:
+        parent_resource = parent_var.resource
     accessed = [parent_resource]
 
     for value in values:
@@ -138,9 +140,10 @@ def set_property(compile_state: CompileState, accessor: Tree, value: Resource):
 
     # manual setting because this method is called manually
     compile_state.currentTree = obj
-    if obj not in compile_state.currentContext():
+    resource = compile_state.currentContext().find_resource(obj)
+    if resource is None:
         raise McScriptUndefinedVariableError(obj, compile_state)
-    obj = compile_state.currentContext().find_resource(obj)
+    obj = resource
 
     for i in rest[:-1]:
         compile_state.currentTree = i
@@ -217,6 +220,49 @@ def conditional_loop(compile_state: CompileState,
         repeat_if(recurse_condition, loop_function)
 
 
+def counter_loop(compile_state: CompileState, block: Tree, var_name: str, iterable: RangeResource):
+    """
+    Creates a recursive function call loop that counts from the start to the end of the range.
+    Unlike an unrolled for loop, the body is only compiled once and the loop variable is dynamic.
+
+    Args:
+        compile_state: the compile state
+        block: the block of the loop
+        var_name: the name of the loop variable
+        iterable: the range
+
+    Returns:
+        None
+    """
+    counter = iterable.start.copy(compile_state.expressionStack.next(), compile_state)
+
+    def repeat_if_less(function: FunctionNode):
+        condition = counter.operation_test_relation(compile_state, ScoreRelation.LESS, iterable.stop)
+        static_value = condition.static_value()
+        if static_value is not None:
+            if static_value:
+                compile_state.ir.append(FunctionCallNode(function))
+            return
+        compile_state.ir.append(IfNode(condition, FunctionCallNode(function)))
+
+    with compile_state.node_block(ContextType.LOOP, block.line, block.column) as loop_function:
+        with compile_state.ir.with_previous():
+            repeat_if_less(loop_function)
+
+        # the body may write the loop variable, which must not change the iteration
+        context = compile_state.currentContext()
+        variable_context = context.variable_context.get(var_name, None)
+        value = counter
+        if variable_context is None or variable_context.writes:
+            value = counter.copy(compile_state.expressionStack.next(), compile_state)
+        context.add_var(var_name, value)
+
+        compile_state.compile_ast(block)
+
+        compile_state.ir.append(FastVarOperationNode(counter.scoreboard_value, 1, BinaryOperator.PLUS))
+        repeat_if_less(loop_function)
+
+
 def readContextManipulator(modifiers: List[Tree], compileState: CompileState) -> List[ExecuteNode.ExecuteArgument]:
     def for_(selector: SelectorResource) -> IRNode:
         requireType(selector, SelectorType, compileState)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+
+@dataclass()
+class CompileReport:
+    """
+    Statistics about a single compilation, which are collected alongside the datapack.
+
+    The stage times are in seconds. The time of "Compiling" includes the time of "Optimizing".
+    """
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    # the number of ir nodes of each type, before and after the ir was optimized
+    nodes_before_optimize: Dict[str, int] = field(default_factory=dict)
+    nodes_after_optimize: Dict[str, int] = field(default_factory=dict)
+    # the names of all functions that were removed because they were inlined
+    dropped_functions: List[str] = field(default_factory=list)
+    # the values of all constant scores that the backend had to allocate
+    constants: List[int] = field(default_factory=list)
+    # the number of distinct scoreboard values that the ir writes to, before and after they were reused
+    # by the `ScoreboardAllocator`
+    temporaries_before_allocation: int = 0
+    temporaries: int = 0
+    # the number of iterations of the optimization passes and the runs, rewrites and time in seconds of every pass
+    optimization_iterations: int = 0
+    passes: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # the number of distinct json texts that the backend serialized for all messages
+    messages: int = 0
+    # the total size of all files of the datapack
+    output_bytes: int = 0
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import configparser
+from copy import copy
 from functools import cached_property
+from io import StringIO
 from os.path import exists, join
 from typing import Optional, TYPE_CHECKING
 
@@ -10,6 +12,7 @@ from mcscript.assets.DataManager import DataManager
 from mcscript.utils.resources import ResourceSpecifier
 
 if TYPE_CHECKING:
+    from mcscript.ir.optimize.Inliner import InlineCosts
     from mcscript.utils.cmdHelper import MCWorld
 
 
@@ -32,11 +35,20 @@ class Config:
         self.config["main"] = {
             "release": "False",
             "minecraft_version": "",
-            "name": "mcscript"
+            "name": "mcscript",
+            "module": "",
+            # compile functions that are called with runtime arguments only once
+            "runtime_functions": "True",
+            # for loops over larger integer ranges count at runtime instead of being unrolled
+            "unroll_limit": "32",
+            # from 0 (no optimizations) to 3 (repeat the optimization passes until nothing changes)
+            "optimization_level": "2",
+            # the maximum number of times that the optimization passes are repeated on level 3
+            "optimization_iterations": "8"
         }
 
         self.config["scores"] = {
-            "format_string": ".exp_{block}_{index}"
+            "format_string": ".exp{block}_{index}"
         }
 
         # maximum scoreboard name has 16 chars so `name` must contain 12 chars at most
@@ -44,6 +56,15 @@ class Config:
             "main": self["main"]["name"]
         }
 
+        # the weights of the inliner, see `InlineCosts`
+        self.config["inline"] = {
+            "call": "1",
+            "file": "1",
+            "size": "0.2",
+            "branch_probability": "0.5",
+            "max_size": "8"
+        }
+
         self.config["storage"] = {
             "name": "main",
             "stack": "state.stack",
@@ -96,6 +117,94 @@ class Config:
         self["main"]["minecraft_version"] = value
         self._data_manager = DataManager(self.minecraft_version)
 
+    @property
+    def runtime_functions(self) -> bool:
+        """ Whether functions that are called with runtime arguments are only compiled once """
+        return self.config.getboolean("main", "runtime_functions")
+
+    @runtime_functions.setter
+    def runtime_functions(self, value: bool):
+        self["main"]["runtime_functions"] = str(value)
+
+    @property
+    def unroll_limit(self) -> int:
+        """ The maximum size of a range that is unrolled by a for loop """
+        return self.config.getint("main", "unroll_limit")
+
+    @unroll_limit.setter
+    def unroll_limit(self, value: int):
+        self["main"]["unroll_limit"] = str(value)
+
+    @property
+    def optimization_level(self) -> int:
+        """ How much the ir is optimized, see `PassManager` """
+        return self.config.getint("main", "optimization_level")
+
+    @optimization_level.setter
+    def optimization_level(self, value: int):
+        self["main"]["optimization_level"] = str(value)
+
+    @property
+    def optimization_iterations(self) -> int:
+        """ The maximum number of times that the optimization passes are repeated on level 3 """
+        return self.config.getint("main", "optimization_iterations")
+
+    @optimization_iterations.setter
+    def optimization_iterations(self, value: int):
+        self["main"]["optimization_iterations"] = str(value)
+
+    @property
+    def inline_costs(self) -> InlineCosts:
+        """ The weights of the cost model which decides whether a function call is inlined """
+        from mcscript.ir.optimize.Inliner import InlineCosts
+        section = self["inline"]
+        return InlineCosts(section.getfloat("call"), section.getfloat("file"), section.getfloat("size"),
+                           section.getfloat("branch_probability"), section.getint("max_size"))
+
+    @property
+    def module(self) -> str:
+        """ The name of the module that is compiled, if this config belongs to a file of a project """
+        return self.get_main("module")
+
+    def for_module(self, module: str) -> Config:
+        """
+        Creates a copy of this config for a single file of a project.
+
+        Functions, scores and storage paths of the module are prefixed with the name of the module,
+        so modules which are compiled on their own do not overwrite each other.
+
+        Args:
+            module: the name of the module, ie. "main" or "utils/math"
+
+        Returns:
+            The new config
+        """
+        config = copy(self)
+        config.config = configparser.ConfigParser()
+        config.config.read_dict(self.config)
+        config.__dict__.pop("storage_id", None)
+
+        key = module.replace("/", "-")
+        config["main"]["module"] = module
+        config["scores"]["format_string"] = f".{key}{self.get_score('format_string')}"
+        config["storage"]["stack"] = f"{self.get_storage('stack')}.{key}"
+        config["storage"]["temp"] = f"{self.get_storage('temp')}.{key}"
+        return config
+
+    def to_string(self) -> str:
+        """ Returns the values of this config in the format of a config file """
+        text = StringIO()
+        self.config.write(text)
+        return text.getvalue()
+
+    @classmethod
+    def from_string(cls, text: str) -> Config:
+        """ Creates a config from the contents of a config file """
+        config = cls()
+        config.config.read_string(text)
+        config._data_manager = DataManager(config.minecraft_version)
+        return config
+
     #########################################
     #                 I/O                   #
     #########################################
@@ -158,6 +267,8 @@ class Config:
     # Utility functions
 
     def resource_specifier_main(self, name: str) -> ResourceSpecifier:
+        if self.module:
+            return ResourceSpecifier(self.project_name, f"{self.module}/{name}")
         return ResourceSpecifier(self.project_name, name)
 
     def __getitem__(self, item):
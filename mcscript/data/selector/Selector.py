@@ -2,32 +2,30 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import List, Literal, TYPE_CHECKING
+from typing import Literal, Tuple, TYPE_CHECKING
 
-from lark import LarkError
-
-from mcscript import get_selector_grammar
-from mcscript.data.selector.selectorData import (
-    getByName, getSelectors, Integer, Nbt, Range, Repeat, SelectorArgument,
-    String,
-)
+from mcscript.data.selector.selectorData import getByName, getSelectors, Repeat, SelectorArgument
+from mcscript.data.selector.selectorParser import parse_selector, SelectorSyntaxError
 from mcscript.exceptions.exceptions import McScriptInvalidSelectorError
 
 if TYPE_CHECKING:
     from mcscript.compiler.CompileState import CompileState
 
+# the number of parsed selectors that are kept, see `Selector.from_string`
+SELECTOR_CACHE_SIZE = 4096
+
 
-@dataclass()
+@dataclass(frozen=True)
 class Selector:
     selector: Literal["p", "a", "r", "s", "e"]
-    arguments: List[SelectorArgument]
+    arguments: Tuple[SelectorArgument, ...]
 
-    def sort(self):
+    def sorted(self) -> Selector:
         """
         Sorts the arguments to match the specified priority values for the best performance in minecraft
 
         Returns:
-            None
+            A selector with the sorted arguments
         """
 
         def get_priority(x: SelectorArgument) -> int:
@@ -35,7 +33,7 @@ class Selector:
                 return x.selector.priority[1]
             return x.selector.priority[0]
 
-        self.arguments.sort(key=get_priority, reverse=True)
+        return Selector(self.selector, tuple(sorted(self.arguments, key=get_priority, reverse=True)))
 
     def verify(self, compileState: CompileState):
         """
@@ -96,67 +94,50 @@ class Selector:
                                                                                      False) or not argument.negative
 
     @classmethod
-    @lru_cache(maxsize=32)
     def from_string(cls, _selector: str, compileState: CompileState = None) -> Selector:
         """
         Creates a Selector from a string
         format: @[parse][key=value,...] where value has balanced parentheses
 
+        Selectors are immutable, so the same object is returned for the same string while it is cached.
+
         Args:
             _selector: the selector string
             compileState: the compile state or none if not available
 
         Returns:
             A selector
+
+        Raises:
+            McScriptInvalidSelectorError: if the selector is invalid, or a ValueError if no compile state is given
         """
         try:
-            ast = get_selector_grammar().parse(_selector)
-        except LarkError as e:
-            raise McScriptInvalidSelectorError(
-                f"Failed to parse selector '{_selector}'\n"
-                f"Got Error: {e}",
-                compileState
-            )
-        selector, *arguments = ast.children
-        arguments = arguments[0].children if arguments else []
-
-        selectorArgs = []
-        for argument in arguments:
-            key, value = argument.children
-            value, = value.children
-            negate = argument.data == "neg"
-
-            if value.data == "number":
-                value = Integer(int(value.children[0]))
-            elif value.data == "range":
-                min_, max_ = value.children
-                value = Range(int(min_), int(max_))
-            elif value.data == "range_no_max":
-                _min, = value.children
-                value = Range(int(_min), None)
-            elif value.data == "range_no_min":
-                _max, = value.children
-                value = Range(None, int(_max))
-            elif value.data == "string":
-                value = String(value.children[0])
-            elif value.data == "nbt":
-                value = Nbt(_selector[value.column - 1:value.end_column - 1])
-            else:
-                raise ValueError(f"Don't know what to do with node {value.data}")
-
-            try:
-                selectorArgs.append(SelectorArgument(getByName(key), value, negate))
-            except ValueError:
-                msg = f"Invalid Selector argument: '{key}'. Must be one of:\n" \
-                      f"{', '.join(i.name for i in getSelectors())}"
-                if compileState is not None:
-                    raise McScriptInvalidSelectorError(msg, compileState)
-                else:
-                    raise ValueError(msg)
-        # noinspection PyTypeChecker
-        return Selector(str(selector.children[0]), selectorArgs)
+            return _parse_cached(_selector)
+        except SelectorSyntaxError as e:
+            msg = f"Failed to parse selector '{_selector}'\n" \
+                  f"Got Error: {e}"
+        except ValueError as e:
+            msg = str(e)
+        if compileState is not None:
+            raise McScriptInvalidSelectorError(msg, compileState)
+        raise ValueError(msg)
 
     def __str__(self):
         arguments = ",".join(str(i) for i in self.arguments)
         arguments = f"[{arguments}]" if self.arguments else ""
         return f"@{self.selector}{arguments}"
+
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def _parse_cached(text: str) -> Selector:
+    selector, arguments = parse_selector(text)
+
+    selectorArgs = []
+    for key, value, negate in arguments:
+        try:
+            selectorArgs.append(SelectorArgument(getByName(key), value, negate))
+        except ValueError:
+            raise ValueError(f"Invalid Selector argument: '{key}'. Must be one of:\n"
+                             f"{', '.join(i.name for i in getSelectors())}")
+    # noinspection PyTypeChecker
+    return Selector(selector, tuple(selectorArgs))
@@ -0,0 +1,137 @@
+"""
+Parses the text of an entity selector, ie. `@e[type=armor_stand,tag=!marker,nbt={Tags:["a"]}]`.
+
+format: @[parse] optionally followed by [key=value,...]. Only a single space may follow a comma.
+A value is one of:
+    number:         5
+    range:          1..5, 1.. or ..5
+    string:         an identifier like `armor_stand` or a quoted string without quotes inside, like "a b"
+    nbt:            anything in balanced braces, like {a:{b:1}}
+A value may be negated with `=!`.
+
+The parser never backtracks and reads every character at most twice, so it runs in linear time.
+"""
+import re
+from typing import List, Tuple
+
+from mcscript.data.selector.selectorData import Integer, Nbt, Range, SelectorValueType, String
+
+SELECTOR_TYPES = "parse"
+
+_IDENTIFIER = re.compile(r"[a-zA-Z0-9_]+")
+_NUMBER = re.compile(r"[0-9]+")
+_BRACE = re.compile(r"[{}]")
+
+
+class SelectorSyntaxError(ValueError):
+    """ Raised if the text is not a valid selector """
+
+
+def parse_selector(text: str) -> Tuple[str, List[Tuple[str, SelectorValueType, bool]]]:
+    """
+    Parses a selector.
+
+    Args:
+        text: the selector text
+
+    Returns:
+        the selector type (ie. "e") and the arguments as tuples of key, value and whether the argument is negated
+
+    Raises:
+        SelectorSyntaxError: if the text is not a valid selector
+    """
+    return _SelectorParser(text).parse()
+
+
+class _SelectorParser:
+    def __init__(self, text: str):
+        self.text = text
+        self.position = 0
+
+    def parse(self) -> Tuple[str, List[Tuple[str, SelectorValueType, bool]]]:
+        self.expect("@")
+        selector = self.peek()
+        if not selector or selector not in SELECTOR_TYPES:
+            self.error(f"one of '{SELECTOR_TYPES}'")
+        self.position += 1
+
+        arguments = []
+        if self.peek() == "[":
+            self.position += 1
+            arguments.append(self.argument())
+            while self.peek() == ",":
+                self.position += 1
+                if self.peek() == " ":
+                    self.position += 1
+                arguments.append(self.argument())
+            self.expect("]")
+
+        if self.position != len(self.text):
+            self.error("the end of the selector")
+        return selector, arguments
+
+    def argument(self) -> Tuple[str, SelectorValueType, bool]:
+        key = self.match(_IDENTIFIER, "an argument name")
+        self.expect("=")
+        negated = self.peek() == "!"
+        if negated:
+            self.position += 1
+        return key, self.value(), negated
+
+    def value(self) -> SelectorValueType:
+        char = self.peek()
+        if char == "\"":
+            start = self.position + 1
+            end = self.text.find("\"", start)
+            if end <= start:
+                self.error("a non-empty string")
+            self.position = end + 1
+            return String(self.text[start:end])
+        if char == "{":
+            return Nbt(self.nbt())
+        if char == ".":
+            self.expect("..")
+            return Range(None, int(self.match(_NUMBER, "a number")))
+
+        word = self.match(_IDENTIFIER, "a value")
+        if not _NUMBER.fullmatch(word):
+            return String(word)
+        if not self.text.startswith("..", self.position):
+            return Integer(int(word))
+        self.position += 2
+        maximum = _NUMBER.match(self.text, self.position)
+        if maximum is None:
+            return Range(int(word), None)
+        self.position = maximum.end()
+        return Range(int(word), int(maximum.group()))
+
+    def nbt(self) -> str:
+        """ reads the braces at the current position and everything in between """
+        start = self.position
+        depth = 0
+        for brace in _BRACE.finditer(self.text, start):
+            depth += 1 if brace.group() == "{" else -1
+            if depth == 0:
+                self.position = brace.end()
+                return self.text[start:self.position]
+        self.position = len(self.text)
+        self.error("'}'")
+
+    def peek(self) -> str:
+        return self.text[self.position:self.position + 1]
+
+    def expect(self, expected: str):
+        if not self.text.startswith(expected, self.position):
+            self.error(f"'{expected}'")
+        self.position += len(expected)
+
+    def match(self, pattern: re.Pattern, description: str) -> str:
+        match = pattern.match(self.text, self.position)
+        if match is None:
+            self.error(description)
+        self.position = match.end()
+        return match.group()
+
+    def error(self, expected: str):
+        found = f"'{self.peek()}'" if self.position < len(self.text) else "the end of the selector"
+        raise SelectorSyntaxError(f"Expected {expected} at column {self.position + 1}, found {found}")
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional, Any
 
-from mcscript.exceptions.McScriptException import McScriptError
+from mcscript.exceptions.McScriptException import McScriptError, McScriptException
 
 if TYPE_CHECKING:
     from mcscript.lang.resource.base.functionSignature import FunctionSignature
@@ -84,3 +84,15 @@ class McScriptIfElseReturnTypeError(McScriptError):
 class McScriptInlineRecursionError(McScriptError):
     def __init__(self, signature: FunctionSignature, compile_state):
         super().__init__(f"Cannot inline {str(signature)}: would recurse infinitely", compile_state)
+
+
+class McScriptModuleError(McScriptException):
+    """ An error in a module of a project, which was compiled in another process """
+
+    def __init__(self, module: str, msg: str):
+        super().__init__(f"In module '{module}':\n{msg}")
+        self.module = module
+        self.msg = msg
+
+    def __reduce__(self):
+        return McScriptModuleError, (self.module, self.msg)
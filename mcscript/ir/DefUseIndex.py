@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from mcscript.ir import IRNode
+from mcscript.ir.components import FunctionNode
+from mcscript.utils.resources import ScoreboardValue
+
+
+class DefUseIndex:
+    """
+    Counts the nodes that read and write each scoreboard value, so that an optimization can check
+    whether a value is read anywhere without searching every function.
+
+    The index is built for a round of optimizations and has to be updated by every optimization
+    that removes a node. Nodes are counted once, even if they are contained by multiple functions
+    (for example after a function with a single node was inlined), so removing the same node twice is ignored.
+    Nodes that are moved to another place keep their counts.
+    """
+
+    def __init__(self, functions: Iterable[FunctionNode]):
+        # keyed by the string of the scoreboard value
+        self.reads: Counter[str] = Counter()
+        self.writes: Counter[str] = Counter()
+
+        # the counted and the removed nodes by their id. Holds the nodes, so that their ids are not reused
+        self._indexed: Dict[int, IRNode] = {}
+        self._removed: Dict[int, IRNode] = {}
+
+        for function in functions:
+            self.add(function)
+
+    def is_read(self, scoreboard_value: ScoreboardValue, reader: Optional[IRNode] = None) -> bool:
+        """
+        Returns whether any node reads the scoreboard value
+
+        Args:
+            scoreboard_value: the scoreboard value
+            reader: a node whose own reads are ignored, like the value in `a *= a`
+
+        Returns:
+            Whether another node reads the value
+        """
+        reads = self.reads[str(scoreboard_value)]
+        if reader is not None:
+            reads -= sum(1 for i in reader.read_scoreboard_values() if i == scoreboard_value)
+        return reads > 0
+
+    def is_written(self, scoreboard_value: ScoreboardValue) -> bool:
+        """ Returns whether any node writes to the scoreboard value """
+        return self.writes[str(scoreboard_value)] > 0
+
+    def add(self, node: IRNode):
+        """ Counts the node and its inner nodes """
+        self._update(node, 1, self._indexed)
+
+    def remove(self, node: IRNode):
+        """ Stops counting the node and its inner nodes, because they were removed from the ir """
+        self._update(node, -1, self._removed)
+
+    def _update(self, node: IRNode, count: int, visited: Dict[int, IRNode]):
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            if id(node) in visited:
+                continue
+            visited[id(node)] = node
+
+            for value in node.read_scoreboard_values():
+                if isinstance(value, ScoreboardValue):
+                    self.reads[str(value)] += count
+            for value in node.written_scoreboard_values():
+                self.writes[str(value)] += count
+
+            nodes += node.inner_nodes
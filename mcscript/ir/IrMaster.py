@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+from collections import Counter
 from contextlib import contextmanager
+from dataclasses import asdict
 from itertools import chain
-from typing import List, Union, Generator, Iterable, Optional, ContextManager
+from typing import Dict, List, Union, Generator, Iterable, Optional, ContextManager, Set, TextIO, TYPE_CHECKING
 
+from mcscript import Logger
 from mcscript.ir import IRNode
+from mcscript.ir.DefUseIndex import DefUseIndex
 from mcscript.ir.components import FunctionNode
-from mcscript.ir.optimize import optimize
+from mcscript.ir.optimize.Inliner import InlineCosts
+from mcscript.ir.optimize.PassManager import PassManager
+from mcscript.ir.optimize.ScoreboardAllocator import ScoreboardAllocator
 from mcscript.utils.Scoreboard import Scoreboard
 from mcscript.utils.resources import ResourceSpecifier
 
+if TYPE_CHECKING:
+    from mcscript.data.CompileReport import CompileReport
+
 
 class IrMaster:
     """
@@ -27,22 +36,103 @@ class IrMaster:
 
         self.node_counter = 0
 
-    def optimize(self):
-        """ Optimizes the contained function nodes"""
-        # simple optimization pass
-        function_nodes = [i.optimized(self, None)[0] for i in self.function_nodes]
-        self.function_nodes = [i for i in function_nodes if not i["drop"]]
+        # the readers and writers of every scoreboard value during a simple optimization pass
+        self.def_use: Optional[DefUseIndex] = None
+
+        # the names of all functions that were dropped by the simple optimization passes
+        self.dropped_functions: List[str] = []
+        # the number of written scoreboard values before `allocate_scores`
+        self.temporaries_before_allocation: Optional[int] = None
+
+    def optimize(self, main_function: ResourceSpecifier, report: Optional[CompileReport] = None, level: int = 2,
+                 max_iterations: int = 8, inline_costs: Optional[InlineCosts] = None):
+        """
+        Optimizes the contained function nodes
+
+        Args:
+            main_function: the name of the function that is run when the datapack is loaded
+            report: a report which receives the node counts, the inlined functions and the pass statistics
+            level: the optimization level, see `PassManager`
+            max_iterations: the maximum number of times that the passes are repeated on level 3
+            inline_costs: the weights of the inliner or None for the default weights
+        """
+        if report is not None:
+            report.nodes_before_optimize = self.count_nodes()
+
+        (start_node,) = [i for i in self.function_nodes if i["name"] == main_function]
+        pass_manager = PassManager.for_level(level, max_iterations, inline_costs)
+        pass_manager.run(self, start_node)
+
+        if report is not None:
+            report.nodes_after_optimize = self.count_nodes()
+            report.dropped_functions += self.dropped_functions
+            report.temporaries = len(self.written_scoreboard_values())
+            report.temporaries_before_allocation = report.temporaries if self.temporaries_before_allocation is None \
+                else self.temporaries_before_allocation
+            report.optimization_iterations = pass_manager.iterations
+            report.passes = {name: asdict(statistics) for name, statistics in pass_manager.statistics.items()}
+
+    def simple_optimization(self, start_node: FunctionNode) -> int:
+        """
+        Lets every node optimize itself, see `IRNode.optimized`
+
+        Args:
+            start_node: the main function
+
+        Returns:
+            The number of functions that were changed or dropped
+        """
+        # functions that other passes dropped are not optimized anymore
+        dropped = [str(function["name"]) for function in self.function_nodes if function["drop"]]
+        self.function_nodes = [function for function in self.function_nodes if not function["drop"]]
+
+        self.def_use = DefUseIndex(self.function_nodes)
+        results = [i.optimized(self, None) for i in self.function_nodes]
+        self.function_nodes = [function for function, _ in results if not function["drop"]]
+        dropped += [str(function["name"]) for function, _ in results if function["drop"]]
+        self.dropped_functions += dropped
+        return sum(changed for _, changed in results) + len(dropped)
+
+    def allocate_scores(self, start_node: FunctionNode) -> int:
+        """
+        Reuses the scores of temporaries, see `ScoreboardAllocator`
 
-        # expensive optimization pass
-        # ToDo: real Debug mode
-        DEBUG = False
-        if not DEBUG:
-            (start_node,) = [i for i in self.function_nodes if i["name"].path == "main"]
-            optimize(start_node, self.function_nodes)
+        Args:
+            start_node: the main function
 
-            # second simple optimization pass
-            function_nodes = [i.optimized(self, None)[0] for i in self.function_nodes]
-            self.function_nodes = [i for i in function_nodes if not i["drop"]]
+        Returns:
+            The number of values that got the score of another value
+        """
+        self.temporaries_before_allocation = len(self.written_scoreboard_values())
+        allocator = ScoreboardAllocator(start_node, {i["name"]: i for i in self.function_nodes})
+        allocator.optimize()
+        Logger.debug(f"[IrMaster] assigned {allocator.local_values} local values to {allocator.slots} scores")
+        return allocator.rewrites
+
+    def count_nodes(self) -> Dict[str, int]:
+        """ Returns the number of nodes of each type in all functions """
+        counter = Counter()
+        nodes = list(self.function_nodes)
+        while nodes:
+            node = nodes.pop()
+            counter[type(node).__name__] += 1
+            nodes += node.inner_nodes
+        return dict(counter)
+
+    def written_scoreboard_values(self) -> Set[str]:
+        """ Returns all scoreboard values that any function writes to, formatted as "<name> <scoreboard>" """
+        values = set()
+        nodes = list(self.function_nodes)
+        while nodes:
+            node = nodes.pop()
+            values.update(str(i) for i in node.written_scoreboard_values())
+            nodes += node.inner_nodes
+        return values
+
+    def write_functions(self, file: TextIO):
+        """ Writes the tree of every function to `file` """
+        for function in self.function_nodes:
+            file.write(f"{function.as_tree()}\n\n")
 
     def append(self, node: IRNode):
         self.active_nodes[-1].append(node)
@@ -81,6 +171,11 @@ class IrMaster:
             self._incr_index(node)
             self.function_nodes.append(node)
 
+    def add_function(self, node: FunctionNode):
+        """ Adds an already complete function node """
+        self._incr_index(node)
+        self.function_nodes.append(node)
+
     @contextmanager
     def with_buffer(self, buffer=None) -> Generator[List[IRNode], None, None]:
         """ Buffers all nodes and yields their holding list"""
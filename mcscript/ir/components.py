@@ -9,6 +9,7 @@ from mcscript.data.selector.Selector import Selector
 from mcscript.ir import IRNode
 from mcscript.ir.command_components import (Position, ExecuteAnchor, ScoreRelation, ScoreRange, BinaryOperator,
                                             StorageDataType)
+from mcscript.utils.JsonTextFormat.textComponents import JsonText, references
 from mcscript.utils.Scoreboard import Scoreboard
 from mcscript.utils.resources import ResourceSpecifier, ScoreboardValue, DataPath
 
@@ -117,7 +118,7 @@ class ExecuteNode(IRNode):
     #     # inline message node
     #     if len(components) == 1 and isinstance(components[0], self.As):
     #         if len(children) == 1 and isinstance(children[0], MessageNode):
-    #             if children[0]["selector"] == Selector("s", []) and children[0].allow_inline_optimization():
+    #             if children[0]["selector"] == Selector("s", ()) and children[0].allow_inline_optimization():
     #                 children[0]["selector"] = components[0]["selector"]
     #                 return children[0], True
     #
@@ -233,6 +234,7 @@ class IfNode(IRNode):
                 if len(prev_node.inner_nodes) == 1 and isinstance(prev_node.inner_nodes[0], ConditionalNode):
                     if prev_node.allow_inline_optimization():
                         parent.discarded_inner_nodes.append(prev_node)
+                        ir_master.def_use.remove(self["condition"])
                         self["condition"] = prev_node.inner_nodes[0]
                         return self, True
 
@@ -273,18 +275,19 @@ class StoreFastVarNode(IRNode):
 
     def optimized(self, ir_master: IrMaster, parent: Optional[IRNode]) -> \
             Tuple[Union[IRNode, Tuple[IRNode, ...]], bool]:
-        for function in ir_master.function_nodes:
-            if function.reads_scoreboard_value(self["var"]):
-                return super().optimized(ir_master, parent)
+        if ir_master.def_use.is_read(self["var"]):
+            return super().optimized(ir_master, parent)
 
-        # if this node is never read, completely drop it
-        # ToDo: Also remove nodes outside of parent
+        # if this node is never read, completely drop it.
+        # Operations on the value in other blocks drop themselves, see `FastVarOperationNode.optimized`
         for node in parent.inner_nodes:
             if isinstance(node, (FastVarOperationNode, InvertNode)):
                 writes = node.written_scoreboard_values()
                 if len(writes) == 1 and writes[0] == self["var"]:
                     parent.discarded_inner_nodes.append(node)
+                    ir_master.def_use.remove(node)
 
+        ir_master.def_use.remove(self)
         return (), True
 
 
@@ -300,10 +303,10 @@ class StoreFastVarFromResultNode(IRNode):
 
     def optimized(self, ir_master: IrMaster, parent: Optional[IRNode]) -> \
             Tuple[Union[IRNode, Tuple[IRNode, ...]], bool]:
-        for function in ir_master.function_nodes:
-            if function.reads_scoreboard_value(self["var"]):
-                return super().optimized(ir_master, parent)
+        if ir_master.def_use.is_read(self["var"]):
+            return super().optimized(ir_master, parent)
 
+        ir_master.def_use.remove(self)
         return (), True
 
 
@@ -346,6 +349,15 @@ class FastVarOperationNode(IRNode):
     def written_scoreboard_values(self) -> List[ScoreboardValue]:
         return [self["var"]]
 
+    def optimized(self, ir_master: IrMaster, parent: Optional[IRNode]) -> \
+            Tuple[Union[IRNode, Tuple[IRNode, ...]], bool]:
+        # the inner nodes run before the operation and may be needed
+        if self.inner_nodes or ir_master.def_use.is_read(self["var"], self):
+            return super().optimized(ir_master, parent)
+
+        ir_master.def_use.remove(self)
+        return (), True
+
 
 ####
 class InvertNode(IRNode):
@@ -362,6 +374,14 @@ class InvertNode(IRNode):
     def written_scoreboard_values(self) -> List[ScoreboardValue]:
         return [self["target"]]
 
+    def optimized(self, ir_master: IrMaster, parent: Optional[IRNode]) -> \
+            Tuple[Union[IRNode, Tuple[IRNode, ...]], bool]:
+        if ir_master.def_use.is_read(self["target"], self):
+            return super().optimized(ir_master, parent)
+
+        ir_master.def_use.remove(self)
+        return (), True
+
 
 ####
 
@@ -369,6 +389,8 @@ class InvertNode(IRNode):
 class MessageNode(IRNode):
     """
     Json message. The default selector is @s.
+    The message is kept as json text components, which reference the scores they display,
+    and only serialized by the backend.
     """
 
     class MessageType(Enum):
@@ -377,15 +399,14 @@ class MessageNode(IRNode):
         SUBTITLE = auto()
         ACTIONBAR = auto()
 
-    def __init__(self, msg_type: MessageType, msg: str, selector: Selector = None):
+    def __init__(self, msg_type: MessageType, msg: JsonText, selector: Selector = None):
         super().__init__()
         self["type"] = msg_type
         self["msg"] = msg
-        self["selector"] = selector or Selector("s", [])
+        self["selector"] = selector or Selector("s", ())
 
-    # AHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHHH
-    def reads_scoreboard_value(self, scoreboard_value: ScoreboardValue) -> bool:
-        return scoreboard_value.value in self["msg"]
+    def read_scoreboard_values(self) -> List[ScoreboardValue]:
+        return [i for i in references(self["msg"]) if isinstance(i, ScoreboardValue)]
 
 
 class CommandNode(IRNode):
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import List, Tuple, TYPE_CHECKING
+
+from mcscript.ir.IrMaster import IrMaster
+from mcscript.ir.components import FunctionCallNode, FunctionNode
+
+if TYPE_CHECKING:
+    from mcscript.data.Config import Config
+
+
+def link(config: Config, modules: List[Tuple[str, IrMaster]]) -> IrMaster:
+    """
+    Merges the separately compiled modules of a project into a single ir master.
+
+    Every module is compiled with its own prefix for function names, scores and storage paths (see `Config.for_module`),
+    so the only references between modules are their entry points.
+    The linked ir gets a new main (and tick) function that runs the main (and tick) function of every module
+    in the order of `modules`.
+
+    Args:
+        config: the config of the project
+        modules: the module names and the ir of each module
+
+    Returns:
+        The linked ir master
+
+    Raises:
+        ValueError: if two modules define a function with the same name
+    """
+    ir_master = IrMaster()
+    main_calls = []
+    tick_calls = []
+
+    for module, module_ir in modules:
+        module_config = config.for_module(module)
+        main_name = module_config.resource_specifier_main("main")
+        tick_name = module_config.resource_specifier_main("tick")
+
+        for function in module_ir.function_nodes:
+            if function["name"] == main_name:
+                main_calls.append(FunctionCallNode(function))
+            elif function["name"] == tick_name:
+                tick_calls.append(FunctionCallNode(function))
+            ir_master.add_function(function)
+
+        for scoreboard in module_ir.scoreboards:
+            if scoreboard not in ir_master.scoreboards:
+                ir_master.scoreboards.append(scoreboard)
+
+    ir_master.add_function(FunctionNode(config.resource_specifier_main("main"), main_calls))
+    if tick_calls:
+        ir_master.add_function(FunctionNode(config.resource_specifier_main("tick"), tick_calls))
+
+    names = set()
+    for function in ir_master.function_nodes:
+        if function["name"] in names:
+            raise ValueError(f"Function {function['name']} is defined by multiple modules")
+        names.add(function["name"])
+
+    return ir_master
@@ -44,6 +44,7 @@ class ArithmeticOptimizer(Optimizer):
                 could_optimize = True
                 while could_optimize:
                     could_optimize = self.optimize_function(function.inner_nodes)
+                    self.rewrites += bool(could_optimize)
 
     def optimize_function(self, nodes: List[IRNode]) -> bool:
         """ Optimizes the nodes in a function. Returns true if an optimization could be made"""
@@ -64,5 +64,6 @@ class ConditionOptimizer(Optimizer):
                         current["condition"]["conditions"] = \
                             conditions[:index] + original_condition["conditions"] + conditions[index + 1:]
                         could_optimize = True
+                        self.rewrites += 1
 
         return could_optimize
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import copy
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from mcscript import Logger
+from mcscript.ir import IRNode, IrNodeMetadata
+from mcscript.ir.components import CommandNode, ConditionalNode, ExecuteNode, FunctionCallNode, FunctionNode, IfNode
+from mcscript.ir.optimize.Optimizer import Optimizer
+
+# conditions that only read scores, so they have the same result before every inlined command
+_SCORE_CONDITIONS = (ConditionalNode.IfScore, ConditionalNode.IfScoreMatches, ConditionalNode.IfBool)
+
+# the backend recognizes these functions by their name
+_ENTRY_FUNCTIONS = ("main", "tick")
+
+
+@dataclass()
+class InlineCosts:
+    """
+    The weights of the cost model of the `Inliner`.
+    Everything is measured in commands that are executed when a call site runs once.
+    """
+    # the cost of a function call in addition to its own command, for the lookup of the function
+    call: float = 1
+    # the value of one mcfunction file less, which minecraft has to load on /reload
+    file: float = 1
+    # the cost of one more command in the datapack
+    size: float = 0.2
+    # how often a call under a condition is assumed to run
+    branch_probability: float = 0.5
+    # functions with more commands are never inlined
+    max_size: int = 8
+
+
+class _CallSite(NamedTuple):
+    """ A call which is a top level node of a function, either on its own or as the branch of an `IfNode` """
+    caller: FunctionNode
+    node: IRNode
+    callee: FunctionNode
+    # the condition of the if node, if any
+    condition: Optional[ConditionalNode]
+
+
+def command_count(node: IRNode) -> int:
+    """ The number of commands that the backend writes for a top level node """
+    if isinstance(node, (ExecuteNode, IfNode)):
+        return len(node.inner_nodes)
+    return 1
+
+
+def copy_node(node: IRNode, memo: Optional[Dict[int, Any]] = None) -> IRNode:
+    """
+    Copies the node and everything it contains, except for the functions that it calls.
+
+    Args:
+        node: the node
+        memo: the copies by the id of the original, so that shared nodes stay shared
+
+    Returns:
+        The copy
+    """
+    return _copy_value(node, {} if memo is None else memo)
+
+
+def _copy_value(value: Any, memo: Dict[int, Any]) -> Any:
+    if isinstance(value, FunctionNode):
+        return value
+    if isinstance(value, IRNode):
+        if id(value) not in memo:
+            new_node = copy.copy(value)
+            memo[id(value)] = new_node
+            new_node.metadata = IrNodeMetadata(value.metadata.index)
+            new_node.discarded_inner_nodes = []
+            new_node.data = {key: _copy_value(i, memo) for key, i in value.data.items()}
+            new_node.inner_nodes = [_copy_value(i, memo) for i in value.inner_nodes]
+            if isinstance(value, FunctionCallNode):
+                value["function"]["num_callers"] += 1
+        return memo[id(value)]
+    if isinstance(value, list):
+        return [_copy_value(i, memo) for i in value]
+    if isinstance(value, dict):
+        return {key: _copy_value(i, memo) for key, i in value.items()}
+    return value
+
+
+def _contained_nodes(node: IRNode) -> List[IRNode]:
+    """ The node, its inner nodes and the nodes in its data, except for called functions """
+    nodes = []
+    pending = [node]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, FunctionNode) and value is not node:
+            continue
+        if isinstance(value, IRNode):
+            nodes.append(value)
+            pending += value.inner_nodes
+            pending += value.data.values()
+        elif isinstance(value, list):
+            pending += value
+        elif isinstance(value, dict):
+            pending += value.values()
+    return nodes
+
+
+class Inliner(Optimizer):
+    """
+    Replaces calls of small functions by the commands of the function, if a cost model expects that this pays off.
+
+    `FunctionCallNode.optimized` already inlines functions with a single command or a single caller.
+    This pass inlines functions with more commands and callers:
+        * A call at the top level of a function is replaced by the commands of the called function.
+          This saves the call at runtime but adds commands to the datapack.
+        * A call in an if statement without else branch is replaced by an if statement for every command.
+          This is only done if the condition reads scores that the commands do not write, and if the commands
+          do not call other functions or run raw commands. Every command checks the condition again, so
+          this only pays off for very small functions.
+    Recursive functions and calls inside of other execute contexts (`as`, `at`, ...) are never inlined.
+    If every call of a function is inlined, the function gets dropped, which saves a file.
+
+    For every function, the pass inlines either the call sites that pay off on their own or all call sites,
+    whatever is worth more. The weights are given by `InlineCosts`.
+    Inlining never increases the expected number of commands that are executed.
+    Functions are visited before the functions that call them, so small call chains are inlined completely.
+    """
+
+    def __init__(self, node: FunctionNode, nodes: Dict[str, FunctionNode], costs: Optional[InlineCosts] = None):
+        super().__init__(node, nodes)
+        self.costs = costs or InlineCosts()
+        # the number of functions that were inlined at every call site and dropped
+        self.inlined_functions = 0
+
+    def optimize(self):
+        functions = [i for i in self.visit_top_functions() if not i["drop"]]
+
+        sites: Dict[int, List[_CallSite]] = {}
+        # the number of calls of every function, anywhere in the ir
+        references: Counter[int] = Counter()
+        calls: Dict[int, List[FunctionNode]] = {}
+        commands = []
+        for function in functions:
+            for node in function.inner_nodes:
+                site = self._call_site(function, node)
+                if site is not None:
+                    sites.setdefault(id(site.callee), []).append(site)
+
+            calls[id(function)] = []
+            for node in _contained_nodes(function):
+                if isinstance(node, FunctionCallNode):
+                    references[id(node["function"])] += 1
+                    calls[id(function)].append(node["function"])
+                elif isinstance(node, CommandNode):
+                    commands.append(node["cmd"])
+        commands = "\n".join(commands)
+
+        for callee in self._callees_first(functions, calls):
+            if id(callee) not in sites or not self._can_inline(callee, calls):
+                continue
+            # raw commands could call the function by its name
+            droppable = references[id(callee)] == len(sites[id(callee)]) and \
+                f"{callee['name'].base}:{callee['name'].path}" not in commands
+            self._inline_function(callee, sites[id(callee)], droppable)
+
+    def _call_site(self, caller: FunctionNode, node: IRNode) -> Optional[_CallSite]:
+        if isinstance(node, FunctionCallNode):
+            callee, condition = node["function"], None
+        elif isinstance(node, IfNode) and node.neg_branch is None and isinstance(node.pos_branch, FunctionCallNode):
+            callee, condition = node.pos_branch["function"], node["condition"]
+        else:
+            return None
+        if callee is caller:
+            return None
+        return _CallSite(caller, node, callee, condition)
+
+    def _can_inline(self, callee: FunctionNode, calls: Dict[int, List[FunctionNode]]) -> bool:
+        if callee is self.node or callee["name"].path in _ENTRY_FUNCTIONS:
+            return False
+        if sum(command_count(i) for i in callee.inner_nodes) > self.costs.max_size:
+            return False
+        return not self._is_recursive(callee, calls)
+
+    def _inline_function(self, callee: FunctionNode, sites: List[_CallSite], droppable: bool):
+        size = sum(command_count(i) for i in callee.inner_nodes)
+        costs = self.costs
+
+        # the commands that inlining saves at runtime and the total benefit, including the size of the datapack
+        savings: List[float] = []
+        benefits: List[float] = []
+        inlinable = []
+        for site in sites:
+            if site.condition is None:
+                saving = 1 + costs.call
+            elif self._can_inline_conditional(site):
+                saving = 1 + costs.branch_probability * (costs.call + size) - size
+            else:
+                continue
+            inlinable.append(site)
+            savings.append(saving)
+            benefits.append(saving - costs.size * (size - 1))
+
+        # either all sites that pay off on their own or every site, which saves the function
+        single = [index for index, benefit in enumerate(benefits) if benefit > 0 and savings[index] >= 0]
+        plans = [(sum(benefits[i] for i in single), single, False)]
+        if droppable and len(inlinable) == len(sites) and sum(savings) >= 0:
+            plans.append((sum(benefits) + costs.file + costs.size * size, list(range(len(inlinable))), True))
+
+        benefit, indices, drop = max(plans, key=lambda plan: plan[0])
+        if benefit <= 0 or not indices:
+            return
+
+        for index in indices:
+            self._inline_site(inlinable[index])
+        if drop:
+            callee["drop"] = True
+            for node in _contained_nodes(callee):
+                if isinstance(node, FunctionCallNode):
+                    node["function"]["num_callers"] -= 1
+            self.inlined_functions += 1
+        Logger.debug(f"[Inliner] inlined {callee['name']} at {len(indices)} of {len(sites)} call sites")
+
+    def _can_inline_conditional(self, site: _CallSite) -> bool:
+        """ Whether every command of the called function can be run under the condition of the site """
+        conditions = site.condition["conditions"]
+        if not all(isinstance(i, _SCORE_CONDITIONS) for i in conditions):
+            return False
+
+        values = site.condition.read_scoreboard_values()
+        for node in site.callee.inner_nodes:
+            if command_count(node) != 1 or not node.allow_inline_optimization():
+                return False
+            if any(isinstance(i, (FunctionCallNode, CommandNode)) for i in _contained_nodes(node)):
+                return False
+            if any(node.writes_scoreboard_value(value) for value in values):
+                return False
+        return True
+
+    def _inline_site(self, site: _CallSite):
+        if site.condition is None:
+            nodes = [copy_node(i) for i in site.callee.inner_nodes]
+        else:
+            nodes = [IfNode(copy_node(site.condition), copy_node(i)) for i in site.callee.inner_nodes]
+
+        index = next(index for index, node in enumerate(site.caller.inner_nodes) if node is site.node)
+        site.caller.inner_nodes[index:index + 1] = nodes
+        site.callee["num_callers"] -= 1
+        self.rewrites += 1
+
+    @staticmethod
+    def _callees_first(functions: List[FunctionNode], calls: Dict[int, List[FunctionNode]]) -> List[FunctionNode]:
+        """ Orders the functions so that a function comes after the functions it calls, except for cycles """
+        order = []
+        visited = set()
+        for function in functions:
+            if id(function) in visited:
+                continue
+            visited.add(id(function))
+            stack = [(function, iter(calls.get(id(function), ())))]
+            while stack:
+                current, pending = stack[-1]
+                called = next(pending, None)
+                if called is None:
+                    stack.pop()
+                    order.append(current)
+                elif id(called) not in visited and id(called) in calls:
+                    visited.add(id(called))
+                    stack.append((called, iter(calls[id(called)])))
+        return order
+
+    @staticmethod
+    def _is_recursive(function: FunctionNode, calls: Dict[int, List[FunctionNode]]) -> bool:
+        """ Whether the function can call itself """
+        visited = set()
+        pending = [function]
+        while pending:
+            current = pending.pop()
+            for called in calls.get(id(current), ()):
+                if called is function:
+                    return True
+                if id(called) not in visited:
+                    visited.add(id(called))
+                    pending.append(called)
+        return False
@@ -1,9 +1,16 @@
 from abc import abstractmethod, ABC
+from typing import Dict
 
 from mcscript.ir.NodeVisitor import NodeVisitor
+from mcscript.ir.components import FunctionNode
 
 
 class Optimizer(NodeVisitor, ABC):
+    def __init__(self, node: FunctionNode, nodes: Dict[str, FunctionNode]):
+        super().__init__(node, nodes)
+        # the number of rewrites that were made, see `PassManager`
+        self.rewrites = 0
+
     @abstractmethod
     def optimize(self):
         """
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TYPE_CHECKING
+
+from mcscript import Logger
+from mcscript.ir.components import FunctionNode
+from mcscript.ir.optimize.Inliner import InlineCosts, Inliner
+from mcscript.ir.optimize.Optimizer import Optimizer
+from mcscript.utils.profiler import profile
+
+if TYPE_CHECKING:
+    from mcscript.ir.IrMaster import IrMaster
+
+# runs a pass on all functions of the ir master, starting at the main function. Returns the number of rewrites
+OptimizationPass = Callable[["IrMaster", FunctionNode], int]
+
+MIN_LEVEL = 0
+MAX_LEVEL = 3
+
+
+@dataclass()
+class PassStatistics:
+    """ The accumulated statistics of all runs of a single pass """
+    runs: int = 0
+    rewrites: int = 0
+    # in seconds
+    time: float = 0
+
+
+def optimizer_pass(optimizer: Type[Optimizer], **kwargs: Any) -> OptimizationPass:
+    """ Creates a pass that runs the optimizer on all functions. `kwargs` are passed to the optimizer """
+
+    def run(ir_master: IrMaster, start_node: FunctionNode) -> int:
+        instance = optimizer(start_node, {i["name"]: i for i in ir_master.function_nodes}, **kwargs)
+        instance.optimize()
+        return instance.rewrites
+
+    return run
+
+
+class PassManager:
+    """
+    Runs the optimization passes of an optimization level.
+
+    The passes are run in the order in which they were added. This sequence is repeated until an iteration
+    makes no rewrites or until `max_iterations` is reached. Some passes must only run once the ir does not change
+    anymore, for example because they break assumptions of other passes. These are added as final passes.
+
+    The levels are:
+        0: no optimizations
+        1: a single simple optimization pass, which keeps the output close to the source
+        2: the simple passes, the inliner and the expensive passes once, then the scores of temporaries are reused
+        3: like level 2, but the passes are repeated until the ir does not change anymore
+    """
+
+    def __init__(self, max_iterations: int = 1):
+        self.max_iterations = max_iterations
+        self.passes: List[Tuple[str, OptimizationPass]] = []
+        self.final_passes: List[Tuple[str, OptimizationPass]] = []
+
+        # keyed by the name of the pass
+        self.statistics: Dict[str, PassStatistics] = {}
+        self.iterations = 0
+
+    @classmethod
+    def for_level(cls, level: int, max_iterations: int, inline_costs: Optional[InlineCosts] = None) -> PassManager:
+        """
+        Creates the pass manager of an optimization level
+
+        Args:
+            level: the optimization level, from `MIN_LEVEL` to `MAX_LEVEL`
+            max_iterations: the maximum number of iterations on level 3
+            inline_costs: the weights of the inliner or None for the default weights
+
+        Returns:
+            A pass manager with all passes of the level
+        """
+        # imported here, because the ir master uses the pass manager
+        from mcscript.ir.IrMaster import IrMaster
+        from mcscript.ir.optimize import OPTIMIZERS
+        from mcscript.ir.optimize.ScoreboardAllocator import ScoreboardAllocator
+
+        if not MIN_LEVEL <= level <= MAX_LEVEL:
+            raise ValueError(f"Invalid optimization level {level}, expected {MIN_LEVEL} to {MAX_LEVEL}")
+
+        manager = cls(max_iterations if level == 3 else 1)
+        if level >= 1:
+            manager.add_pass("simple optimization", IrMaster.simple_optimization)
+        if level >= 2:
+            manager.add_pass(Inliner.__name__, optimizer_pass(Inliner, costs=inline_costs))
+            for optimizer in OPTIMIZERS:
+                manager.add_pass(optimizer.__name__, optimizer_pass(optimizer))
+            manager.add_pass("simple optimization", IrMaster.simple_optimization)
+            # the other passes expect that every value is only written for a single purpose
+            manager.add_pass(ScoreboardAllocator.__name__, IrMaster.allocate_scores, final=True)
+        return manager
+
+    def add_pass(self, name: str, optimization_pass: OptimizationPass, final: bool = False):
+        """
+        Registers a pass. Passes with the same name share their statistics.
+
+        Args:
+            name: the name of the pass
+            optimization_pass: the pass
+            final: whether the pass runs once after all other passes reached a fixed point
+        """
+        (self.final_passes if final else self.passes).append((name, optimization_pass))
+
+    def run(self, ir_master: IrMaster, start_node: FunctionNode):
+        """ Runs all passes on the functions of the ir master """
+        while self.iterations < self.max_iterations and self.passes:
+            self.iterations += 1
+            rewrites = sum(self._run_pass(name, optimization_pass, ir_master, start_node)
+                           for name, optimization_pass in self.passes)
+            if not rewrites:
+                break
+        else:
+            if self.passes and self.max_iterations > 1:
+                Logger.debug(f"[PassManager] no fixed point after {self.iterations} iterations")
+
+        for name, optimization_pass in self.final_passes:
+            self._run_pass(name, optimization_pass, ir_master, start_node)
+
+    def _run_pass(self, name: str, optimization_pass: OptimizationPass, ir_master: IrMaster,
+                  start_node: FunctionNode) -> int:
+        statistics = self.statistics.setdefault(name, PassStatistics())
+        start_time = perf_counter()
+        with profile("pass", name):
+            rewrites = optimization_pass(ir_master, start_node)
+        statistics.time += perf_counter() - start_time
+        statistics.runs += 1
+        statistics.rewrites += rewrites
+        Logger.debug(f"[PassManager] {name}: {rewrites} rewrites")
+        return rewrites
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from typing import Dict, List, Set, Tuple
+
+from mcscript.ir import IRNode
+from mcscript.ir.components import CommandNode, FunctionNode, InvertNode, StoreFastVarFromResultNode, StoreFastVarNode
+from mcscript.ir.optimize.Optimizer import Optimizer
+from mcscript.utils.resources import ScoreboardValue
+
+
+class _References:
+    """ The scoreboard values, functions and raw commands that a node references, including its inner nodes """
+
+    def __init__(self, node: IRNode):
+        # keyed by the string of the scoreboard value
+        self.values: Dict[str, ScoreboardValue] = {}
+        self.calls: List[FunctionNode] = []
+        self.commands: List[str] = []
+        self._add_node(node)
+
+    def _add_node(self, node: IRNode):
+        if isinstance(node, CommandNode):
+            self.commands.append(node["cmd"])
+
+        for value in node.data.values():
+            self._add_value(value)
+        for child in node.inner_nodes:
+            self._add_node(child)
+
+    def _add_value(self, value):
+        if isinstance(value, ScoreboardValue):
+            self.values[str(value)] = value
+        elif isinstance(value, FunctionNode):
+            self.calls.append(value)
+        elif isinstance(value, IRNode):
+            self._add_node(value)
+        elif isinstance(value, list):
+            for i in value:
+                self._add_value(i)
+        elif isinstance(value, dict):
+            # the components of a message
+            for i in value.values():
+                self._add_value(i)
+
+
+def _is_assignment(node: IRNode, key: str) -> bool:
+    """ Whether the node overwrites the value `key` without reading it first """
+    if isinstance(node, StoreFastVarNode):
+        return str(node["var"]) == key and str(node["val"]) != key
+    if isinstance(node, StoreFastVarFromResultNode):
+        return str(node["var"]) == key and all(key not in _References(i).values for i in node.inner_nodes)
+    if isinstance(node, InvertNode):
+        return str(node["target"]) == key and str(node["val"]) != key
+    return False
+
+
+def _rename(node: IRNode, names: Dict[str, ScoreboardValue]):
+    """ Replaces the scoreboard values of the node and its inner nodes by their new names """
+    for key, value in node.data.items():
+        node.data[key] = _renamed(value, names)
+    for child in node.inner_nodes:
+        _rename(child, names)
+
+
+def _renamed(value, names: Dict[str, ScoreboardValue]):
+    if isinstance(value, ScoreboardValue):
+        return names.get(str(value), value)
+    if isinstance(value, FunctionNode):
+        return value
+    if isinstance(value, IRNode):
+        _rename(value, names)
+    elif isinstance(value, list):
+        return [_renamed(i, names) for i in value]
+    elif isinstance(value, dict):
+        return {key: _renamed(i, names) for key, i in value.items()}
+    return value
+
+
+class ScoreboardAllocator(Optimizer):
+    """
+    Reuses the scoreboard values of temporaries.
+
+    Every intermediate result gets a new scoreboard value (see `Context.expressionStack`), so a datapack creates a
+    score for every single one of them. Most of these values are only used by a few consecutive commands.
+    This pass computes the live range of every value that is local to a function and assigns the values with
+    non-overlapping live ranges to the same score, like a linear scan register allocator.
+
+    A value is local to a function if:
+        * No other function and no raw command references it
+        * It is assigned by a top level node of the function before it is read
+
+    The live range of a local value goes from its first to its last reference in the top level nodes of its function.
+    The nodes of a recursive function can call the function itself, which would overwrite its values,
+    so the values of those functions are not reused if they are alive during a function call.
+    """
+
+    def __init__(self, node: FunctionNode, nodes: Dict[str, FunctionNode]):
+        super().__init__(node, nodes)
+        # the number of local values and the number of scores that they were assigned to
+        self.local_values = 0
+        self.slots = 0
+
+    def optimize(self):
+        functions = list(self.visit_top_functions())
+        references = {id(function): [_References(i) for i in function.inner_nodes] for function in functions}
+
+        owners: Dict[str, Set[int]] = {}
+        commands = []
+        for function in functions:
+            for node_references in references[id(function)]:
+                for key in node_references.values:
+                    owners.setdefault(key, set()).add(id(function))
+                commands += node_references.commands
+        commands = "\n".join(commands)
+
+        for function in functions:
+            recursive = self._is_recursive(function, references)
+            names = self._allocate(function, references[id(function)], owners, commands, recursive)
+            if names:
+                _rename(function, names)
+                self.rewrites += len(names)
+
+    def _allocate(self, function: FunctionNode, references: List[_References], owners: Dict[str, Set[int]],
+                  commands: str, recursive: bool) -> Dict[str, ScoreboardValue]:
+        """ Returns the new name of every local value of the function whose score is reused """
+        live_ranges: Dict[str, Tuple[int, int]] = {}
+        for index, node_references in enumerate(references):
+            for key in node_references.values:
+                first, _ = live_ranges.get(key, (index, index))
+                live_ranges[key] = first, index
+
+        calls = [index for index, node_references in enumerate(references) if node_references.calls]
+        local_values: List[Tuple[int, int, ScoreboardValue]] = []
+        for key, (first, last) in live_ranges.items():
+            value = references[first].values[key]
+            if owners[key] != {id(function)} or value.value in commands:
+                continue
+            if not _is_assignment(function.inner_nodes[first], key):
+                continue
+            if recursive and any(first < index < last for index in calls):
+                continue
+            local_values.append((first, last, value))
+
+        # values on different scoreboards can not share a score
+        free: Dict[str, List[ScoreboardValue]] = {}
+        active: List[Tuple[int, int, ScoreboardValue]] = []
+        names: Dict[str, ScoreboardValue] = {}
+        for first, last, value in sorted(local_values, key=lambda x: x[0]):
+            while active and active[0][0] < first:
+                _, _, slot = heappop(active)
+                free.setdefault(slot.scoreboard.get_name(), []).append(slot)
+
+            slots = free.get(value.scoreboard.get_name(), None)
+            if slots:
+                slot = slots.pop()
+                names[str(value)] = slot
+            else:
+                slot = value
+                self.slots += 1
+            # the counter keeps the heap from comparing scoreboard values
+            heappush(active, (last, len(names) + self.slots, slot))
+
+        self.local_values += len(local_values)
+        return names
+
+    def _is_recursive(self, function: FunctionNode, references: Dict[int, List[_References]]) -> bool:
+        """ Whether the function can call itself """
+        visited = set()
+        pending = [function]
+        while pending:
+            current = pending.pop()
+            for node_references in references.get(id(current), ()):
+                for called in node_references.calls:
+                    if called is function:
+                        return True
+                    if id(called) not in visited:
+                        visited.add(id(called))
+                        pending.append(called)
+        return False
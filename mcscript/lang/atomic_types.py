@@ -15,6 +15,7 @@ The atomic types are:
     - Enum
     - Iterator
     - Struct
+    - Range
     - Object (custom type)
 """
 from mcscript.lang.Type import Type
@@ -48,6 +49,7 @@ List = _make_type("List")
 Enum = _make_type("Enum")
 Iterator = _make_type("Iterator")
 Struct = _make_type("Struct")
+Range = _make_type("Range")
 
 # All types, keyed by their mcscript name
 ATOMIC_TYPES = {val.name: val for val in globals().values() if isinstance(val, Type)}
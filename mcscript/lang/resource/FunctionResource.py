@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import Dict, List, TYPE_CHECKING
+from typing import Dict, List, NamedTuple, Optional, TYPE_CHECKING, Tuple
 
 from lark import Tree
 
 from mcscript.compiler.ContextType import ContextType
 from mcscript.exceptions.exceptions import McScriptInlineRecursionError
-from mcscript.ir.components import FunctionCallNode
+from mcscript.ir.components import FunctionCallNode, FunctionNode
 from mcscript.lang.Type import Type
 from mcscript.lang.atomic_types import Function
 from mcscript.lang.resource.NullResource import NullResource
@@ -18,6 +18,30 @@ if TYPE_CHECKING:
     from mcscript.lang.resource.StructObjectResource import StructObjectResource
 
 
+class Specialization(NamedTuple):
+    """ A function that was generated for the arguments of a call and can be called again """
+    function: FunctionNode
+    return_resource: Resource
+
+
+def copy_return_resource(compile_state: CompileState, resource: Resource) -> Resource:
+    """
+    Copies the resource that a generated function returned, since the next call of the function can overwrite it.
+
+    Args:
+        compile_state: the compile state
+        resource: the returned resource
+
+    Returns:
+        The new resource
+    """
+    if not isinstance(resource, ValueResource):
+        return resource
+    if resource.is_static:
+        return type(resource)(resource.static_value, None)
+    return type(resource)(None, resource.scoreboard_value).copy(compile_state.expressionStack.next(), compile_state)
+
+
 class FunctionResource(GenericFunctionResource):
     """
     A function which will execute at runtime
@@ -28,6 +52,9 @@ class FunctionResource(GenericFunctionResource):
         self.code = code
         self.name = name
 
+        # the generated functions, keyed by the fingerprints of the call, see `Fingerprinter.call_key`
+        self.specializations: Dict[Tuple, Specialization] = {}
+
     def make_method(self, self_object: StructObjectResource) -> MethodResource:
         return MethodResource(self_object, self)
 
@@ -36,15 +63,63 @@ class FunctionResource(GenericFunctionResource):
 
     def call(self, compile_state: CompileState, parameters: List[Resource],
              keyword_parameters: Dict[str, Resource]) -> Resource:
-        # ToDo: Check whether to use an already generated file
         if any(i is self.function_signature for i in compile_state.function_call_stack):
             raise McScriptInlineRecursionError(self.function_signature, compile_state)
 
         with compile_state.with_function(self.function_signature):
+            # calls with runtime arguments use a function that is only compiled once
+            runtime_functions = compile_state.runtime_functions
+            if runtime_functions is not None and runtime_functions.accepts(self, parameters):
+                return_value = runtime_functions.call(compile_state, self, parameters)
+                if return_value is not None:
+                    return return_value
             return self.generate_new(compile_state, parameters, keyword_parameters)
 
     def generate_new(self, compile_state: CompileState, parameters: List[Resource],
                      keyword_parameters: Dict[str, Resource]) -> Resource:
+        key = compile_state.fingerprinter.call_key(compile_state, self, parameters, True)
+        specialization = None if key is None else self.specializations.get(key, None)
+        if specialization is None:
+            side_effects = compile_state.fingerprinter.side_effects(compile_state)
+            block_function, return_value = self._generate_cached(compile_state, parameters)
+            specialization = self._specialization(compile_state, parameters, key, side_effects,
+                                                  Specialization(block_function, return_value))
+        else:
+            block_function, return_value = specialization
+
+        compile_state.ir.append(FunctionCallNode(block_function))
+        if specialization is None:
+            return return_value
+        return copy_return_resource(compile_state, return_value)
+
+    def _specialization(self, compile_state: CompileState, parameters: List[Resource], key: Optional[Tuple],
+                        side_effects: Tuple, specialization: Specialization) -> Optional[Specialization]:
+        """ Stores the generated function if it can be called again with the same fingerprints """
+        if key is None or not isinstance(specialization.return_resource, (ValueResource, NullResource)):
+            return None
+        # generating the function must not change anything outside of it, ie. store variables of the caller
+        if compile_state.fingerprinter.side_effects(compile_state) != side_effects or \
+                compile_state.fingerprinter.call_key(compile_state, self, parameters, True) != key:
+            return None
+
+        self.specializations[key] = specialization
+        compile_state.reusable_functions += 1
+        return specialization
+
+    def _generate_cached(self, compile_state: CompileState,
+                         parameters: List[Resource]) -> Tuple[FunctionNode, Resource]:
+        cache = compile_state.function_cache
+        recording = None if cache is None else cache.record(compile_state, self, parameters)
+        if recording is not None and (cached := cache.replay(compile_state, recording)) is not None:
+            return cached
+
+        block_function, return_value = self._generate_function(compile_state, parameters)
+        if recording is not None:
+            cache.store(compile_state, recording, self, parameters, return_value)
+        return block_function, return_value
+
+    def _generate_function(self, compile_state: CompileState,
+                           parameters: List[Resource]) -> Tuple[FunctionNode, Resource]:
         with compile_state.node_block(ContextType.FUNCTION, self.code.line, self.code.column) as block_function:
             for template, parameter in zip(self.function_signature.parameters, parameters):
                 compile_state.currentContext().add_var(template.name, parameter)
@@ -61,8 +136,7 @@ class FunctionResource(GenericFunctionResource):
             compile_state.compile_ast(self.code)
             return_value = compile_state.currentContext().return_resource or NullResource()
 
-        compile_state.ir.append(FunctionCallNode(block_function))
-        return return_value
+        return block_function, return_value
 
     def type(self) -> Type:
         return Function
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from mcscript.lang.Type import Type
+from mcscript.lang.atomic_types import Range
+from mcscript.lang.resource.IntegerResource import IntegerResource
+from mcscript.lang.resource.base.ResourceBase import Resource, IteratorResource
+
+if TYPE_CHECKING:
+    from mcscript.utils.JsonTextFormat.ResourceTextFormatter import ResourceTextFormatter
+    from mcscript.compiler.CompileState import CompileState
+
+
+class RangeResource(Resource):
+    """
+    The integers from `start` up to, but not including `stop`. Created by the builtin function `range`.
+    A range with static bounds can be iterated at compile time like a tuple.
+    For loops over large ranges or ranges with dynamic bounds count at runtime instead:
+
+    See Also:
+        :func:`mcscript.compiler.common.counter_loop`
+    """
+
+    class RangeIterator(IteratorResource):
+        def __init__(self, master: RangeResource):
+            self.value = master.start.static_value
+            self.stop = master.stop.static_value
+
+        def next(self) -> Optional[Resource]:
+            if self.value >= self.stop:
+                return None
+
+            self.value += 1
+            return IntegerResource(self.value - 1, None)
+
+    def __init__(self, start: IntegerResource, stop: IntegerResource):
+        super().__init__()
+
+        self.start = start
+        self.stop = stop
+
+    def type(self) -> Type:
+        return Range
+
+    def supports_scoreboard(self) -> bool:
+        return False
+
+    def supports_storage(self) -> bool:
+        return False
+
+    def to_json_text(self, compileState: CompileState, formatter: ResourceTextFormatter) -> List:
+        return formatter.createFromResources("range(", self.start, ", ", self.stop, ")")
+
+    def size(self) -> Optional[int]:
+        """ The number of elements or None if a bound is only known at runtime """
+        if not self.start.is_static or not self.stop.is_static:
+            return None
+        return max(0, self.stop.static_value - self.start.static_value)
+
+    def get_iterator(self, compileState: CompileState) -> IteratorResource:
+        if self.size() is None:
+            raise TypeError()
+        return self.RangeIterator(self)
+
+    def __str__(self):
+        return f"Range({self.start}, {self.stop})"
@@ -28,7 +28,7 @@ class SelectorResource(Resource):
             value = Selector.from_string(StringResource.StringFormatter().format(value, **replacements), compileState)
 
             value.verify(compileState)
-            value.sort()
+            value = value.sorted()
         else:
             value = Selector.from_string(value)
 
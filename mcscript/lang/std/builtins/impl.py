@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING, List
 
 from mcscript.data.selector.Selector import Selector
 from mcscript.exceptions.exceptions import McScriptUnexpectedTypeError
 from mcscript.ir.components import MessageNode, StoreFastVarFromResultNode, CommandNode, StoreFastVarNode
-from mcscript.lang.atomic_types import String, Any, Null, Int
+from mcscript.lang.atomic_types import String, Any, Null, Int, Range
 from mcscript.lang.resource.IntegerResource import IntegerResource
 from mcscript.lang.resource.MacroResource import MacroResource
 from mcscript.lang.resource.NullResource import NullResource
+from mcscript.lang.resource.RangeResource import RangeResource
 from mcscript.lang.resource.StringResource import StringResource
 from mcscript.lang.resource.base.ResourceBase import Resource, ValueResource
 from mcscript.lang.resource.base.functionSignature import FunctionParameter
@@ -43,7 +43,7 @@ def create_text_functions() -> List[MacroResource]:
         def function(compile_state: CompileState, string: StringResource, *parameters: Resource):
             compile_state.ir.append(MessageNode(
                 f_msg_type,
-                MarkupParser(compile_state).to_json_string(string.static_value, *parameters)
+                MarkupParser(compile_state).toJson(string.static_value, *parameters)
             ))
 
         return function
@@ -100,8 +100,8 @@ def set_score(compile_state: CompileState, scoreboard: StringResource, score: St
     # to prevent the node from getting optimized out
     compile_state.ir.append(MessageNode(
         MessageNode.MessageType.CHAT,
-        json.dumps([format_text("The test result is: "), format_score(scoreboard_value)]),
-        Selector("a", [])
+        [format_text("The test result is: "), format_score(scoreboard_value)],
+        Selector("a", ())
     ))
     return NullResource()
 
@@ -134,6 +134,22 @@ def execute(compile_state: CompileState, string: StringResource) -> NullResource
     return NullResource()
 
 
+@macro(
+    parameters=[
+        FunctionParameter("start", Int),
+        FunctionParameter("stop", Int)
+    ],
+    return_type=Range,
+    name="range"
+)
+def range_(compile_state: CompileState, start: IntegerResource, stop: IntegerResource) -> RangeResource:
+    """ The integers from start up to, but not including stop. Can be iterated with a for loop """
+    if not stop.is_static:
+        # the loop must not change its end
+        stop = stop.copy(compile_state.expressionStack.next(), compile_state)
+    return RangeResource(start, stop)
+
+
 # Pycharm cannot apply the type macro at type-check time (Which actually creates a MacroResource)
 # noinspection PyTypeChecker
 EXPORTS: List[MacroResource] = [
@@ -142,4 +158,5 @@ EXPORTS: List[MacroResource] = [
     set_score,
     evaluate,
     execute,
+    range_,
 ]
@@ -1,22 +1,22 @@
 from __future__ import annotations
 
 import difflib
-import json
-from typing import Dict, TYPE_CHECKING, List, Union, Tuple
+from typing import TYPE_CHECKING, List, Union, Tuple
 
 from lark import UnexpectedToken
-from lark.visitors import Interpreter
 
-from mcscript import Logger, get_json_markup_grammar
 from mcscript.exceptions.McScriptException import McScriptError
 from mcscript.exceptions.exceptions import McScriptInvalidMarkupError, McScriptArgumentError
 from mcscript.lang.resource.base.ResourceBase import Resource
+from mcscript.utils.JsonTextFormat.MarkupTemplate import (compile_template, Element, MarkupRule, Placeholder,
+                                                          TextElement)
 from mcscript.utils.JsonTextFormat.ResourceTextFormatter import ResourceTextFormatter
 from mcscript.utils.JsonTextFormat.objectFormatter import (format_bold, format_color, format_hover, format_italic,
                                                            format_obfuscated,
                                                            format_open_url, format_run_command, format_strike_through,
                                                            format_text, format_underlined)
-from mcscript.utils.utils import debug_log_text
+from mcscript.utils.JsonTextFormat.textComponents import serialize
+from mcscript.utils.profiler import profile
 
 if TYPE_CHECKING:
     from mcscript.compiler.CompileState import CompileState
@@ -34,47 +34,44 @@ RULE2ACTION = {
 }
 
 
-# ToDo: Transform the tree directly when it is created to save memory and time
-class MarkupParser(Interpreter):
+class MarkupParser:
+    """
+    Converts markup strings to the json text format of minecraft.
+    The markup strings are compiled to templates, see `compile_template`.
+    """
+
     def __init__(self, compileState: CompileState):
-        self.state: Dict = {}
         self.compileState = compileState
 
     def to_json_string(self, markup: str, *args: Resource) -> str:
-        result = self.toJson(markup, *args)
-        # if isinstance(result, list):
-        #     result =
-
-        # Why is escaping so annoying?
-        return json.dumps(result).replace("\\\\", "\\")
+        return serialize(self.toJson(markup, *args))
 
     def toJson(self, markup: str, *args: Resource) -> List[dict]:
         """
-        Converts a markup string to a minecraft json format string.
+        Converts a markup string to the components of a minecraft json text.
 
         Args:
             markup: the markup string
             *args: resources to insert into the placeholders
 
         Returns:
-            A json string
+            A list of components, which reference the displayed scores and nbt paths
         """
-        self.state = dict(args=args, used_placeholders=set())
+        with profile("markup", "MarkupParser"):
+            return self._to_json(markup, *args)
+
+    def _to_json(self, markup: str, *args: Resource) -> List[dict]:
         try:
-            Logger.debug(f"[MarkupParser] parsing '{markup}'")
-            tree = get_json_markup_grammar().parse(markup)
-            debug_log_text(tree.pretty(), "Parse tree: ")
-            data = self.visit(tree)
+            template = compile_template(markup)
         except UnexpectedToken as e:
             raise McScriptInvalidMarkupError(f"\nFailed to parse Markup string:\n"
                                              f"{e.get_context(markup, span=len(markup))}"
                                              f"Unexpected token: {e.token.type}('{e.token}')\n"
                                              f"Expected one of {e.expected}", self.compileState)
 
-        all_args = set(range(len(args)))
-        for used_arg in self.state["used_placeholders"]:
-            all_args.remove(used_arg)
+        data = [self.fill(element, args) for element in template.elements]
 
+        all_args = set(range(len(args))) - template.placeholders
         if all_args:
             raise McScriptArgumentError(f"Not all arguments were used!\nunused indices: "
                                         f"{', '.join(str(i) for i in all_args)}", self.compileState)
@@ -82,6 +79,14 @@ class MarkupParser(Interpreter):
         # remove duplicate text elements
         return self.compact_data(data)
 
+    def fill(self, element: Element, args: Tuple[Resource, ...]) -> Union[list, dict]:
+        """ Formats an element of a template, where placeholders are replaced by the formatted arguments """
+        if isinstance(element, TextElement):
+            return element.data
+        if isinstance(element, Placeholder):
+            return self.placeholder(element.index, args)
+        return self.markup_rule(element, args)
+
     @classmethod
     def compact_data(cls, data: List[Union[list, dict]]) -> List[Union[list, dict]]:
         result, rest = cls._compact_data(data)
@@ -107,35 +112,22 @@ class MarkupParser(Interpreter):
 
         return compacted_data, current_text
 
-    def string(self, tree):
-        string, = tree.children
-        return format_text(str(string).replace("\\[", "[").replace("\\]", "]"))
-
-    def placeholder(self, tree):
-        number, = tree.children
-        if number is None:
-            number = self.state.get("auto_index", 0)
-            self.state["auto_index"] = number + 1
-        else:
-            number = int(number)
-
-        self.state["used_placeholders"].add(number)
-
+    def placeholder(self, number: int, args: Tuple[Resource, ...]) -> Union[list, dict]:
         try:
-            resource = self.state["args"][number]
+            resource = args[number]
             return ResourceTextFormatter(self.compileState).createFromResource(resource)
         except IndexError:
             raise McScriptArgumentError(
                 f"Invalid number of arguments, requires at least {number + 1} "
-                f"but got {len(self.state['args'])}", self.compileState
+                f"but got {len(args)}", self.compileState
             ) from None
 
-    def markup_rule(self, tree):
-        rule, value, *content = tree.children
+    def markup_rule(self, element: MarkupRule, args: Tuple[Resource, ...]) -> Union[list, dict]:
+        rule, value = element.rule, element.value
 
         ret = []
-        for i in content:
-            data = self.visit(i)
+        for i in element.content:
+            data = self.fill(i, args)
             ret.append(data)
 
         # if ret contains only one element, we can directly format on that
@@ -0,0 +1,96 @@
+"""
+Markup strings compiled into templates, see `MarkupParser`.
+
+Messages often use the same markup string in many places, for example inside of an unrolled for loop.
+Every distinct markup string is only parsed once. The template keeps the text and the markup rules of the string
+and contains a slot for every placeholder, which is filled with the formatted argument when the template is used.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from logging import DEBUG
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+
+from lark import Tree
+from lark.visitors import Interpreter
+
+from mcscript import Logger, get_json_markup_grammar
+from mcscript.utils.JsonTextFormat.objectFormatter import format_text
+from mcscript.utils.utils import debug_log_text
+
+# the number of compiled markup strings that are kept
+MARKUP_CACHE_SIZE = 1024
+
+
+class TextElement(NamedTuple):
+    # the formatted text, which is shared by every use of the template and must not be modified
+    data: Dict
+
+
+class Placeholder(NamedTuple):
+    # the index of the argument
+    index: int
+
+
+class MarkupRule(NamedTuple):
+    rule: str
+    value: Optional[str]
+    content: Tuple[Element, ...]
+
+
+Element = Union[TextElement, Placeholder, MarkupRule]
+
+
+class MarkupTemplate(NamedTuple):
+    elements: Tuple[Element, ...]
+    # the indices of all arguments that are used by a placeholder
+    placeholders: FrozenSet[int]
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def compile_template(markup: str) -> MarkupTemplate:
+    """
+    Parses a markup string into a template.
+
+    Args:
+        markup: the markup string
+
+    Returns:
+        The template, which is cached for the same markup string
+
+    Raises:
+        UnexpectedToken: if the markup string is invalid
+    """
+    tree = get_json_markup_grammar().parse(markup)
+    if Logger.isEnabledFor(DEBUG):
+        debug_log_text(tree.pretty(), f"[MarkupParser] parse tree of '{markup}': ")
+
+    compiler = _TemplateCompiler()
+    elements = tuple(compiler.visit_children(tree))
+    return MarkupTemplate(elements, frozenset(compiler.placeholders))
+
+
+class _TemplateCompiler(Interpreter):
+    def __init__(self):
+        self.auto_index = 0
+        self.placeholders = set()
+
+    def string(self, tree: Tree) -> TextElement:
+        string, = tree.children
+        return TextElement(format_text(str(string).replace("\\[", "[").replace("\\]", "]")))
+
+    def placeholder(self, tree: Tree) -> Placeholder:
+        number, = tree.children
+        if number is None:
+            number = self.auto_index
+            self.auto_index = number + 1
+        else:
+            number = int(number)
+
+        self.placeholders.add(number)
+        return Placeholder(number)
+
+    def markup_rule(self, tree: Tree) -> MarkupRule:
+        rule, value, *content = tree.children
+        elements: List[Element] = [self.visit(i) for i in content]
+        return MarkupRule(str(rule), None if value is None else str(value), tuple(elements))
@@ -9,19 +9,12 @@ def format_text(text: str) -> Dict:
 
 
 def format_score(scoreboard_value: ScoreboardValue) -> Dict:
-    return {
-        "score": {
-            "name": scoreboard_value.value,
-            "objective": scoreboard_value.scoreboard.get_name()
-        }
-    }
+    # the reference is kept until the text is serialized, see textComponents.serialize
+    return {"score": scoreboard_value}
 
 
 def format_nbt(path: DataPath, interpret: bool = False) -> Dict:
-    ret = {
-        "nbt": f"{path.dotted_path()}",
-        "storage": f"{path.storage}"
-    }
+    ret = {"nbt": path}
     if interpret:
         ret["interpret"] = True
 
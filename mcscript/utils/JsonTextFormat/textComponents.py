@@ -0,0 +1,85 @@
+"""
+Json text components with explicit references.
+
+The formatters in `objectFormatter` keep the scoreboard values and data paths which a component displays,
+so that the ir knows exactly which scores a message reads and can rename them.
+The components are converted to the json text format of minecraft by the backend, see `serialize`.
+"""
+from __future__ import annotations
+
+import json
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+
+from mcscript.utils.resources import DataPath, ScoreboardValue
+
+# a list of components, a single component or a plain string
+JsonText = Union[List, Dict, str]
+Reference = Union[ScoreboardValue, DataPath]
+
+
+def references(text: JsonText) -> Iterator[Reference]:
+    """ Yields every scoreboard value and data path that the text displays """
+    if isinstance(text, (ScoreboardValue, DataPath)):
+        yield text
+    elif isinstance(text, dict):
+        for value in text.values():
+            yield from references(value)
+    elif isinstance(text, list):
+        for value in text:
+            yield from references(value)
+
+
+def map_references(text: JsonText, function: Callable[[Reference], Reference]) -> JsonText:
+    """ Returns a copy of the text where every scoreboard value and data path is replaced by `function` """
+    if isinstance(text, (ScoreboardValue, DataPath)):
+        return function(text)
+    if isinstance(text, dict):
+        return {key: map_references(value, function) for key, value in text.items()}
+    if isinstance(text, list):
+        return [map_references(value, function) for value in text]
+    return text
+
+
+def freeze(text: JsonText) -> Tuple:
+    """ Returns a hashable key of the text. Texts with the same key are serialized to the same string """
+    if isinstance(text, ScoreboardValue):
+        return "score", str(text)
+    if isinstance(text, DataPath):
+        return "nbt", str(text.storage), tuple(text.path)
+    if isinstance(text, dict):
+        return ("dict",) + tuple((key, freeze(value)) for key, value in text.items())
+    if isinstance(text, list):
+        return ("list",) + tuple(freeze(value) for value in text)
+    return "value", text
+
+
+def serialize(text: JsonText) -> str:
+    """
+    Converts the text to the json text format of minecraft.
+
+    Args:
+        text: the components
+
+    Returns:
+        A json string
+    """
+    # Why is escaping so annoying?
+    return json.dumps(_resolve(text)).replace("\\\\", "\\")
+
+
+def _resolve(text: JsonText) -> JsonText:
+    """ Writes the references as the json objects that minecraft expects """
+    if isinstance(text, dict):
+        resolved = {}
+        for key, value in text.items():
+            if key == "score" and isinstance(value, ScoreboardValue):
+                resolved[key] = {"name": value.value, "objective": value.scoreboard.get_name()}
+            elif key == "nbt" and isinstance(value, DataPath):
+                resolved[key] = value.dotted_path()
+                resolved["storage"] = str(value.storage)
+            else:
+                resolved[key] = _resolve(value)
+        return resolved
+    if isinstance(text, list):
+        return [_resolve(value) for value in text]
+    return text
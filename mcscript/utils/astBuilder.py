@@ -0,0 +1,89 @@
+"""
+Builds a compact syntax tree while the lalr parser runs, instead of converting a lark tree afterwards.
+
+Lark creates a `Tree` and a separate `Meta` object for every rule of the parse. `AstNode` stores the positions in
+slots on the node itself, so a node takes a fraction of the memory. `AstBuilder` is passed to lark as the
+transformer of the parser and collapses rules that only wrap a single other node.
+"""
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import List, Union
+
+from lark import Token, Transformer, Tree
+
+# the rules which a statement can consist of, besides an expression
+STATEMENT_RULES = frozenset((
+    "declaration", "multi_declaration", "variable_update", "index_setter", "operation_ip", "function_definition",
+    "control_while", "control_do_while", "control_for", "control_enum", "control_struct", "context_manipulator"
+))
+
+# the positions which lark assigns to a node, see `lark.parse_tree_builder.PropagatePositions`
+_POSITIONS = ("line", "column", "start_pos", "end_line", "end_column", "end_pos",
+              "container_line", "container_column", "container_end_line", "container_end_column")
+
+
+class AstNode(Tree):
+    """
+    A node of the syntax tree. It can be used like a lark tree and is created by lark if it is passed as `tree_class`.
+
+    Lark assigns the positions of a node while it is parsed (`propagate_positions`) by setting the attributes of
+    `node.meta`, so the meta of a node is the node itself. A position is missing until it was set.
+    """
+    __slots__ = ("data", "children") + _POSITIONS
+
+    # noinspection PyMissingConstructor
+    def __init__(self, data: str, children: List[Union[AstNode, Token]], meta=None):
+        self.data = data
+        self.children = children
+        if meta is not None:
+            for name in _POSITIONS:
+                if hasattr(meta, name):
+                    setattr(self, name, getattr(meta, name))
+
+    @property
+    def meta(self) -> AstNode:
+        return self
+
+    @property
+    def empty(self) -> bool:
+        return not hasattr(self, "line")
+
+    @empty.setter
+    def empty(self, value: bool):
+        # derived from the positions
+        pass
+
+    def __deepcopy__(self, memo) -> AstNode:
+        return AstNode(self.data, deepcopy(self.children, memo), self)
+
+    def __reduce__(self):
+        return AstNode, (self.data, self.children, _Positions(self))
+
+
+class _Positions:
+    """ Stores the positions of a node for pickling """
+
+    def __init__(self, node: AstNode):
+        for name in _POSITIONS:
+            if hasattr(node, name):
+                setattr(self, name, getattr(node, name))
+
+
+class AstBuilder(Transformer):
+    """
+    Collapses the rules which only wrap another node. Lark calls these methods with the children of the rule
+    as soon as the rule was parsed. All other rules create an `AstNode`.
+
+    An `expression` is always replaced by its only child. A `term` is only kept if it contains an operation,
+    ie. its child is a sum or a product.
+    """
+
+    def expression(self, children: list):
+        return children[0]
+
+    def term(self, children: list):
+        child = children[0]
+        if isinstance(child, Tree) and child.data in ("sum", "product"):
+            return AstNode("term", children)
+        return child
@@ -7,7 +7,7 @@ import sys
 from os import getenv, listdir, mkdir
 from os.path import abspath, dirname, exists, expanduser, isdir, isfile, join, normpath
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from nbt.nbt import NBTFile
 
@@ -29,18 +29,22 @@ else:  # try to load the linux path
 MINIMUM_VERSION = 2225
 
 
-def generate_datapack(config: Config, datapack: Datapack):
+def generate_datapack(config: Config, datapack: Datapack, only_changed: bool = False) -> List[Path]:
     """
     Saves the datapack for `world`.
 
     Parameters:
         config: the configuration
         datapack: the 'Datapack' object
+        only_changed: whether to skip files that already exist with the same content
+
+    Returns:
+        The paths of all files that were written
     """
     if config.world is not None and not config.world.satisfiesVersion(MINIMUM_VERSION):
         Logger.Error(
             f"[WriteFiles] #### Warning: World {config.world.levelName} is below the minimum supported version. ####")
-    datapack.write(Path(config.output_dir))
+    return datapack.write(Path(config.output_dir), only_changed)
 
 
 def getWorlds(path=MCPATH) -> Iterator[MCWorld]:
@@ -118,3 +122,32 @@ class MCWorld:
 
     def __repr__(self):
         return f"MCWorld({self.levelName})"
+
+
+class SourceWatcher:
+    """
+    Polls the files of a directory to find out which ones were created, modified or deleted.
+    """
+
+    def __init__(self, directory: Path, patterns: Tuple[str, ...]):
+        self.directory = directory
+        self.patterns = patterns
+        self.state = self._snapshot()
+
+    def changed(self) -> List[Path]:
+        """ Returns all matching files that changed since the last call """
+        state = self._snapshot()
+        changed = [path for path in state.keys() | self.state.keys() if state.get(path) != self.state.get(path)]
+        self.state = state
+        return changed
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        state = {}
+        for pattern in self.patterns:
+            for path in self.directory.rglob(pattern):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
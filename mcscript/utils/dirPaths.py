@@ -1,20 +1,39 @@
+"""
+The directories in which mcscript stores its data.
+
+The directories are only created when they are used, so importing mcscript does not touch the file system.
+"""
 from os import makedirs
 from os.path import join
 
-import click
-
 APP_NAME = "McScript"
-ASSET_DIRECTORY = join(click.get_app_dir(APP_NAME, roaming=False), "assets")
-makedirs(ASSET_DIRECTORY, exist_ok=True)
 
-LOG_DIRECTORY = join(click.get_app_dir(APP_NAME, roaming=True), "logs")
-makedirs(LOG_DIRECTORY, exist_ok=True)
 
-VERSION_DIR = join(ASSET_DIRECTORY, "versions")
+def get_app_dir(roaming: bool) -> str:
+    # click is only needed to find the directory
+    import click
+    return click.get_app_dir(APP_NAME, roaming=roaming)
+
+
+def getAssetDir() -> str:
+    path = join(get_app_dir(False), "assets")
+    makedirs(path, exist_ok=True)
+    return path
+
+
+def getLogDir() -> str:
+    path = join(get_app_dir(True), "logs")
+    makedirs(path, exist_ok=True)
+    return path
+
+
+def getGrammarCacheDir() -> str:
+    """ Built parsers, see `mcscript.utils.grammarCache`. Created when the first parser is written. """
+    return join(get_app_dir(False), "assets", "grammars")
 
 
 def getVersionDir(version: str) -> str:
     """ A dir for assets for the different minecraft versions """
-    path = join(VERSION_DIR, version)
+    path = join(getAssetDir(), "versions", version)
     makedirs(path, exist_ok=True)
     return path
@@ -0,0 +1,67 @@
+"""
+Writes the intermediate results of the compile stages (ie. the parse tree or the ir) to files, for debugging.
+
+Dumps are only written if a dumper is active. The text of a dump is created lazily by a callback,
+so instrumented code only pays for a single function call if no dumper is active.
+"""
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, TextIO
+
+_active_dumper: Optional[Dumper] = None
+
+
+def dump(stage: str, write: Callable[[TextIO], None]):
+    """
+    Writes a dump for `stage` if a dumper is active.
+
+    Args:
+        stage: the name of the stage, used for the file name
+        write: a callback which writes the dump to the given file
+    """
+    dumper = _active_dumper
+    if dumper is not None:
+        dumper.dump(stage, write)
+
+
+@contextmanager
+def dumping(dumper: Dumper) -> Iterator[Dumper]:
+    """ Activates `dumper` inside of this context """
+    global _active_dumper
+    previous = _active_dumper
+    _active_dumper = dumper
+    try:
+        yield dumper
+    finally:
+        _active_dumper = previous
+
+
+class Dumper:
+    """
+    Writes every dump to its own file in `directory`.
+    The files are numbered in the order in which they were written, ie. "01_source.txt", "02_parse_tree.txt".
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        # the paths of all written dumps
+        self.paths: List[Path] = []
+
+    def dump(self, stage: str, write: Callable[[TextIO], None]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = re.sub(r"\W+", "_", stage.lower()).strip("_")
+        path = self.directory.joinpath(f"{len(self.paths) + 1:02}_{name}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            write(f)
+        self.paths.append(path)
+
+
+def write_numbered_lines(text: str, file: TextIO):
+    """ Writes `text` and annotates each line with its line number """
+    lines = text.split("\n")
+    padding = len(str(len(lines)))
+    for index, line in enumerate(lines):
+        file.write(f"[{str(index + 1).zfill(padding)}] {line}\n")
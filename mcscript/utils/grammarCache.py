@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from importlib import resources
+from io import BytesIO
+from os.path import join
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO, Optional
+
+import lark
+from lark import Lark
+
+from mcscript.utils.dirPaths import getGrammarCacheDir
+
+# options which only change how the tree is built, they are not serialized and have to be passed when loading a parser
+TREE_BUILDER_OPTIONS = ("transformer", "tree_class")
+
+
+def grammar_cache_key(grammar: str, **options) -> str:
+    """
+    Computes the key under which a built parser is cached.
+
+    The key changes whenever the grammar text, the parser options or the installed lark version change,
+    so stale cache files are simply never read again.
+
+    Args:
+        grammar: the grammar text
+        **options: the options that are passed to `Lark`
+
+    Returns:
+        A hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    digest.update(lark.__version__.encode("utf-8"))
+    digest.update(repr(sorted(options.items())).encode("utf-8"))
+    digest.update(grammar.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def _load_parser(file: BinaryIO, tree_options: dict) -> Lark:
+    # `Lark.load` does not accept options. This is how lark loads the parsers of its own cache
+    return Lark.__new__(Lark)._load(file, **tree_options)
+
+
+def load_grammar(file_name: str, cache_dir: Optional[str] = None, **options) -> Lark:
+    """
+    Creates the parser for a grammar file of this package.
+
+    Building the parse tables of a lalr grammar is an expensive, fixed cost for every new process, so the built parser
+    is serialized into `cache_dir` and loaded from there when it is needed again.
+    Lark can only serialize lalr parsers, other parsers are always built from the grammar.
+    The tree builder options (see `TREE_BUILDER_OPTIONS`) are not part of the cache key, they are passed to the
+    loaded parser.
+
+    Args:
+        file_name: the name of the grammar file in the mcscript package
+        cache_dir: the directory which contains the cache files, defaults to `getGrammarCacheDir()`
+        **options: the options that are passed to `Lark`
+
+    Returns:
+        The parser
+    """
+    grammar = resources.read_text("mcscript", file_name)
+    if options.get("parser") != "lalr":
+        return Lark(grammar, **options)
+
+    tree_options = {key: options.pop(key) for key in TREE_BUILDER_OPTIONS if key in options}
+    cache_dir = cache_dir if cache_dir is not None else getGrammarCacheDir()
+    name = file_name.rsplit(".", 1)[0]
+    path = join(cache_dir, f"{name}-{grammar_cache_key(grammar, **options)}.lark")
+
+    try:
+        with open(path, "rb") as f:
+            return _load_parser(f, tree_options)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        from mcscript import Logger
+        Logger.warning(f"[GrammarCache] Could not load cached grammar {path}, rebuilding it: {e}")
+
+    serialized = BytesIO()
+    Lark(grammar, **options).save(serialized)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first, so concurrent processes never read a half written cache file
+        with NamedTemporaryFile("wb", dir=cache_dir, suffix=".tmp", delete=False) as f:
+            try:
+                f.write(serialized.getvalue())
+            except BaseException:
+                f.close()
+                os.remove(f.name)
+                raise
+        os.replace(f.name, path)
+    except OSError as e:
+        from mcscript import Logger
+        Logger.warning(f"[GrammarCache] Could not write grammar cache {path}: {e}")
+    serialized.seek(0)
+    return _load_parser(serialized, tree_options)
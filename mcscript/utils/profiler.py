@@ -0,0 +1,151 @@
+"""
+A simple profiler for the compiler.
+
+Timed sections are grouped by a category (ie. "stage", "rule" or "pass") and a name.
+If no profiler is active, instrumented code only pays for a single function call.
+"""
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import ContextManager, Dict, Iterator, List, Optional, Set, Tuple
+
+_active_profiler: Optional[Profiler] = None
+
+
+def active_profiler(category: str) -> Optional[Profiler]:
+    """ Returns the profiler which records sections of `category` right now, if any """
+    profiler = _active_profiler
+    if profiler is None or (profiler.categories is not None and category not in profiler.categories):
+        return None
+    return profiler
+
+
+def profile(category: str, name: str) -> ContextManager:
+    """ Times the code in this context if a profiler is active """
+    profiler = active_profiler(category)
+    return nullcontext() if profiler is None else profiler.section(category, name)
+
+
+@contextmanager
+def profiling(profiler: Profiler) -> Iterator[Profiler]:
+    """ Activates `profiler` inside of this context """
+    global _active_profiler
+    previous = _active_profiler
+    _active_profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active_profiler = previous
+
+
+@dataclass()
+class ProfileEntry:
+    category: str
+    name: str
+    calls: int = 0
+    # time in nanoseconds, including nested sections
+    total_time: int = 0
+    # time in nanoseconds, without nested sections
+    self_time: int = 0
+
+
+class Profiler:
+    """
+    Records timed sections, aggregates them by category and name and keeps every section for a chrome trace.
+
+    >>> profiler = Profiler()
+    >>> profiler.start("rule", "block")
+    >>> profiler.start("rule", "expression")
+    >>> profiler.stop()
+    >>> profiler.stop()
+    >>> profiler.entries["rule", "block"].calls
+    1
+    """
+
+    def __init__(self, categories: Optional[Set[str]] = None):
+        # the categories which are recorded or None to record everything
+        self.categories = categories
+        self.entries: Dict[Tuple[str, str], ProfileEntry] = {}
+        # (category, name, start, duration) of every finished section
+        self.events: List[Tuple[str, str, int, int]] = []
+
+        self._start_time = perf_counter_ns()
+        # [category, name, start, time of nested sections] of every running section
+        self._stack: List[list] = []
+
+    def start(self, category: str, name: str):
+        """ Starts a section. Sections must be stopped in reverse order. """
+        self._stack.append([category, name, perf_counter_ns(), 0])
+
+    def stop(self):
+        """ Stops the last started section """
+        end = perf_counter_ns()
+        category, name, start, nested_time = self._stack.pop()
+        duration = end - start
+        if self._stack:
+            self._stack[-1][3] += duration
+
+        entry = self.entries.get((category, name), None)
+        if entry is None:
+            entry = self.entries[category, name] = ProfileEntry(category, name)
+        entry.calls += 1
+        entry.total_time += duration
+        entry.self_time += duration - nested_time
+        self.events.append((category, name, start, duration))
+
+    @contextmanager
+    def section(self, category: str, name: str):
+        self.start(category, name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def report(self, limit: Optional[int] = None) -> str:
+        """
+        Creates a table of all sections, sorted by the time spent in each section without its nested sections.
+        The total time of recursive sections (ie. nested blocks) is counted for every level.
+
+        Args:
+            limit: the maximum number of rows
+
+        Returns:
+            The table as a string
+        """
+        entries = sorted(self.entries.values(), key=lambda e: e.self_time, reverse=True)[:limit]
+        measured = sum(i.self_time for i in self.entries.values()) or 1
+
+        lines = [f"{'category':<10}{'name':<40}{'calls':>10}{'self (ms)':>12}{'total (ms)':>12}{'self %':>9}"]
+        for entry in entries:
+            lines.append(
+                f"{entry.category:<10}{entry.name:<40}{entry.calls:>10}{entry.self_time / 1e6:>12.2f}"
+                f"{entry.total_time / 1e6:>12.2f}{entry.self_time / measured * 100:>8.1f}%"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """ Returns all sections in the chrome trace event format, which can be opened in chrome://tracing """
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._start_time) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": 0
+                }
+                for category, name, start, duration in self.events
+            ],
+            "displayTimeUnit": "ms"
+        }
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
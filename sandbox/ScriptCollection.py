@@ -172,6 +172,6 @@ if __name__ == '__main__':
     # code = getScript("mandelbrot")
     config.input_string = code
 
-    datapack = compileMcScript(config, lambda a, b, c: Logger.info(f"[compile] {a}: {round(b * 100, 2)}%"))
+    datapack, _ = compileMcScript(config, lambda a, b, c: Logger.info(f"[compile] {a}: {round(b * 100, 2)}%"))
     generate_datapack(config, datapack)
     rcon.send("reload")
@@ -0,0 +1,28 @@
+from mcscript import get_grammar
+from mcscript.analyzer.Analyzer import Analyzer
+
+
+def analyze(code: str):
+    _, contexts = Analyzer().analyze(get_grammar().parse(code))
+    return contexts
+
+
+def test_shadowed_variables():
+    contexts = analyze("let a = 1\nfun f(a: Int) {\n    a = 2\n}\na = 3\n")
+    inner, = (i for i in contexts.values() if i.definition != (0, 0))
+    assert [i.master_context for i in contexts[0, 0].variables["a"].writes] == [(0, 0)]
+    assert [i.master_context for i in inner.variables["a"].writes] == [inner.definition]
+
+
+def test_context_tree():
+    contexts = analyze("if 1 > 0 {\n    if 2 > 0 {\n        let a = 1\n    }\n}\nwhile 1 > 0 {\n    let b = 1\n}\n")
+    root = contexts[0, 0]
+    outer_if, inner_if, loop = sorted((i for i in contexts.values() if i is not root), key=lambda i: i.index)
+    assert inner_if.parent is outer_if and outer_if.parent is root and loop.parent is root
+    assert root.contains(inner_if) and outer_if.contains(inner_if)
+    assert not inner_if.contains(outer_if) and not outer_if.contains(loop)
+
+
+def test_method_call_in_parentheses():
+    contexts = analyze("let s = 1\nlet b = (s.f())\n")
+    assert len(contexts[0, 0].variables["s"].writes) == 1
@@ -0,0 +1,23 @@
+import json
+
+from mcscript.batch import compile_many, load_manifest
+
+
+def test_compile_many(tmp_path):
+    for i in range(3):
+        tmp_path.joinpath(f"v{i}.mcscript").write_text(f'let a = dyn({i})\nprint("v {{}}", a)\n')
+    tmp_path.joinpath("bad.mcscript").write_text("let = 1\n")
+
+    manifest = tmp_path.joinpath("manifest.json")
+    manifest.write_text(json.dumps(
+        [{"input": f"v{i}.mcscript", "output": f"out/v{i}", "name": f"v{i}"} for i in range(3)] +
+        [{"input": "bad.mcscript", "output": "out/bad"}]
+    ))
+    jobs = load_manifest(manifest)
+
+    results = {result.job.input.name: result for result in compile_many(jobs, 2)}
+    assert len(results) == 4
+    assert not results["bad.mcscript"].success
+    for i in range(3):
+        assert results[f"v{i}.mcscript"].success
+        assert tmp_path.joinpath(f"out/v{i}/data/v{i}/functions/main.mcfunction").exists()
@@ -0,0 +1,29 @@
+from mcscript.compile import compileMcScript
+from mcscript.data.Config import Config
+
+CODE = """
+fun add(x: Int) -> Int {
+    x + 1
+}
+let a = dyn(3)
+let b = add(a) * 7
+print("{}", b)
+"""
+
+
+def test_compile_report():
+    config = Config()
+    config.input_string = CODE
+    datapack, report = compileMcScript(config)
+
+    assert set(report.stage_times) == {"Parsing", "Analyzing context", "Compiling", "Optimizing",
+                                       "Running ir backend"}
+    assert report.nodes_before_optimize["FunctionNode"] >= report.nodes_after_optimize["FunctionNode"]
+    assert sum(report.nodes_after_optimize.values()) < sum(report.nodes_before_optimize.values())
+    assert len(report.dropped_functions) == report.nodes_before_optimize["FunctionNode"] - \
+        report.nodes_after_optimize["FunctionNode"]
+    assert 7 in report.constants
+    assert 0 < report.temporaries <= report.temporaries_before_allocation
+    # the print and the message of the load function
+    assert report.messages == 2
+    assert report.output_bytes == datapack.byte_size() > 0
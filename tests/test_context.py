@@ -0,0 +1,44 @@
+from mcscript.analyzer.VariableContext import NamespaceContext
+from mcscript.compiler.Context import Context
+from mcscript.compiler.ContextStack import ContextStack
+from mcscript.compiler.ContextType import ContextType
+from mcscript.lang.resource.IntegerResource import IntegerResource
+from mcscript.utils.Scoreboard import Scoreboard
+from mcscript.utils.resources import DataPath
+
+
+def push(stack: ContextStack) -> Context:
+    context = Context(stack.index(), (stack.index(), 0), ContextType.BLOCK, NamespaceContext({}, (0, 0)),
+                      Scoreboard("main", True, 0), DataPath("mcscript:main", ["state"]),
+                      stack.tail() if stack.stack else None)
+    stack.append(context)
+    return context
+
+
+def value(context: Context, name: str) -> int:
+    return context.find_resource(name).static_value
+
+
+def test_shadowed_variables():
+    stack = ContextStack()
+    root, inner = push(stack), push(stack)
+    inner.add_var("a", IntegerResource(2, None))
+    # added to a previous context after the inner context, like the enums
+    root.add_var("a", IntegerResource(1, None))
+    assert value(inner, "a") == 2 and value(root, "a") == 1
+
+    inner.set_var("a", IntegerResource(3, None))
+    stack.pop()
+    assert value(root, "a") == 1 and "a" in root
+    assert root.declarations["a"] == [root]
+
+
+def test_popped_context():
+    stack = ContextStack()
+    root, inner = push(stack), push(stack)
+    root.add_var("a", IntegerResource(1, None))
+    inner.add_var("b", IntegerResource(2, None))
+    stack.pop()
+    # the context of a struct is used after it was popped
+    assert value(inner, "a") == 1 and value(inner, "b") == 2
+    assert "b" not in root
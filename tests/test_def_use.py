@@ -0,0 +1,37 @@
+from mcscript.ir.IrMaster import IrMaster
+from mcscript.ir.command_components import BinaryOperator
+from mcscript.ir.components import (FastVarOperationNode, FunctionCallNode, FunctionNode, MessageNode,
+                                    StoreFastVarNode)
+from mcscript.utils.JsonTextFormat.objectFormatter import format_score
+from mcscript.utils.Scoreboard import Scoreboard
+from mcscript.utils.resources import Identifier, ResourceSpecifier, ScoreboardValue
+
+SCOREBOARD = Scoreboard("main", True, 0)
+
+
+def value(name: str) -> ScoreboardValue:
+    return ScoreboardValue(Identifier(name), SCOREBOARD)
+
+
+def test_dead_stores():
+    a, b = value(".a"), value(".b")
+    other = FunctionNode(ResourceSpecifier("test", "other"), [
+        FastVarOperationNode(a, 3, BinaryOperator.PLUS),
+        MessageNode(MessageNode.MessageType.CHAT, [format_score(b)])
+    ])
+    main = FunctionNode(ResourceSpecifier("test", "main"), [
+        StoreFastVarNode(a, 1),
+        StoreFastVarNode(b, 2),
+        FunctionCallNode(other),
+        FunctionCallNode(other)
+    ])
+
+    ir = IrMaster()
+    ir.add_function(main)
+    ir.add_function(other)
+    ir.optimize(main["name"])
+
+    # a is never read, so it is also removed from the other function
+    assert not any(i.writes_scoreboard_value(a) for i in ir.function_nodes)
+    assert main.writes_scoreboard_value(b)
+    assert not ir.def_use.is_read(a) and ir.def_use.is_read(b)
@@ -0,0 +1,19 @@
+from mcscript.compile import compileMcScript
+from mcscript.data.Config import Config
+from mcscript.utils.dumps import Dumper, dumping
+
+
+def test_dumps(tmp_path):
+    config = Config()
+    config.input_string = 'let a = dyn(3)\nprint("{}", a)\n'
+
+    compileMcScript(config)
+    assert not tmp_path.joinpath("dumps").exists()
+
+    with dumping(Dumper(tmp_path.joinpath("dumps"))) as dumper:
+        compileMcScript(config)
+
+    assert [i.name for i in dumper.paths] == ["01_source.txt", "02_parse_tree.txt", "03_ir.txt",
+                                              "04_optimized_ir.txt"]
+    assert dumper.paths[0].read_text().startswith("[1] let a = dyn(3)")
+    assert "FunctionNode" in dumper.paths[3].read_text()
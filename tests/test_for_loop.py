@@ -0,0 +1,35 @@
+from typing import Dict
+
+from mcscript.compile import compileMcScript
+from mcscript.data.Config import Config
+
+
+def compile_functions(code: str, unroll_limit: int = 32) -> Dict[str, int]:
+    """ Returns the number of commands per mcfunction file """
+    config = Config()
+    config.input_string = code
+    config.unroll_limit = unroll_limit
+    datapack = compileMcScript(config)[0]
+    files = datapack.getMainDirectory().getPath("functions").files.files
+    return {name: len(file.getvalue().splitlines()) for name, file in files.items()}
+
+
+CODE = """
+let sum = dyn(0)
+for i in range(1, 101) {
+    sum += i * 3
+}
+print("{}", sum)
+"""
+
+
+def test_runtime_loop():
+    functions = compile_functions(CODE)
+    # main, load and the loop
+    assert len(functions) == 3
+    assert sum(functions.values()) < 20
+
+
+def test_unrolled_loop():
+    # the unrolled iterations are static, so the optimizer can fold them into main
+    assert len(compile_functions(CODE, 100)) == 2
@@ -0,0 +1,52 @@
+from pathlib import Path
+from typing import Dict
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.compiler.FunctionCache import FunctionCache
+from mcscript.data.Config import Config
+
+CODE = """
+fun double(x: Int) -> Int {
+    let y = dyn(x) * 2
+    print("{} doubled is {}", x, y)
+    y
+}
+
+let a = double(2)
+actionbar("{}", a + double(3))
+"""
+
+# pushes a context and uses a temporary, so every generated name of the functions is shifted
+PREFIX = """
+let c = dyn(1)
+if (c == 1) {
+    c = 3
+    print("{}", c)
+}
+"""
+
+
+def compile_files(code: str, path: Path) -> Dict[str, str]:
+    config = Config()
+    config.input_string = code
+    files = compileMcScript(config)[0].write(path)
+    return {str(i.relative_to(path)): i.read_text() for i in files}
+
+
+def test_function_cache(tmp_path):
+    compiler = get_compiler()
+    cache = compiler.function_cache
+    compiler.function_cache = FunctionCache()
+    try:
+        compile_files(CODE, tmp_path / "first")
+        cached = compile_files(PREFIX + CODE, tmp_path / "cached")
+        assert compiler.function_cache.hits > 0
+
+        compiler.function_cache = FunctionCache()
+        fresh = compile_files(PREFIX + CODE, tmp_path / "fresh")
+        assert compiler.function_cache.hits == 0
+    finally:
+        compiler.function_cache = cache
+
+    assert cached == fresh
@@ -2,6 +2,7 @@ import pytest
 from lark.exceptions import LarkError
 
 from mcscript import get_grammar
+from mcscript.utils.grammarCache import load_grammar
 
 EXPECT_PASS = [
     """
@@ -236,3 +237,32 @@ def test_fail(sample):
     except LarkError:
         return True
     pytest.fail(f"Successfully parsed code that should fail")
+
+
+def test_grammar_cache(tmp_path):
+    options = dict(parser="lalr", propagate_positions=True, maybe_placeholders=True)
+    cold = load_grammar("McScript.lark", str(tmp_path), **options)
+    assert len(list(tmp_path.iterdir())) == 1
+    warm = load_grammar("McScript.lark", str(tmp_path), **options)
+
+    for sample in EXPECT_PASS:
+        assert cold.parse(sample) == warm.parse(sample)
+
+
+def _positions(tree, skip=lambda node: False):
+    return sorted(
+        (node.data, node.meta.line, node.meta.column, node.meta.end_line, node.meta.end_column)
+        for node in tree.iter_subtrees() if not node.meta.empty and not skip(node)
+    )
+
+
+def test_ast_positions():
+    lark_parser = load_grammar("McScript.lark", parser="lalr", propagate_positions=True, maybe_placeholders=True)
+
+    def collapsed(node):
+        return node.data == "expression" or node.data == "term" and node.children[0].data not in ("sum", "product")
+
+    for sample in EXPECT_PASS:
+        ast = get_grammar().parse(sample)
+        assert not any(collapsed(node) for node in ast.iter_subtrees())
+        assert _positions(ast) == _positions(lark_parser.parse(sample), collapsed)
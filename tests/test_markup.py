@@ -0,0 +1,18 @@
+from mcscript.utils.JsonTextFormat.MarkupTemplate import compile_template, MarkupRule, Placeholder, TextElement
+
+
+def test_template():
+    template = compile_template("[b]Hello {}[/] and {0} \\[{3}\\]")
+    assert template.elements == (
+        MarkupRule("b", None, (TextElement({"text": "Hello "}), Placeholder(0))),
+        TextElement({"text": " and "}),
+        Placeholder(0),
+        TextElement({"text": " ["}),
+        Placeholder(3),
+        TextElement({"text": "]"}),
+    )
+    assert template.placeholders == {0, 3}
+
+
+def test_template_cached():
+    assert compile_template("[color=red]{}[/]") is compile_template("[color=red]{}[/]")
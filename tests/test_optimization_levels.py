@@ -0,0 +1,49 @@
+import pytest
+
+from mcscript.compile import compileMcScript
+from mcscript.data.Config import Config
+from mcscript.ir.optimize.PassManager import PassManager
+
+CODE = """
+fun add(x: Int) -> Int {
+    x + 1
+}
+let a = dyn(3)
+let b = add(a) * 7
+if b > 10 {
+    b = b * 2 * 3
+}
+print("{}", b)
+"""
+
+
+def compile_level(level: int):
+    config = Config()
+    config.input_string = CODE
+    config.optimization_level = level
+    return compileMcScript(config)[1]
+
+
+def test_levels():
+    reports = [compile_level(level) for level in range(4)]
+
+    assert reports[0].passes == {} and reports[0].optimization_iterations == 0
+    assert reports[0].nodes_before_optimize == reports[0].nodes_after_optimize
+    assert set(reports[1].passes) == {"simple optimization"}
+    assert "ScoreboardAllocator" in reports[2].passes
+
+    sizes = [sum(i.nodes_after_optimize.values()) for i in reports]
+    assert sizes[0] > sizes[1] >= sizes[2] >= sizes[3]
+
+
+def test_fixed_point():
+    report = compile_level(3)
+    assert 1 <= report.optimization_iterations <= Config().optimization_iterations
+    # the simple pass runs twice in every iteration
+    assert report.passes["simple optimization"]["runs"] == 2 * report.optimization_iterations
+    assert report.passes["ArithmeticOptimizer"]["rewrites"] > 0
+
+
+def test_invalid_level():
+    with pytest.raises(ValueError):
+        PassManager.for_level(4, 1)
@@ -0,0 +1,41 @@
+from pathlib import Path
+from typing import Dict
+
+from mcscript.compile import compileMcScriptProject
+from mcscript.data.Config import Config
+
+MODULES = {
+    "main": """
+let a = dyn(3)
+print("main {}", a)
+
+fun on_tick() {
+    a += 1
+}
+""",
+    "utils/math": """
+fun square(x: Int) -> Int {
+    x * x
+}
+
+let a = dyn(4)
+print("square {}", square(a))
+"""
+}
+
+
+def compile_files(path: Path, max_workers: int) -> Dict[str, str]:
+    files = compileMcScriptProject(Config(), MODULES, max_workers).write(path)
+    return {i.relative_to(path).as_posix(): i.read_text() for i in files}
+
+
+def test_project(tmp_path):
+    files = compile_files(tmp_path / "parallel", 2)
+    assert files == compile_files(tmp_path / "serial", 1)
+
+    functions = "data/mcscript/functions"
+    assert files[f"{functions}/main.mcfunction"] == "function mcscript:main/main\nfunction mcscript:utils/math/main\n"
+    assert files[f"{functions}/tick.mcfunction"] == "function mcscript:main/tick\n"
+    # both modules have a variable `a`, which must not share the same score
+    assert ".main.exp1_0" in files[f"{functions}/main/main.mcfunction"]
+    assert ".utils-math.exp1_0" in files[f"{functions}/utils/math/main.mcfunction"]
@@ -0,0 +1,55 @@
+import re
+
+from mcscript import get_compiler
+from mcscript.compile import compileMcScript
+from mcscript.data.Config import Config
+
+
+def compile_main(code: str) -> str:
+    config = Config()
+    config.input_string = code
+    datapack = compileMcScript(config)[0]
+    return datapack.getMainDirectory().getPath("functions").files["main.mcfunction"].getvalue()
+
+
+def test_runtime_function():
+    main = compile_main("""
+fun square(x: Int) -> Int {
+    x * x
+}
+
+let a = dyn(3)
+print("{}", square(a) + square(a + 1) + square(2))
+""")
+    # the call with a static argument is still specialized
+    first, second = re.findall(r"^function (\S+)$", main, re.MULTILINE)
+    assert first == second
+
+
+def test_accessed_variables():
+    compile_main("""
+let b = 1
+fun add(x: Int) -> Int {
+    x + b
+}
+
+let a = dyn(3)
+print("{} {}", add(a), add(a))
+b = 2
+print("{}", add(a))
+""")
+    assert len(get_compiler().compileState.runtime_functions.functions) == 2
+
+
+def test_specialization():
+    main = compile_main("""
+fun square(x: Int) -> Int {
+    let y = dyn(x)
+    y * y
+}
+
+print("{} {} {}", square(2), square(2), square(3))
+""")
+    # the call with another argument is inlined by the optimizer
+    first, second = re.findall(r"^function (\S+)$", main, re.MULTILINE)
+    assert first == second
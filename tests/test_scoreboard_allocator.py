@@ -0,0 +1,21 @@
+import re
+
+from mcscript.compile import compileMcScript
+from mcscript.data.Config import Config
+
+CODE = """
+let a = dyn(2)
+let b = (a * 3 + 1) * (a * 5 + 2)
+let c = (b * 7 + 3) * (a * 9 + 4)
+print("{} {}", b, c)
+"""
+
+
+def test_reuse_temporaries():
+    config = Config()
+    config.input_string = CODE
+    datapack, report = compileMcScript(config)
+    main = datapack.getMainDirectory().getPath("functions").files["main.mcfunction"].getvalue()
+
+    assert report.temporaries < report.temporaries_before_allocation
+    assert len(set(re.findall(r"\.exp\w+", main))) == report.temporaries
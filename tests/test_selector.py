@@ -0,0 +1,38 @@
+import pytest
+
+from mcscript.data.selector.Selector import Selector
+from mcscript.data.selector.selectorData import Integer, Nbt, Range, String
+
+EXPECT_PASS = [
+    ("@s", "s", []),
+    ("@e[type=armor_stand]", "e", [("type", String("armor_stand"), False)]),
+    ("@a[tag=!marker, limit=5]", "a", [("tag", String("marker"), True), ("limit", Integer(5), False)]),
+    ("@a[level=1..5,level=..3,level=4..]", "a",
+     [("level", Range(1, 5), False), ("level", Range(None, 3), False), ("level", Range(4, None), False)]),
+    ('@a[name="Foo, Bar]"]', "a", [("name", String("Foo, Bar]"), False)]),
+    ("@e[nbt={a:{b:[1,2]}},tag=x]", "e", [("nbt", Nbt("{a:{b:[1,2]}}"), False), ("tag", String("x"), False)]),
+    ("@a[scores={a=1..}]", "a", [("scores", Nbt("{a=1..}"), False)]),
+]
+
+EXPECT_FAIL = [
+    "@x", "@a[]", "@a[tag=foo,]", "@a[tag=foo,  tag=bar]", "@a[tag= foo]", "@s ", "@a[tag=a.b]", "@a[x=1.5]",
+    '@a[name=""]', "@a[nbt={a:1]", "@a[nbt={a}{b}]", "@a[level=1..2..3]", "@a[lalalalala=1]"
+]
+
+
+@pytest.mark.parametrize("text, selector, arguments", EXPECT_PASS)
+def test_parse(text, selector, arguments):
+    parsed = Selector.from_string(text)
+    assert parsed.selector == selector
+    assert [(i.selector.name, i.value, i.negative) for i in parsed.arguments] == arguments
+
+
+@pytest.mark.parametrize("text", EXPECT_FAIL)
+def test_invalid(text):
+    with pytest.raises(ValueError):
+        Selector.from_string(text)
+
+
+def test_interned():
+    assert Selector.from_string("@e[tag=a,type=pig]") is Selector.from_string("@e[tag=a,type=pig]")
+    assert str(Selector.from_string("@e[tag=a,type=pig]").sorted()) == "@e[type=pig,tag=a]"
@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# the cumulative import time of mcscript.cli in milliseconds, see benchmarks/startup.py
+IMPORT_BUDGET = 100
+
+HEAVY_MODULES = ("lark", "nbt", "mcscript.compile", "mcscript.compiler", "mcscript.backends", "mcscript.data",
+                 "mcscript.assets")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_help_is_light():
+    code = "import json, sys\n" \
+           "from mcscript.cli import main\n" \
+           "try:\n" \
+           "    main(['--help'])\n" \
+           "except SystemExit:\n" \
+           "    pass\n" \
+           "print(json.dumps(sorted(sys.modules)))"
+    modules = json.loads(run_python("-c", code).stdout.splitlines()[-1])
+    loaded = [i for i in modules if i.startswith(HEAVY_MODULES)]
+    assert not loaded
+
+
+def test_import_time():
+    times = []
+    for _ in range(3):
+        for line in run_python("-X", "importtime", "-c", "import mcscript.cli").stderr.splitlines():
+            if line.endswith("| mcscript.cli"):
+                times.append(int(line.split("|")[1]) / 1000)
+    assert min(times) < IMPORT_BUDGET
@@ -0,0 +1,30 @@
+from mcscript.ir.components import MessageNode
+from mcscript.utils.JsonTextFormat.objectFormatter import format_bold, format_nbt, format_score, format_text
+from mcscript.utils.JsonTextFormat.textComponents import freeze, map_references, serialize
+from mcscript.utils.Scoreboard import Scoreboard
+from mcscript.utils.resources import DataPath, Identifier, ResourceSpecifier, ScoreboardValue
+
+SCOREBOARD = Scoreboard("main", True, 0)
+
+
+def value(name: str) -> ScoreboardValue:
+    return ScoreboardValue(Identifier(name), SCOREBOARD)
+
+
+def test_serialize():
+    path = DataPath(ResourceSpecifier("test", "main"), ["temp", "0"])
+    text = [format_text("a: "), format_bold(format_score(value(".a"))), format_nbt(path, True)]
+    assert serialize(text) == '[{"text": "a: "}, {"score": {"name": ".a", "objective": "main"}, "bold": "true"}, ' \
+                              '{"nbt": "temp.0", "storage": "test:main", "interpret": true}]'
+
+
+def test_references():
+    a, b = value(".a"), value(".b")
+    node = MessageNode(MessageNode.MessageType.CHAT, [format_score(a), {"text": "", "extra": [format_score(b)]}])
+    assert node.read_scoreboard_values() == [a, b]
+    # the name of a is a prefix of .a2, but the message does not read .a2
+    assert not node.reads_scoreboard_value(value(".a2"))
+
+    renamed = map_references(node["msg"], lambda i: value(".c") if i == a else i)
+    assert freeze(renamed) == freeze([format_score(value(".c")), {"text": "", "extra": [format_score(b)]}])
+    assert freeze(renamed) != freeze(node["msg"])
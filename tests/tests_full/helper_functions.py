@@ -24,7 +24,7 @@ def run_code(rcon: MCRcon, test_world: MCWorld, code: str) -> Tuple[Optional[int
     config = Config()
     config.output_dir = Path(test_world.getDatapackPath()) / "mcscript"
     config.input_string = TEST_TEMPLATE.format(code)
-    datapack = compileMcScript(config)
+    datapack, _ = compileMcScript(config)
     Logger.info(datapack.getMainDirectory().getPath("functions").files)
     generate_datapack(config, datapack)
 
@@ -186,6 +186,33 @@ EXPECT_PASS = [
     MyEnum.a + MyEnum.b + MyEnum.c == 6
     """,
 
+    # for loops
+    """
+    let sum = 0
+    for i in range(1, 5) {
+        sum += i
+    }
+    sum == 10
+    """,
+    """
+    # counts at runtime
+    let sum = 0
+    for i in range(-50, 51) {
+        i = i * 2
+        sum += i + 1
+    }
+    sum == 101
+    """,
+    """
+    let end = dyn(3)
+    let sum = 0
+    for i in range(0, end) {
+        end = 10
+        sum += i
+    }
+    sum == 3 and end == 10
+    """,
+
     # structs
     """
     struct MyStruct {